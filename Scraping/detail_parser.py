@@ -0,0 +1,220 @@
+"""
+Detail Page Parser for the Internshala scrapers
+
+Both scrapers pull the same kind of fields (title, company, location,
+detail items, skills, perks) out of a detail page. The selectors for each
+field live in one declarative spec below and are compiled once at import:
+to XPath expressions for lxml, or to find/find_all arguments for the
+BeautifulSoup fallback when lxml is not installed.
+"""
+
+from collections import namedtuple
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+try:
+    from bs4 import BeautifulSoup, SoupStrainer
+    BS4_AVAILABLE = True
+except ImportError:
+    BS4_AVAILABLE = False
+
+# A single step of a selector path: tag name plus attribute filters.
+# Class filters follow BeautifulSoup semantics: a value with a space must
+# match the whole class attribute, a single word matches any of the classes.
+Step = namedtuple('Step', ['tag', 'attrs'])
+
+# pick: 'first' -> first match, 'all' -> every match, ('nth', i) / 'last' -> one item of all matches
+# clean: 'strip' -> .strip(), 'oneline' -> newlines replaced by spaces, 'join' -> ', '.join of all matches
+Field = namedtuple('Field', ['name', 'path', 'pick', 'clean'])
+
+
+def _step(tag, **attrs):
+    # class_ mirrors the BeautifulSoup keyword
+    if 'class_' in attrs:
+        attrs['class'] = attrs.pop('class_')
+    return Step(tag, attrs)
+
+
+_TITLE = Field('title', [_step('div', class_='heading_4_5 profile')], 'first', 'strip')
+_SKILLS = Field('skills', [_step('span', class_='round_tabs')], 'all', 'join')
+
+# Everything the scrapers extract lives in the page's detail container.
+# When a page does not have one, the whole document is searched instead.
+DETAIL_CONTAINER = _step('div', class_='detail_view')
+
+FIELD_SPECS = {
+    'job': [
+        _TITLE,
+        Field('company', [_step('div', class_='heading_6 company_name'), _step('a')], 'first', 'strip'),
+        Field('location', [_step('p', id='location_names')], 'first', 'oneline'),
+        Field('start_date', [_step('div', id='start-date-first')], 'first', 'strip'),
+        Field('ctc', [_step('div', class_='item_body salary')], 'first', 'strip'),
+        Field('experience', [_step('div', class_='item_body desktop-text')], 'first', 'strip'),
+        Field('apply_by', [_step('div', class_='other_detail_item_row'), _step('div', class_='item_body')], 'last', 'strip'),
+        _SKILLS,
+        Field('perks', [_step('div', class_='round_tabs_container'), _step('span', class_='round_tabs')], 'all', 'join'),
+    ],
+    'internship': [
+        _TITLE,
+        Field('company', [_step('div', class_='heading_6 company_name')], 'first', 'oneline'),
+        Field('location', [_step('div', id='location_names')], 'first', 'oneline'),
+        Field('start_date', [_step('div', class_='item_body')], ('nth', 0), 'strip'),
+        Field('duration', [_step('div', class_='item_body')], ('nth', 1), 'strip'),
+        Field('stipend', [_step('div', class_='item_body')], ('nth', 2), 'strip'),
+        Field('apply_by', [_step('div', class_='item_body')], ('nth', 3), 'strip'),
+        _SKILLS,
+        Field('perks', [_step('div', class_='perks_container'), _step('span', class_='round_tabs')], 'all', 'join'),
+    ],
+}
+
+# CSV headers, in the same order as FIELD_SPECS
+CSV_HEADERS = {
+    'job': ["Job Title", "Company Name", "Location", "Start Date", "CTC (Annual)", "Experience", "Apply By", "Skills Required", "Perks"],
+    'internship': ["Internship Title", "Company Name", "Location", "Start Date", "Duration", "Stipend", "Apply By", "Skills Required", "Perks"],
+}
+
+
+def _xpath_predicate(name, value):
+    if name == 'class' and ' ' not in value:
+        return f"contains(concat(' ', normalize-space(@class), ' '), ' {value} ')"
+    return f"@{name}='{value}'"
+
+
+def _xpath_for_step(step, relative=True):
+    predicates = ''.join(f'[{_xpath_predicate(k, v)}]' for k, v in step.attrs.items())
+    return f"{'.' if relative else ''}//{step.tag}{predicates}"
+
+
+def _compile_xpath(steps):
+    """Compile the steps of a path; all but the last step only use their first match"""
+    compiled = []
+    for i, step in enumerate(steps):
+        expr = _xpath_for_step(step)
+        if i < len(steps) - 1:
+            expr = f'({expr})[1]'
+        compiled.append(etree.XPath(expr))
+    return compiled
+
+
+if LXML_AVAILABLE:
+    _CONTAINER_XPATH = etree.XPath(f'({_xpath_for_step(DETAIL_CONTAINER, relative=False)})[1]')
+    _COMPILED_SPECS = {
+        kind: [(field, _compile_xpath(field.path)) for field in fields]
+        for kind, fields in FIELD_SPECS.items()
+    }
+
+
+def _clean(text, clean):
+    if clean == 'oneline':
+        return text.strip().replace("\n", " ").strip()
+    return text.strip()
+
+
+def _pick(field, matches, text_of):
+    """Turn the matches of a field's last step into the final column value"""
+    if field.clean == 'join':
+        return ', '.join(text_of(m).strip() for m in matches)
+    if not matches:
+        return 'N/A'
+    if field.pick == 'last':
+        match = matches[-1]
+    elif isinstance(field.pick, tuple):
+        index = field.pick[1]
+        if index >= len(matches):
+            return 'N/A'
+        match = matches[index]
+    else:
+        match = matches[0]
+    return _clean(text_of(match), field.clean)
+
+
+def _lxml_text(element):
+    return ''.join(element.itertext())
+
+
+def _lxml_select(scope, xpaths):
+    """Matches of the last step, or None if an enclosing step matched nothing"""
+    nodes = [scope]
+    for xpath in xpaths:
+        if not nodes:
+            return None
+        nodes = xpath(nodes[0])
+    return nodes
+
+
+def _parse_with_lxml(html, kind):
+    root = lxml_html.fromstring(html)
+    container = _CONTAINER_XPATH(root)
+    scope = container[0] if container else root
+
+    values = []
+    for field, xpaths in _COMPILED_SPECS[kind]:
+        nodes = _lxml_select(scope, xpaths)
+        if not nodes and scope is not root:
+            # Field rendered outside the detail container on this page
+            nodes = _lxml_select(root, xpaths)
+        if nodes is None and field.clean == 'join':
+            # The container for a joined list is missing entirely
+            values.append('N/A')
+            continue
+        values.append(_pick(field, nodes or [], _lxml_text))
+    return values
+
+
+def _bs4_select(scope, path):
+    nodes = [scope]
+    for step in path:
+        if not nodes:
+            return None
+        nodes = nodes[0].find_all(step.tag, attrs=dict(step.attrs))
+    return nodes
+
+
+def _parse_with_bs4(html, kind):
+    # Only build the tree for the detail container; the full page is parsed
+    # lazily if the container is missing or a field lives outside of it
+    strainer = SoupStrainer(DETAIL_CONTAINER.tag, attrs=dict(DETAIL_CONTAINER.attrs))
+    soup = BeautifulSoup(html, 'html.parser', parse_only=strainer)
+    full_soup = None
+    if not soup.contents:
+        soup = full_soup = BeautifulSoup(html, 'html.parser')
+
+    values = []
+    for field in FIELD_SPECS[kind]:
+        nodes = _bs4_select(soup, field.path)
+        if not nodes and soup is not full_soup:
+            if full_soup is None:
+                full_soup = BeautifulSoup(html, 'html.parser')
+            nodes = _bs4_select(full_soup, field.path)
+        if nodes is None and field.clean == 'join':
+            values.append('N/A')
+            continue
+        values.append(_pick(field, nodes or [], lambda tag: tag.text))
+    return values
+
+
+def parse_detail_page(html, kind):
+    """
+    Extract the CSV row for a detail page.
+    kind is 'job' or 'internship'; values follow CSV_HEADERS[kind].
+    """
+    if kind not in FIELD_SPECS:
+        raise ValueError(f"Unknown page kind: {kind}")
+
+    if LXML_AVAILABLE:
+        row = _parse_with_lxml(html, kind)
+    elif BS4_AVAILABLE:
+        row = _parse_with_bs4(html, kind)
+    else:
+        raise ImportError("Neither lxml nor beautifulsoup4 is installed")
+
+    # Skills fall back to 'N/A' when no tags are found
+    skills_index = [field.name for field in FIELD_SPECS[kind]].index('skills')
+    if not row[skills_index]:
+        row[skills_index] = 'N/A'
+    return row
@@ -2,7 +2,7 @@
 
 import requests
 import csv
-from bs4 import BeautifulSoup
+from detail_parser import parse_detail_page, CSV_HEADERS
 import time
 
 # Read job links
@@ -14,42 +14,13 @@ csv_file = open('job_details.csv', mode='w', newline='', encoding='utf-8')
 csv_writer = csv.writer(csv_file)
 
 # Write header
-csv_writer.writerow(["Job Title", "Company Name", "Location", "Start Date", "CTC (Annual)", "Experience", "Apply By", "Skills Required", "Perks"])
+csv_writer.writerow(CSV_HEADERS['job'])
 
 # Function to extract job details
 def extract_job_data(url):
     try:
         response = requests.get(url)
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Extract data safely
-        job_title_tag = soup.find('div', class_='heading_4_5 profile')
-        job_title = job_title_tag.text.strip() if job_title_tag else 'N/A'
-
-        company_name_tag = soup.find('div', class_='heading_6 company_name')
-        company_name = company_name_tag.find('a').text.strip() if company_name_tag and company_name_tag.find('a') else 'N/A'
-
-        location_tag = soup.find('p', id='location_names')
-        location = location_tag.text.strip().replace("\n", " ").strip() if location_tag else 'N/A'
-
-        start_date_tag = soup.find('div', id='start-date-first')
-        start_date = start_date_tag.text.strip() if start_date_tag else 'N/A'
-
-        ctc_tag = soup.find('div', class_='item_body salary')
-        ctc = ctc_tag.text.strip() if ctc_tag else 'N/A'
-
-        experience_tag = soup.find('div', class_='item_body desktop-text')
-        experience = experience_tag.text.strip() if experience_tag else 'N/A'
-
-        apply_by_tag = soup.find('div', class_='other_detail_item_row')
-        apply_by = apply_by_tag.find_all('div', class_='item_body')[-1].text.strip() if apply_by_tag else 'N/A'
-
-        skills_required = ', '.join([skill.text.strip() for skill in soup.find_all('span', class_='round_tabs')]) or 'N/A'
-
-        perks_tag = soup.find('div', class_='round_tabs_container')
-        perks = ', '.join([perk.text.strip() for perk in perks_tag.find_all('span', class_='round_tabs')]) if perks_tag else 'N/A'
-
-        return [job_title, company_name, location, start_date, ctc, experience, apply_by, skills_required, perks]
+        return parse_detail_page(response.text, 'job')
 
     except Exception as e:
         print(f"Error processing {url}: {e}")
@@ -0,0 +1,315 @@
+"""
+Scraping Pipeline
+
+Runs the job/internship scrapers as a producer/consumer pipeline:
+
+    async fetchers -> bounded HTML queue -> process pool parsers -> batched writer
+
+Fetching is I/O-bound and runs on an asyncio loop, parsing is CPU-bound and
+runs on every core through a process pool, and a single writer appends rows to
+the CSV (and optionally a Parquet file) in batches. Every queue is bounded, so
+a slow stage pushes back on the stages before it instead of buffering pages in
+memory. If a stage fails (say the disk fills up under the writer), the other
+stages are cancelled and the error is raised, instead of the stages before
+it waiting forever on a full queue.
+
+The Parquet file holds the raw CSV strings and is named <output>.raw.parquet.
+The typed <output>.parquet next to it belongs to market_data.py, which builds
+it from the CSV.
+
+Usage:
+    python pipeline.py job job_links.txt job_details.csv
+    python pipeline.py internship internship_links.txt internship_details.csv --parquet
+"""
+
+import argparse
+import asyncio
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from detail_parser import parse_detail_page, CSV_HEADERS
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    import requests
+    AIOHTTP_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Sentinel pushed through the queues when a stage has finished
+_DONE = object()
+
+
+class StageCounter:
+    """Throughput counter for one pipeline stage"""
+
+    def __init__(self, name):
+        self.name = name
+        self.processed = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.started = time.perf_counter()
+
+    def record(self, seconds, error=False):
+        self.busy_seconds += seconds
+        if error:
+            self.errors += 1
+        else:
+            self.processed += 1
+
+    def rate(self):
+        elapsed = time.perf_counter() - self.started
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    def summary(self):
+        return f"{self.name}: {self.processed} ok, {self.errors} errors, {self.rate():.1f}/s, busy {self.busy_seconds:.1f}s"
+
+
+class ScrapePipeline:
+    def __init__(self, kind, links, csv_path, concurrency=16, workers=None,
+                 queue_size=64, batch_size=50, parquet_path=None, delay=0.0, timeout=30):
+        if kind not in CSV_HEADERS:
+            raise ValueError(f"Unknown page kind: {kind}")
+        self.kind = kind
+        self.links = links
+        self.csv_path = csv_path
+        self.concurrency = concurrency
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.parquet_path = parquet_path
+        self.delay = delay
+        self.timeout = timeout
+
+        self.counters = {
+            'fetch': StageCounter('fetch'),
+            'parse': StageCounter('parse'),
+            'write': StageCounter('write'),
+        }
+
+    # -- fetch stage ---------------------------------------------------------
+
+    async def _fetch(self, session, url):
+        if AIOHTTP_AVAILABLE:
+            async with session.get(url) as response:
+                return await response.text()
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(None, lambda: session.get(url, timeout=self.timeout))
+        return response.text
+
+    async def _fetcher(self, session, url_queue, html_queue):
+        counter = self.counters['fetch']
+        while True:
+            url = await url_queue.get()
+            if url is _DONE:
+                return
+            start = time.perf_counter()
+            try:
+                html = await self._fetch(session, url)
+            except Exception as e:
+                counter.record(time.perf_counter() - start, error=True)
+                print(f"Error fetching {url}: {e}")
+                continue
+            counter.record(time.perf_counter() - start)
+            # Blocks while the parsers are behind
+            await html_queue.put((url, html))
+            if self.delay:
+                await asyncio.sleep(self.delay)
+
+    # -- parse stage ---------------------------------------------------------
+
+    async def _parse_one(self, pool, url, html, row_queue, slots):
+        counter = self.counters['parse']
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            row = await loop.run_in_executor(pool, parse_detail_page, html, self.kind)
+        except Exception as e:
+            counter.record(time.perf_counter() - start, error=True)
+            print(f"Error parsing {url}: {e}")
+            return
+        finally:
+            slots.release()
+        counter.record(time.perf_counter() - start)
+        await row_queue.put(row)
+
+    async def _parser(self, pool, html_queue, row_queue):
+        # Keep at most two pages per worker in flight so the pool never
+        # accumulates an unbounded backlog of pickled HTML
+        slots = asyncio.Semaphore(self.workers * 2)
+        tasks = set()
+        try:
+            while True:
+                item = await html_queue.get()
+                if item is _DONE:
+                    break
+                await slots.acquire()
+                task = asyncio.create_task(self._parse_one(pool, item[0], item[1], row_queue, slots))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            # Only left pending when the pipeline is being cancelled
+            for task in tasks:
+                task.cancel()
+        await row_queue.put(_DONE)
+
+    # -- write stage ---------------------------------------------------------
+
+    def _write_batch(self, csv_writer, csv_file, parquet_writer, batch):
+        csv_writer.writerows(batch)
+        csv_file.flush()
+        if parquet_writer is not None:
+            columns = list(zip(*batch))
+            table = pa.table({
+                header: pa.array(list(values), type=pa.string())
+                for header, values in zip(CSV_HEADERS[self.kind], columns)
+            })
+            parquet_writer.write_table(table)
+
+    async def _writer(self, row_queue):
+        counter = self.counters['write']
+        loop = asyncio.get_running_loop()
+        parquet_writer = None
+        try:
+            if self.parquet_path:
+                schema = pa.schema([(header, pa.string()) for header in CSV_HEADERS[self.kind]])
+                parquet_writer = pq.ParquetWriter(self.parquet_path, schema)
+
+            with open(self.csv_path, mode='w', newline='', encoding='utf-8') as csv_file:
+                csv_writer = csv.writer(csv_file)
+                csv_writer.writerow(CSV_HEADERS[self.kind])
+                batch = []
+                done = False
+                while not done:
+                    row = await row_queue.get()
+                    if row is _DONE:
+                        done = True
+                    else:
+                        batch.append(row)
+                    if batch and (done or len(batch) >= self.batch_size):
+                        start = time.perf_counter()
+                        write = loop.run_in_executor(None, self._write_batch, csv_writer, csv_file, parquet_writer, batch)
+                        try:
+                            await asyncio.shield(write)
+                        except asyncio.CancelledError:
+                            # Let the batch finish before its files are closed under it
+                            await asyncio.wait([write])
+                            raise
+                        counter.busy_seconds += time.perf_counter() - start
+                        counter.processed += len(batch)
+                        batch = []
+        finally:
+            if parquet_writer is not None:
+                parquet_writer.close()
+
+    async def _fetch_all(self, session, url_queue, html_queue):
+        await asyncio.gather(*(self._fetcher(session, url_queue, html_queue) for _ in range(self.concurrency)))
+        await html_queue.put(_DONE)
+
+    # -- orchestration -------------------------------------------------------
+
+    async def _report(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            self.print_counters()
+
+    def print_counters(self):
+        print(' | '.join(counter.summary() for counter in self.counters.values()))
+
+    def _open_session(self):
+        if AIOHTTP_AVAILABLE:
+            connector = aiohttp.TCPConnector(limit=self.concurrency)
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            return aiohttp.ClientSession(connector=connector, timeout=timeout)
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=self.concurrency, pool_maxsize=self.concurrency)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    async def run_async(self, report_interval=10):
+        url_queue = asyncio.Queue()
+        html_queue = asyncio.Queue(maxsize=self.queue_size)
+        row_queue = asyncio.Queue(maxsize=self.queue_size)
+        for link in self.links:
+            url_queue.put_nowait(link)
+        for _ in range(self.concurrency):
+            url_queue.put_nowait(_DONE)
+
+        session = self._open_session()
+        reporter = asyncio.create_task(self._report(report_interval))
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                stages = [
+                    asyncio.create_task(self._writer(row_queue)),
+                    asyncio.create_task(self._parser(pool, html_queue, row_queue)),
+                    asyncio.create_task(self._fetch_all(session, url_queue, html_queue)),
+                ]
+                try:
+                    # Returns once every stage has finished, or as soon as one fails
+                    done, _ = await asyncio.wait(stages, return_when=asyncio.FIRST_EXCEPTION)
+                    for task in done:
+                        task.result()
+                finally:
+                    for task in stages:
+                        task.cancel()
+                    await asyncio.gather(*stages, return_exceptions=True)
+        finally:
+            reporter.cancel()
+            if AIOHTTP_AVAILABLE:
+                await session.close()
+            else:
+                session.close()
+        self.print_counters()
+
+    def run(self, report_interval=10):
+        asyncio.run(self.run_async(report_interval))
+
+
+def read_links(path):
+    with open(path, 'r') as file:
+        return [link.strip() for link in file if link.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape Internshala detail pages into a CSV")
+    parser.add_argument('kind', choices=sorted(CSV_HEADERS))
+    parser.add_argument('links', help="text file with one detail page URL per line")
+    parser.add_argument('output', help="CSV file to write")
+    parser.add_argument('--concurrency', type=int, default=16, help="concurrent fetches")
+    parser.add_argument('--workers', type=int, default=None, help="parser processes (default: all cores)")
+    parser.add_argument('--queue-size', type=int, default=64, help="pages buffered between stages")
+    parser.add_argument('--batch-size', type=int, default=50, help="rows per write")
+    parser.add_argument('--delay', type=float, default=0.0, help="seconds each fetcher waits between requests")
+    parser.add_argument('--parquet', action='store_true', help="also write the raw rows to <output>.raw.parquet")
+    args = parser.parse_args()
+
+    parquet_path = None
+    if args.parquet:
+        if not PYARROW_AVAILABLE:
+            parser.error("--parquet needs pyarrow installed")
+        # Not <output>.parquet: that is market_data's typed copy of the same CSV
+        parquet_path = os.path.splitext(args.output)[0] + '.raw.parquet'
+
+    pipeline = ScrapePipeline(
+        args.kind, read_links(args.links), args.output,
+        concurrency=args.concurrency, workers=args.workers, queue_size=args.queue_size,
+        batch_size=args.batch_size, parquet_path=parquet_path, delay=args.delay,
+    )
+    pipeline.run()
+    print(f"Scraping completed and saved to '{args.output}'!")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""
+Admin Authentication for Career Path Finder
+
+Protects the operator-only endpoints (profiling, exports) with a shared
+token. Requests authenticate with "Authorization: Bearer <token>" or an
+X-Admin-Token header. Without ADMIN_TOKEN set, every admin endpoint refuses
+all requests.
+
+Settings:
+    ADMIN_TOKEN    shared secret for admin endpoints (unset: admin endpoints disabled)
+"""
+
+import hmac
+import os
+from functools import wraps
+
+from flask import jsonify, request
+
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')
+
+
+def request_token():
+    auth = request.headers.get('Authorization', '')
+    if auth.lower().startswith('bearer '):
+        return auth[7:].strip()
+    return request.headers.get('X-Admin-Token', '').strip()
+
+
+def is_admin_request():
+    """True when the current request carries the admin token"""
+    token = request_token()
+    return bool(ADMIN_TOKEN and token) and hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode())
+
+
+def require_admin(view):
+    """Reject requests to an admin view that do not carry the admin token"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not ADMIN_TOKEN:
+            return jsonify({'error': 'Admin endpoints are disabled; set ADMIN_TOKEN to enable them'}), 403
+        if not is_admin_request():
+            return jsonify({'error': 'Admin token required'}), 401
+        return view(*args, **kwargs)
+    return wrapper
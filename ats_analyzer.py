@@ -9,6 +9,11 @@ from datetime import datetime
 from collections import Counter
 import os
 
+from job_profiles import get_title_profiles, role_profile
+
+# Share of the score that targeted scoring gives to the target role's skills
+ROLE_KEYWORD_POINTS = 50
+
 class ATSAnalyzer:
     def __init__(self):
         # Load common ATS keywords and patterns
@@ -66,12 +71,19 @@ class ATSAnalyzer:
             'skills': ['skills', 'competencies', 'technologies', 'technical', 'expertise']
         }
 
-    def analyze_cv(self, cv_text, target_job_title=""):
-        """
-        Comprehensive ATS analysis of CV text
-        Returns ATS score and detailed suggestions
-        """
-        analysis_results = {
+    # Weight of each category in the overall score
+    CATEGORY_WEIGHTS = {
+        'format': 0.20,
+        'keywords': 0.30,
+        'structure': 0.20,
+        'content': 0.15,
+        'length': 0.10,
+        'readability': 0.05
+    }
+
+    def new_results(self):
+        """Empty analysis results for the category analyzers to fill in"""
+        return {
             'overall_score': 0,
             'category_scores': {},
             'suggestions': [],
@@ -81,6 +93,24 @@ class ATSAnalyzer:
             'improvement_areas': [],
             'detailed_feedback': {}
         }
+
+    def finalize_score(self, analysis_results):
+        """Calculate overall score with weighted categories"""
+        overall_score = sum(
+            analysis_results['category_scores'][category] * weight 
+            for category, weight in self.CATEGORY_WEIGHTS.items()
+        )
+        
+        analysis_results['overall_score'] = round(overall_score, 1)
+        analysis_results['score_interpretation'] = self.get_score_interpretation(overall_score)
+        return analysis_results
+
+    def analyze_cv(self, cv_text, target_job_title=""):
+        """
+        Comprehensive ATS analysis of CV text
+        Returns ATS score and detailed suggestions
+        """
+        analysis_results = self.new_results()
         
         # Perform various ATS checks
         analysis_results['category_scores']['format'] = self.analyze_format(cv_text, analysis_results)
@@ -90,25 +120,7 @@ class ATSAnalyzer:
         analysis_results['category_scores']['length'] = self.analyze_length(cv_text, analysis_results)
         analysis_results['category_scores']['readability'] = self.analyze_readability(cv_text, analysis_results)
         
-        # Calculate overall score with weighted categories
-        category_weights = {
-            'format': 0.20,
-            'keywords': 0.30,
-            'structure': 0.20,
-            'content': 0.15,
-            'length': 0.10,
-            'readability': 0.05
-        }
-        
-        overall_score = sum(
-            analysis_results['category_scores'][category] * weight 
-            for category, weight in category_weights.items()
-        )
-        
-        analysis_results['overall_score'] = round(overall_score, 1)
-        analysis_results['score_interpretation'] = self.get_score_interpretation(overall_score)
-        
-        return analysis_results
+        return self.finalize_score(analysis_results)
 
     def analyze_format(self, cv_text, results):
         """Analyze CV format for ATS compatibility"""
@@ -177,35 +189,61 @@ class ATSAnalyzer:
         results['formatting_issues'] = issues
         return max(0, score)
 
+    def keyword_patterns(self):
+        """The keyword lists matched by analyze_keywords, by result field"""
+        return {
+            'technical_skills': self.technical_skills,
+            'soft_skills': self.soft_skills,
+            'action_verbs': self.action_verbs,
+            'industry_terms': [term for terms in self.industry_keywords.values() for term in terms],
+        }
+
+    def extract_keyword_hits(self, cv_text):
+        """Keywords found in a piece of CV text"""
+        cv_lower = cv_text.lower()
+        hits = {
+            field: [term for term in terms if term.lower() in cv_lower]
+            for field, terms in self.keyword_patterns().items()
+        }
+        # Job catalogue skills, for scoring against a target role
+        hits['catalogue_skills'] = sorted(get_title_profiles().find_skills(cv_text))
+        return hits
+
     def analyze_keywords(self, cv_text, target_job_title, results):
         """Analyze keyword density and relevance"""
-        cv_lower = cv_text.lower()
-        score = 0
-        
-        # Count technical skills
-        tech_skills_found = [skill for skill in self.technical_skills if skill.lower() in cv_lower]
+        return self.score_keywords(self.extract_keyword_hits(cv_text), target_job_title, results)
+
+    def score_keywords(self, hits, target_job_title, results):
+        """Score keyword coverage from extracted keyword hits"""
+        tech_skills_found = hits['technical_skills']
+        soft_skills_found = hits['soft_skills']
+        action_verbs_found = hits['action_verbs']
+        industry_terms_found = hits['industry_terms']
+
         tech_score = min(len(tech_skills_found) * 6, 35)  # Max 35 points for tech skills
-        
-        # Count soft skills
-        soft_skills_found = [skill for skill in self.soft_skills if skill.lower() in cv_lower]
         soft_score = min(len(soft_skills_found) * 4, 25)  # Max 25 points for soft skills
-        
-        # Count action verbs
-        action_verbs_found = [verb for verb in self.action_verbs if verb.lower() in cv_lower]
         action_score = min(len(action_verbs_found) * 2, 25)  # Max 25 points for action verbs
-        
-        # Industry-specific keywords bonus
-        industry_score = 0
-        industry_terms_found = []
-        for industry, terms in self.industry_keywords.items():
-            for term in terms:
-                if term.lower() in cv_lower:
-                    industry_terms_found.append(term)
-                    industry_score += 1
-        
-        industry_score = min(industry_score * 1.5, 15)  # Max 15 points for industry terms
-        
+        industry_score = min(len(industry_terms_found) * 1.5, 15)  # Max 15 points for industry terms
+
         score = tech_score + soft_score + action_score + industry_score
+
+        # With a known target role, the skills its postings ask for replace
+        # the generic technical and industry lists
+        role = role_profile(target_job_title) if target_job_title else None
+        if role and not role['total_weight']:
+            role = None
+        role_matched, role_missing, role_coverage = [], [], 0
+        if role:
+            cv_skills = set(hits.get('catalogue_skills', ()))
+            matched_weight = 0
+            for skill_id, skill, weight in role['skills']:
+                if skill_id in cv_skills:
+                    role_matched.append(skill)
+                    matched_weight += weight
+                else:
+                    role_missing.append(skill)
+            role_coverage = matched_weight / role['total_weight']
+            score = round(role_coverage * ROLE_KEYWORD_POINTS + soft_score + action_score, 1)
         
         # Store keyword analysis
         results['keyword_analysis'] = {
@@ -216,11 +254,21 @@ class ATSAnalyzer:
             'technical_skills_count': len(tech_skills_found),
             'soft_skills_count': len(soft_skills_found),
             'action_verbs_count': len(action_verbs_found),
-            'industry_terms_count': len(industry_terms_found)
+            'industry_terms_count': len(industry_terms_found),
+            'target_role': {'id': role['id'], 'title': role['title'], 'postings': role['postings']} if role else None,
+            'role_skills_matched': role_matched,
+            'role_skills_missing': role_missing[:10],
+            'role_coverage': round(role_coverage * 100, 1)
         }
         
         # Provide suggestions based on keyword analysis
-        if len(tech_skills_found) < 3:
+        if role:
+            if role_coverage < 0.5:
+                results['suggestions'].append(f"Add skills employers ask for in {role['title']} roles: {', '.join(role_missing[:5])}")
+                results['improvement_areas'].append("Role Keywords")
+            else:
+                results['strengths'].append(f"Covers {round(role_coverage * 100)}% of the skills asked for in {role['title']} postings")
+        elif len(tech_skills_found) < 3:
             results['suggestions'].append("Add more technical skills relevant to your field (programming languages, tools, technologies)")
             results['improvement_areas'].append("Technical Skills")
         elif len(tech_skills_found) >= 8:
@@ -240,7 +288,10 @@ class ATSAnalyzer:
         else:
             results['strengths'].append(f"Strong use of action verbs ({len(action_verbs_found)} found)")
         
-        if len(industry_terms_found) < 3:
+        if role:
+            # Industry terms are already covered by the role's own skills
+            pass
+        elif len(industry_terms_found) < 3:
             results['suggestions'].append("Include more industry-specific keywords and terminology relevant to your field")
             results['improvement_areas'].append("Industry Keywords")
         else:
@@ -298,30 +349,19 @@ class ATSAnalyzer:
         
         return max(0, score)
 
-    def analyze_content_quality(self, cv_text, results):
-        """Analyze content quality and relevance"""
-        score = 100
-        
-        # Check for quantifiable achievements
+    def extract_content_hits(self, cv_text):
+        """Metrics, dates and other content signals found in a piece of CV text"""
+        cv_lower = cv_text.lower()
+
+        # Quantifiable achievements
         numbers_pattern = r'\b\d+(?:\.\d+)?%?\b'
-        numbers_found = re.findall(numbers_pattern, cv_text)
         quantifiable_words = ['increased', 'decreased', 'improved', 'reduced', 'grew', 'achieved', 'exceeded']
-        
         quantifiable_achievements = 0
         for word in quantifiable_words:
-            if word.lower() in cv_text.lower():
+            if word in cv_lower:
                 quantifiable_achievements += len(re.findall(rf'{word}.*?\d+', cv_text, re.IGNORECASE))
-        
-        if len(numbers_found) < 3:
-            score -= 25
-            results['suggestions'].append("Include more quantifiable achievements with specific numbers, percentages, or metrics")
-            results['improvement_areas'].append("Quantifiable Results")
-        elif quantifiable_achievements >= 3:
-            results['strengths'].append(f"Excellent use of quantifiable achievements ({quantifiable_achievements} found)")
-        else:
-            results['strengths'].append(f"Good use of metrics and numbers ({len(numbers_found)} found)")
-        
-        # Check for dates and timeframes
+
+        # Dates and timeframes
         date_patterns = [
             r'\b\d{4}\b',  # Years
             r'\b\d{1,2}/\d{4}\b',  # MM/YYYY
@@ -329,12 +369,40 @@ class ATSAnalyzer:
             r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4}\b',  # Month Year
             r'\b(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4}\b'
         ]
+        dates_found = sum(len(re.findall(pattern, cv_text, re.IGNORECASE)) for pattern in date_patterns)
+
+        summary_keywords = ['summary', 'objective', 'profile', 'about']
+
+        return {
+            'numbers': len(re.findall(numbers_pattern, cv_text)),
+            'quantifiable_achievements': quantifiable_achievements,
+            'dates': dates_found,
+            'has_summary': any(keyword in cv_lower for keyword in summary_keywords),
+            'bullet_points': len(re.findall(r'^[\s]*[-•*]\s', cv_text, re.MULTILINE)),
+        }
+
+    def analyze_content_quality(self, cv_text, results):
+        """Analyze content quality and relevance"""
+        return self.score_content_quality(self.extract_content_hits(cv_text), results)
+
+    def score_content_quality(self, hits, results):
+        """Score content quality from extracted content hits"""
+        score = 100
         
-        dates_found = 0
-        for pattern in date_patterns:
-            dates_found += len(re.findall(pattern, cv_text, re.IGNORECASE))
+        # Check for quantifiable achievements
+        numbers_found = hits['numbers']
+        quantifiable_achievements = hits['quantifiable_achievements']
+        if numbers_found < 3:
+            score -= 25
+            results['suggestions'].append("Include more quantifiable achievements with specific numbers, percentages, or metrics")
+            results['improvement_areas'].append("Quantifiable Results")
+        elif quantifiable_achievements >= 3:
+            results['strengths'].append(f"Excellent use of quantifiable achievements ({quantifiable_achievements} found)")
+        else:
+            results['strengths'].append(f"Good use of metrics and numbers ({numbers_found} found)")
         
-        if dates_found < 2:
+        # Check for dates and timeframes
+        if hits['dates'] < 2:
             score -= 15
             results['suggestions'].append("Include clear dates for education and work experience (MM/YYYY format)")
             results['improvement_areas'].append("Date Formatting")
@@ -342,18 +410,14 @@ class ATSAnalyzer:
             results['strengths'].append("Clear timeline with proper date formatting")
         
         # Check for professional summary/objective
-        summary_keywords = ['summary', 'objective', 'profile', 'about']
-        has_summary = any(keyword in cv_text.lower() for keyword in summary_keywords)
-        
-        if not has_summary:
+        if not hits['has_summary']:
             score -= 10
             results['suggestions'].append("Add a professional summary or objective statement at the beginning")
         else:
             results['strengths'].append("Professional summary or objective present")
         
         # Check for consistency in formatting
-        bullet_points = len(re.findall(r'^[\s]*[-•*]\s', cv_text, re.MULTILINE))
-        if bullet_points > 0:
+        if hits['bullet_points'] > 0:
             results['strengths'].append("Good use of bullet points for readability")
         else:
             score -= 5
@@ -384,34 +448,79 @@ class ATSAnalyzer:
         
         return max(0, score)
 
+    def extract_readability_hits(self, cv_text):
+        """Long sentences, long paragraphs and odd capitalization in a piece of CV text"""
+        sentences = re.split(r'[.!?]+', cv_text)
+        paragraphs = cv_text.split('\n\n')
+        return {
+            'long_sentences': sum(1 for s in sentences if len(s.split()) > 25),
+            'long_paragraphs': sum(1 for p in paragraphs if len(p.split()) > 100),
+            'inconsistent_caps': len(re.findall(r'\b[a-z]+[A-Z][a-z]*\b', cv_text)),
+        }
+
     def analyze_readability(self, cv_text, results):
         """Analyze CV readability and clarity"""
+        return self.score_readability(self.extract_readability_hits(cv_text), results)
+
+    def score_readability(self, hits, results):
+        """Score readability from extracted readability hits"""
         score = 100
         
         # Check for overly long sentences
-        sentences = re.split(r'[.!?]+', cv_text)
-        long_sentences = [s for s in sentences if len(s.split()) > 25]
-        
-        if len(long_sentences) > 5:
+        if hits['long_sentences'] > 5:
             score -= 20
             results['suggestions'].append("Break down long sentences for better readability")
         
         # Check for paragraph structure
-        paragraphs = cv_text.split('\n\n')
-        very_long_paragraphs = [p for p in paragraphs if len(p.split()) > 100]
-        
-        if len(very_long_paragraphs) > 2:
+        if hits['long_paragraphs'] > 2:
             score -= 15
             results['suggestions'].append("Break down large text blocks into smaller, more digestible sections")
         
         # Check for consistency in capitalization
-        inconsistent_caps = len(re.findall(r'\b[a-z]+[A-Z][a-z]*\b', cv_text))
-        if inconsistent_caps > 5:
+        if hits['inconsistent_caps'] > 5:
             score -= 10
             results['suggestions'].append("Ensure consistent capitalization throughout your CV")
         
         return max(0, score)
 
+    def merge_hits(self, category, hits_list):
+        """
+        Combine the hits extracted from separate sections of a CV into the hits
+        for the whole CV: keywords are unioned (in pattern order), counts are
+        summed and flags are or-ed.
+        """
+        if category == 'keywords':
+            merged = {}
+            for field, terms in self.keyword_patterns().items():
+                found = set()
+                for hits in hits_list:
+                    found.update(hits[field])
+                merged[field] = [term for term in terms if term in found]
+            merged['catalogue_skills'] = sorted({skill_id for hits in hits_list for skill_id in hits['catalogue_skills']})
+            return merged
+
+        merged = {}
+        for hits in hits_list:
+            for key, value in hits.items():
+                if isinstance(value, bool):
+                    merged[key] = merged.get(key, False) or value
+                else:
+                    merged[key] = merged.get(key, 0) + value
+        return merged
+
+    def score_role_fit(self, skill_ids, titles=None, top_n=5):
+        """
+        Coverage of many job titles' skill profiles by one CV, from one
+        sparse product over the CV's skills (see TitleProfiles.score_titles).
+        Ranks the given titles, or the best fitting of all catalogue titles
+        when none are given.
+        """
+        profiles = get_title_profiles()
+        if titles:
+            title_ids = [profiles.resolve(title) for title in titles]
+            return profiles.score_titles(skill_ids, title_ids, top_n=len(title_ids))
+        return profiles.score_titles(skill_ids, top_n=top_n)
+
     def get_score_interpretation(self, score):
         """Provide interpretation of ATS score"""
         if score >= 85:
@@ -506,6 +615,12 @@ class ATSAnalyzer:
                 "Mention relevant technologies and frameworks"
             ])
         
+        if keyword_analysis.get('role_skills_missing'):
+            improvement_plan['keyword_suggestions'].append(
+                f"Add skills common in {keyword_analysis['target_role']['title']} postings: "
+                f"{', '.join(keyword_analysis['role_skills_missing'][:5])}"
+            )
+        
         if keyword_analysis['soft_skills_count'] < 3:
             improvement_plan['keyword_suggestions'].extend([
                 "Highlight leadership and management experience",
@@ -526,17 +641,19 @@ class ATSAnalyzer:
         
         return improvement_plan
 
-def analyze_cv_for_ats(cv_text, target_job_title=""):
+def analyze_cv_for_ats(cv_text, target_job_title="", compare_titles=None):
     """
     Main function to analyze CV for ATS compatibility
     """
     analyzer = ATSAnalyzer()
     analysis_results = analyzer.analyze_cv(cv_text, target_job_title)
     improvement_plan = analyzer.generate_improvement_plan(analysis_results)
+    skill_ids = get_title_profiles().find_skills(cv_text)
     
     return {
         'analysis': analysis_results,
         'improvement_plan': improvement_plan,
+        'role_fit': analyzer.score_role_fit(skill_ids, compare_titles),
         'timestamp': datetime.now().isoformat(),
         'target_job': target_job_title if target_job_title else "General Analysis"
     }
@@ -0,0 +1,185 @@
+"""
+Live ATS Scoring for the CV Builder
+
+Scores the builder's cv_data directly instead of a generated and re-uploaded
+file. The CV is split into sections (summary, each experience entry, ...) and
+the keyword, content and readability evidence of every section is cached by
+the section's hash, so after an edit only the changed sections are
+re-analyzed. Format, structure and length checks are cheap and always run on
+the whole text. Sentences and paragraphs are counted per section, so text
+running on from one section into the next is not merged into one sentence.
+
+Settings:
+    ATS_LIVE_CACHE_SIZE  section results kept in memory (default 4096)
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from ats_analyzer import ATSAnalyzer
+
+ATS_LIVE_CACHE_SIZE = int(os.getenv('ATS_LIVE_CACHE_SIZE', '4096'))
+
+
+def _clean(value):
+    return str(value).strip() if value else ''
+
+
+def cv_sections(cv_data):
+    """
+    Render cv_data as plain CV text, split into (section, text) pieces in
+    document order. Each list entry is its own piece so editing one entry
+    leaves the others' text, and cache keys, unchanged.
+    """
+    sections = []
+    personal = cv_data.get('personal') if isinstance(cv_data.get('personal'), dict) else {}
+
+    contact = [_clean(personal.get(key)) for key in ('email', 'phone', 'location', 'linkedin', 'website')]
+    header = [_clean(personal.get('fullName')), ' | '.join(part for part in contact if part)]
+    sections.append(('contact', '\n'.join(line for line in header if line)))
+
+    summary = _clean(cv_data.get('summary') or personal.get('summary'))
+    if summary:
+        sections.append(('summary', f"PROFESSIONAL SUMMARY\n{summary}"))
+
+    def entries(key):
+        items = cv_data.get(key)
+        return [item for item in items if isinstance(item, dict)] if isinstance(items, list) else []
+
+    experience = entries('experience')
+    if experience:
+        sections.append(('experience', 'EXPERIENCE'))
+    for index, exp in enumerate(experience):
+        lines = [' - '.join(part for part in (_clean(exp.get('position')), _clean(exp.get('company'))) if part)]
+        dates = ' - '.join(part for part in (_clean(exp.get('startDate')), _clean(exp.get('endDate'))) if part)
+        if dates:
+            lines.append(dates)
+        lines.extend(f"- {line.strip()}" for line in _clean(exp.get('description')).splitlines() if line.strip())
+        sections.append((f'experience:{index}', '\n'.join(line for line in lines if line)))
+
+    education = entries('education')
+    if education:
+        sections.append(('education', 'EDUCATION'))
+    for index, edu in enumerate(education):
+        lines = [_clean(edu.get('degree')), _clean(edu.get('school')), _clean(edu.get('graduationDate'))]
+        if edu.get('gpa'):
+            lines.append(f"GPA: {_clean(edu.get('gpa'))}")
+        sections.append((f'education:{index}', '\n'.join(line for line in lines if line)))
+
+    skills = cv_data.get('skills')
+    if isinstance(skills, dict):
+        # The builder keeps skills grouped by kind until it posts them
+        skills = [skill for group in skills.values() if isinstance(group, list) for skill in group]
+    if isinstance(skills, list):
+        skills = [_clean(skill) for skill in skills if isinstance(skill, str) and skill.strip()]
+        if skills:
+            sections.append(('skills', 'SKILLS\n' + ', '.join(skills)))
+
+    projects = entries('projects')
+    if projects:
+        sections.append(('projects', 'PROJECTS'))
+    for index, project in enumerate(projects):
+        lines = [_clean(project.get('name'))]
+        lines.extend(f"- {line.strip()}" for line in _clean(project.get('description')).splitlines() if line.strip())
+        if project.get('technologies'):
+            lines.append(f"Technologies: {_clean(project.get('technologies'))}")
+        sections.append((f'projects:{index}', '\n'.join(line for line in lines if line)))
+
+    certifications = entries('certifications')
+    if certifications:
+        lines = ['CERTIFICATIONS']
+        for cert in certifications:
+            lines.append(' - '.join(part for part in (_clean(cert.get(key)) for key in ('name', 'issuer', 'date')) if part))
+        sections.append(('certifications', '\n'.join(line for line in lines if line)))
+
+    return [(name, text) for name, text in sections if text]
+
+
+class SectionHitsCache:
+    """LRU of per-section analyzer hits, keyed by (category, section hash)"""
+
+    def __init__(self, max_entries=ATS_LIVE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            hits = self._entries.get(key)
+            if hits is not None:
+                self._entries.move_to_end(key)
+            return hits
+
+    def set(self, key, hits):
+        with self._lock:
+            self._entries[key] = hits
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_analyzer = ATSAnalyzer()
+section_cache = SectionHitsCache()
+
+# Categories whose evidence can be gathered per section and merged
+SECTION_EXTRACTORS = {
+    'keywords': _analyzer.extract_keyword_hits,
+    'content': _analyzer.extract_content_hits,
+    'readability': _analyzer.extract_readability_hits,
+}
+
+
+def _section_hits(category, text):
+    """Return (hits, was_cached) for one section"""
+    key = (category, hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest())
+    hits = section_cache.get(key)
+    if hits is not None:
+        return hits, True
+    hits = SECTION_EXTRACTORS[category](text)
+    section_cache.set(key, hits)
+    return hits, False
+
+
+def score_cv_data(cv_data, target_job_title="", compare_titles=None):
+    """
+    ATS analysis of the builder's cv_data, in the same shape as
+    analyze_cv_for_ats(). Unchanged sections reuse their cached hits.
+    """
+    if not cv_data or not isinstance(cv_data, dict):
+        raise ValueError("Invalid CV data provided")
+
+    sections = cv_sections(cv_data)
+    full_text = '\n\n'.join(text for _, text in sections)
+
+    merged = {}
+    reanalyzed = set()
+    for category in SECTION_EXTRACTORS:
+        hits_list = []
+        for name, text in sections:
+            hits, cached = _section_hits(category, text)
+            hits_list.append(hits)
+            if not cached:
+                reanalyzed.add(name)
+        merged[category] = _analyzer.merge_hits(category, hits_list)
+
+    results = _analyzer.new_results()
+    scores = results['category_scores']
+    scores['format'] = _analyzer.analyze_format(full_text, results)
+    scores['keywords'] = _analyzer.score_keywords(merged['keywords'], target_job_title, results)
+    scores['structure'] = _analyzer.analyze_structure(full_text, results)
+    scores['content'] = _analyzer.score_content_quality(merged['content'], results)
+    scores['length'] = _analyzer.analyze_length(full_text, results)
+    scores['readability'] = _analyzer.score_readability(merged['readability'], results)
+    _analyzer.finalize_score(results)
+
+    return {
+        'analysis': results,
+        'improvement_plan': _analyzer.generate_improvement_plan(results),
+        'role_fit': _analyzer.score_role_fit(merged['keywords']['catalogue_skills'], compare_titles),
+        'timestamp': datetime.now().isoformat(),
+        'target_job': target_job_title if target_job_title else "General Analysis",
+        'reanalyzed_sections': [name for name, _ in sections if name in reanalyzed],
+    }
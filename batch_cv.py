@@ -0,0 +1,202 @@
+"""
+Batch CV Rendering
+
+Renders many CVs at once, e.g. a whole cohort exported from a spreadsheet,
+into a zip archive. Records are rendered in parallel across a process pool
+and each file is written to the zip as soon as it completes, so the archive
+is streamed out without ever being held in memory.
+
+Input is JSON Lines (one cv_data object per line) or CSV. CSV columns:
+    fullName, email, phone, location, linkedin, website  -> personal
+    summary                                              -> summary
+    skills                                               -> ';' or ',' separated list
+    experience, education, projects, certifications,
+    languages                                            -> JSON arrays
+    template, output_format                              -> per-row overrides
+
+A record that cannot be parsed becomes an NNNN_CV.error.txt entry in the
+archive, like a record that fails to render, and the rest of the batch
+carries on.
+
+Usage:
+    python batch_cv.py students.csv -o cvs.zip --format pdf --workers 8
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import zipfile
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from werkzeug.utils import secure_filename
+
+import pdf_engine
+from worker_pool import pool_context
+from cv_templates import render_cv_html, DEFAULT_CV_THEME
+
+BATCH_WORKERS = int(os.getenv('BATCH_WORKERS', str(os.cpu_count() or 1)))
+BATCH_MAX_RECORDS = int(os.getenv('BATCH_MAX_RECORDS', '5000'))
+
+PERSONAL_FIELDS = ('fullName', 'email', 'phone', 'location', 'linkedin', 'website')
+LIST_FIELDS = ('experience', 'education', 'projects', 'certifications', 'languages')
+OUTPUT_FORMATS = ('pdf', 'html')
+
+# Stands in for a record that could not be parsed, so iter_rendered() can report it
+InvalidRecord = namedtuple('InvalidRecord', ['reason'])
+
+
+def _csv_row_to_cv_data(row):
+    cv_data = {'personal': {field: row[field].strip() for field in PERSONAL_FIELDS if row.get(field)}}
+    if row.get('summary'):
+        cv_data['summary'] = row['summary']
+    if row.get('skills'):
+        separator = ';' if ';' in row['skills'] else ','
+        cv_data['skills'] = [skill.strip() for skill in row['skills'].split(separator) if skill.strip()]
+    for field in LIST_FIELDS:
+        if row.get(field):
+            try:
+                cv_data[field] = json.loads(row[field])
+            except ValueError as e:
+                return InvalidRecord(f"column {field} is not valid JSON ({e})")
+    for field in ('template', 'output_format'):
+        if row.get(field):
+            cv_data[field] = row[field].strip()
+    return cv_data
+
+
+def read_cv_records(text_stream, filename):
+    """Yield cv_data dicts (or InvalidRecord) from a .jsonl/.json-lines or .csv text stream"""
+    if filename.lower().endswith('.csv'):
+        for row in csv.DictReader(text_stream):
+            yield _csv_row_to_cv_data(row)
+    else:
+        for line in text_stream:
+            line = line.strip()
+            if line:
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    yield InvalidRecord(f"line is not valid JSON ({e})")
+
+
+def render_record(index, cv_data, output_format):
+    """Render one record; returns (archive name, bytes). Runs in a pool process."""
+    output_format = cv_data.get('output_format', output_format)
+    if output_format not in OUTPUT_FORMATS:
+        output_format = 'pdf'
+    theme = cv_data.get('template', DEFAULT_CV_THEME)
+    personal = cv_data.get('personal') if isinstance(cv_data, dict) else None
+    name = secure_filename(personal.get('fullName', '')) if isinstance(personal, dict) else ''
+    base_name = f"{index:04d}_{name or 'CV'}"
+    try:
+        if output_format == 'pdf' and pdf_engine.REPORTLAB_AVAILABLE:
+            return f"{base_name}.pdf", pdf_engine.render(cv_data, theme)
+        return f"{base_name}.html", render_cv_html(cv_data, theme).encode('utf-8')
+    except Exception as e:
+        return f"{base_name}.error.txt", f"Failed to generate CV: {e}\n".encode('utf-8')
+
+
+def iter_rendered(records, output_format='pdf', workers=BATCH_WORKERS, max_records=BATCH_MAX_RECORDS):
+    """
+    Render records across a process pool, yielding (name, bytes) in completion
+    order. Only a small window of records is in flight at a time.
+    """
+    window = max(1, workers) * 2
+    records = iter(records)
+    with ProcessPoolExecutor(max_workers=max(1, workers), mp_context=pool_context()) as pool:
+        pending = set()
+        index = 0
+        while True:
+            # The response is already streaming, so a broken input file ends the
+            # batch with a note instead of an exception that truncates the zip
+            try:
+                cv_data = next(records)
+            except StopIteration:
+                break
+            except Exception as e:
+                yield "BATCH_ERROR.txt", f"Stopped reading the batch file after record {index}: {e}\n".encode('utf-8')
+                break
+            index += 1
+            if index > max_records:
+                yield "BATCH_TRUNCATED.txt", f"Batch is limited to {max_records} records; the rest were skipped\n".encode('utf-8')
+                break
+            if isinstance(cv_data, InvalidRecord):
+                yield f"{index:04d}_CV.error.txt", f"Failed to generate CV: {cv_data.reason}\n".encode('utf-8')
+                continue
+            if not isinstance(cv_data, dict):
+                yield f"{index:04d}_CV.error.txt", b"Failed to generate CV: record is not an object\n"
+                continue
+            pending.add(pool.submit(render_record, index, cv_data, output_format))
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+class _ZipChunks(io.RawIOBase):
+    """Write-only, unseekable sink that hands zip bytes back to the generator"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def iter_zip(rendered):
+    """Stream a zip archive of (name, bytes) pairs, one chunk per member"""
+    sink = _ZipChunks()
+    # PDFs are already compressed, deflating them again only burns CPU
+    with zipfile.ZipFile(sink, mode='w') as archive:
+        for name, data in rendered:
+            compression = zipfile.ZIP_STORED if name.endswith('.pdf') else zipfile.ZIP_DEFLATED
+            archive.writestr(name, data, compress_type=compression)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    chunk = sink.drain()
+    if chunk:
+        yield chunk
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a batch of CVs into a zip archive")
+    parser.add_argument('input', help="JSON Lines or CSV file of cv_data records")
+    parser.add_argument('-o', '--output', default='cvs.zip', help="zip file to write")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='pdf', dest='output_format')
+    parser.add_argument('--workers', type=int, default=BATCH_WORKERS)
+    args = parser.parse_args()
+
+    count = 0
+    with open(args.input, newline='', encoding='utf-8', errors='replace') as source, open(args.output, 'wb') as target:
+        rendered = iter_rendered(read_cv_records(source, args.input), args.output_format, args.workers)
+
+        def counted():
+            nonlocal count
+            for item in rendered:
+                count += 1
+                yield item
+
+        for chunk in iter_zip(counted()):
+            target.write(chunk)
+    print(f"Wrote {count} CVs to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+Synthetic CV Corpus for the Benchmarks
+
+Builds CVs of a chosen length and skill density in PDF, DOCX and TXT, laid
+out like uploads/sample_resume.pdf: contact line, summary, experience with
+bullet points, education and a skills list. Skills are drawn from
+skills.json and filler text from a fixed vocabulary, both with a seeded
+random generator, so the same arguments always produce the same files.
+
+Usage:
+    python -m benchmarks.corpus OUTPUT_DIR    # write the default corpus
+"""
+
+import json
+import os
+import random
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SKILLS_PATH = os.path.join(BASE_DIR, 'skills.json')
+SAMPLE_RESUME = os.path.join(BASE_DIR, 'uploads', 'sample_resume.pdf')
+
+# Approximate characters of text per CV
+LENGTHS = {'short': 2500, 'medium': 6000, 'long': 15000}
+# Skills planted per CV
+DENSITIES = {'low': 5, 'medium': 20, 'high': 50}
+FORMATS = ('txt', 'docx', 'pdf')
+SEED = 42
+
+_VERBS = ['Led', 'Built', 'Designed', 'Improved', 'Managed', 'Delivered', 'Automated', 'Reduced', 'Launched', 'Migrated']
+_WORDS = ('team project customer reporting process platform service quality pipeline release budget '
+          'stakeholder analysis campaign workflow support product feature system growth revenue').split()
+_ROLES = ['Software Engineer', 'Data Analyst', 'Marketing Executive', 'Product Manager', 'Sales Associate']
+_COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Ltd', 'Stark Industries', 'Wayne Enterprises']
+
+
+def _sentence(rng, skills):
+    words = rng.sample(_WORDS, 6)
+    skill = f" using {rng.choice(skills)}" if skills and rng.random() < 0.5 else ''
+    return f"{rng.choice(_VERBS)} {' '.join(words)}{skill}, improving results by {rng.randint(5, 60)}%."
+
+
+def cv_text(length='medium', density='medium', seed=SEED):
+    """(text, planted skills) of one synthetic CV"""
+    rng = random.Random(f'{seed}-{length}-{density}')
+    with open(SKILLS_PATH) as f:
+        all_skills = sorted(set(json.load(f)))
+    skills = rng.sample(all_skills, min(DENSITIES[density], len(all_skills)))
+    target = LENGTHS[length]
+
+    lines = ['Alex Example', 'alex@example.com | +91 98765 43210 | Bengaluru', '', 'PROFESSIONAL SUMMARY',
+             ' '.join(_sentence(rng, skills) for _ in range(3)), '', 'EXPERIENCE']
+    size = sum(len(line) for line in lines)
+    while size < target * 0.8:
+        job = [f"{rng.choice(_ROLES)} - {rng.choice(_COMPANIES)}", f"{rng.randint(2012, 2020)} - {rng.randint(2021, 2025)}"]
+        job += [f"- {_sentence(rng, skills)}" for _ in range(4)]
+        lines += job + ['']
+        size += sum(len(line) for line in job)
+    lines += ['EDUCATION', 'B.Tech Computer Science, Example University, 2016', '', 'SKILLS', ', '.join(skills)]
+    return '\n'.join(lines), skills
+
+
+def write_txt(text, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def write_docx(text, path):
+    from docx import Document
+    document = Document()
+    for line in text.split('\n'):
+        document.add_paragraph(line)
+    document.save(path)
+
+
+def write_pdf(text, path):
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.utils import simpleSplit
+
+    pdf = canvas.Canvas(path, pagesize=A4)
+    width, height = A4
+    y = height - 50
+    for line in text.split('\n'):
+        for wrapped in simpleSplit(line, 'Helvetica', 10, width - 100) or ['']:
+            if y < 50:
+                pdf.showPage()
+                y = height - 50
+            pdf.setFont('Helvetica', 10)
+            pdf.drawString(50, y, wrapped)
+            y -= 14
+    pdf.save()
+
+
+WRITERS = {'txt': write_txt, 'docx': write_docx, 'pdf': write_pdf}
+
+
+def build_corpus(output_dir, lengths=tuple(LENGTHS), densities=tuple(DENSITIES), formats=FORMATS, seed=SEED):
+    """
+    Write one CV per (length, density, format) and return the cases as
+    dicts with name, path, format and planted skills. The real sample
+    resume is included as the 'sample' case when it exists.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    cases = []
+    for length in lengths:
+        for density in densities:
+            text, skills = cv_text(length, density, seed)
+            for fmt in formats:
+                name = f'{length}-{density}-{fmt}'
+                path = os.path.join(output_dir, f'{name}.{fmt}')
+                WRITERS[fmt](text, path)
+                cases.append({'name': name, 'path': path, 'format': fmt, 'skills': skills})
+    if os.path.exists(SAMPLE_RESUME):
+        cases.append({'name': 'sample-pdf', 'path': SAMPLE_RESUME, 'format': 'pdf', 'skills': []})
+    return cases
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        sys.exit('Usage: python -m benchmarks.corpus OUTPUT_DIR')
+    for case in build_corpus(sys.argv[1]):
+        print(case['path'])
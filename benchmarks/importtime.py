@@ -0,0 +1,135 @@
+"""
+Startup Benchmarks
+
+Reports what a server worker pays before it can answer its first request.
+It runs `python -X importtime -c "import app"` and sums the output into
+the slowest modules by cumulative time (a module plus everything it
+imports) and by self time. It then starts a fresh interpreter and times:
+
+    - importing app,
+    - the first GET / (the health check),
+    - each background warm-up step (see warmup.py), until all of them finish.
+
+Every measurement runs in a new process, so nothing is cached between
+them. A library that shows up in the import profile is loaded at import
+time, not lazily.
+
+Usage:
+    python -m benchmarks.importtime
+    python -m benchmarks.importtime --top 30 --output startup.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child: import the app, hit /, then wait for the warm-up
+STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+response = app.app.test_client().get('/')
+answered = time.perf_counter()
+import warmup
+warmup.warmup_done.wait(120)
+print(json.dumps({
+    'import_ms': round((imported - start) * 1000, 1),
+    'first_health_check_ms': round((answered - imported) * 1000, 1),
+    'health_check_status': response.status_code,
+    'warmup_steps_s': warmup.warmup_timings,
+    'warmup_total_s': round(time.perf_counter() - answered, 3),
+}))
+"""
+
+
+def parse_importtime(stderr):
+    """[(module, self_us, cumulative_us, depth)] from -X importtime output"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the column header
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(fields[0]), int(fields[1]), depth))
+    return entries
+
+
+def import_profile(module='app', top=20, env=None):
+    """Slowest modules imported by `import module`, by cumulative and self time"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=BASE_DIR, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    entries = parse_importtime(result.stderr)
+    total = next((cumulative for name, _, cumulative, depth in entries if name == module and depth == 0), 0)
+    by_cumulative = sorted(entries, key=lambda entry: entry[2], reverse=True)
+    by_self = sorted(entries, key=lambda entry: entry[1], reverse=True)
+    return {
+        'module': module,
+        'total_ms': round(total / 1000, 1),
+        'modules_imported': len(entries),
+        'slowest_cumulative': [{'module': name, 'cumulative_ms': round(cumulative / 1000, 1), 'depth': depth}
+                               for name, _, cumulative, depth in by_cumulative[:top]],
+        'slowest_self': [{'module': name, 'self_ms': round(own / 1000, 1)}
+                         for name, own, _, _ in by_self[:top]],
+    }
+
+
+def startup_timings(env=None):
+    """Import time, first health check and warm-up steps of a fresh app process"""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT], cwd=BASE_DIR, env=env,
+                            capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"App startup failed:\n{result.stderr[-2000:]}")
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings['process_wall_s'] = round(wall, 3)
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Profile app import time and worker startup')
+    parser.add_argument('--module', default='app', help='module to profile (default app)')
+    parser.add_argument('--top', type=int, default=20, help='modules listed per table')
+    parser.add_argument('--output', help='write the report as JSON')
+    args = parser.parse_args(argv)
+
+    # Profile the import alone; the warm-up thread would add its own imports
+    env = dict(os.environ, WARMUP_ENABLED='0', LOG_LEVEL=os.getenv('LOG_LEVEL', 'WARNING'))
+    profile = import_profile(args.module, args.top, env)
+    print(f"import {profile['module']}: {profile['total_ms']:.1f} ms, {profile['modules_imported']} modules")
+    print(f"\n{'slowest by cumulative time':<48} {'ms':>9}")
+    for entry in profile['slowest_cumulative']:
+        print(f"  {'  ' * entry['depth'] + entry['module']:<46} {entry['cumulative_ms']:>9.1f}")
+    print(f"\n{'slowest by self time':<48} {'ms':>9}")
+    for entry in profile['slowest_self']:
+        print(f"  {entry['module']:<46} {entry['self_ms']:>9.1f}")
+
+    report = {'import_profile': profile}
+    if args.module == 'app':
+        startup = startup_timings(dict(env, WARMUP_ENABLED='1'))
+        report['startup'] = startup
+        print(f"\nimport app {startup['import_ms']} ms, first GET / {startup['first_health_check_ms']} ms "
+              f"(status {startup['health_check_status']}), warm-up {startup['warmup_total_s']} s")
+        for step, seconds in startup['warmup_steps_s'].items():
+            print(f"  {step:<20} {'failed' if seconds is None else f'{seconds * 1000:.1f} ms'}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
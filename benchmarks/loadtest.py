@@ -0,0 +1,342 @@
+"""
+Load Test for the Flask Endpoints
+
+Starts the app under gunicorn (and the stub Gemini server for
+/generate_roadmap), then drives /upload, /api/ats-analysis, /api/generate-cv
+and /generate_roadmap from a pool of client threads with keep-alive
+connections. Reports throughput, latency percentiles and error rates per
+endpoint, and the resident memory of every gunicorn worker sampled during
+the run, so worker classes and counts can be compared before deploying.
+
+Usage:
+    python -m benchmarks.loadtest --workers 2 --concurrency 16 --duration 30
+    python -m benchmarks.loadtest --worker-class gthread --threads 4 --mix upload=1,cv=1
+    python -m benchmarks.loadtest --url http://127.0.0.1:5000     # an already running server
+
+--mix weights the endpoints: upload, ats, cv (PDF generation) and roadmap.
+Worker memory is read from /proc, so it is only reported on Linux and only
+for a server this script started.
+"""
+
+import argparse
+import glob
+import http.client
+import json
+import os
+import random
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from urllib.parse import urlsplit
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_RESUME = os.path.join(BASE_DIR, 'uploads', 'sample_resume.pdf')
+DEFAULT_MIX = 'upload=4,ats=2,cv=2,roadmap=1'
+# Uploaded CVs are saved under their file name; the load test's are removed afterwards
+UPLOAD_PREFIX = 'loadtest-'
+
+SAMPLE_CV_DATA = {
+    'personal': {'fullName': 'Alex Example', 'email': 'alex@example.com', 'phone': '+91 98765 43210',
+                 'location': 'Bengaluru', 'summary': 'Backend developer with five years of Python and SQL.'},
+    'experience': [{'position': 'Software Engineer', 'company': 'Acme Corp', 'startDate': '2020', 'endDate': 'Present',
+                    'description': 'Built REST APIs in Flask\nReduced query times by 40% with PostgreSQL indexes'}],
+    'education': [{'degree': 'B.Tech Computer Science', 'school': 'Example University', 'graduationDate': '2019'}],
+    'skills': ['Python', 'Flask', 'SQL', 'Docker', 'AWS'],
+    'output_format': 'pdf',
+}
+ROADMAP_ROLES = ['Data Analyst', 'Web Developer', 'Digital Marketing', 'Graphic Designer', 'Business Development',
+                 'Content Writer', 'Python Developer', 'Sales Executive', 'UI/UX Designer', 'HR Executive']
+
+
+def multipart(field, filename, content, fields=None):
+    """(body, content type) of a multipart/form-data upload"""
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in (fields or {}).items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+                 f'Content-Type: application/octet-stream\r\n\r\n'.encode() + content + b'\r\n')
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+
+class Scenarios:
+    """Builds the request for each endpoint; client is the client thread's number"""
+
+    def __init__(self, cv_bytes):
+        self.cv_bytes = cv_bytes
+
+    def upload(self, client, rng):
+        body, content_type = multipart('cv', f'{UPLOAD_PREFIX}{client}.pdf', self.cv_bytes)
+        return 'POST', '/upload', body, content_type
+
+    def ats(self, client, rng):
+        body, content_type = multipart('file', f'{UPLOAD_PREFIX}ats-{client}.pdf', self.cv_bytes,
+                                       {'job_title': rng.choice(ROADMAP_ROLES)})
+        return 'POST', '/api/ats-analysis', body, content_type
+
+    def cv(self, client, rng):
+        cv_data = dict(SAMPLE_CV_DATA, personal=dict(SAMPLE_CV_DATA['personal'], fullName=f'Load Test {rng.randint(1, 10 ** 6)}'))
+        return 'POST', '/api/generate-cv', json.dumps(cv_data).encode(), 'application/json'
+
+    def roadmap(self, client, rng):
+        payload = {'job_role': rng.choice(ROADMAP_ROLES), 'current_skills': rng.sample(SAMPLE_CV_DATA['skills'], 2)}
+        return 'POST', '/generate_roadmap', json.dumps(payload).encode(), 'application/json'
+
+
+def parse_mix(mix):
+    weights = {}
+    for part in mix.split(','):
+        name, _, weight = part.partition('=')
+        if not hasattr(Scenarios, name.strip()):
+            raise ValueError(f'Unknown endpoint in --mix: {name}')
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+class Results:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.statuses = {}
+        self.errors = {}
+
+    def record(self, name, seconds, status=None, error=None):
+        with self.lock:
+            self.latencies.setdefault(name, []).append(seconds)
+            if error is not None:
+                self.errors.setdefault(name, {}).setdefault(error, 0)
+                self.errors[name][error] += 1
+            else:
+                counts = self.statuses.setdefault(name, {})
+                counts[status] = counts.get(status, 0) + 1
+
+
+def run_client(client, base_url, scenarios, weights, deadline, max_requests, counter, results, seed):
+    rng = random.Random(seed + client)
+    names = list(weights)
+    url = urlsplit(base_url)
+    connection = None
+    while time.monotonic() < deadline:
+        with counter['lock']:
+            if max_requests and counter['sent'] >= max_requests:
+                return
+            counter['sent'] += 1
+        name = rng.choices(names, [weights[n] for n in names])[0]
+        method, path, body, content_type = getattr(scenarios, name)(client, rng)
+        start = time.perf_counter()
+        try:
+            if connection is None:
+                connection = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=120)
+            connection.request(method, path, body=body, headers={'Content-Type': content_type})
+            response = connection.getresponse()
+            response.read()
+            results.record(name, time.perf_counter() - start, status=response.status)
+            if response.getheader('Connection', '').lower() == 'close':
+                connection.close()
+                connection = None
+        except (OSError, http.client.HTTPException) as e:
+            results.record(name, time.perf_counter() - start, error=type(e).__name__)
+            if connection is not None:
+                connection.close()
+            connection = None
+
+
+def worker_pids(master_pid):
+    """Pids of a gunicorn master's worker processes, from /proc"""
+    try:
+        with open(f'/proc/{master_pid}/task/{master_pid}/children') as f:
+            return [int(pid) for pid in f.read().split()]
+    except OSError:
+        return []
+
+
+def rss_kib(pid):
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def sample_worker_memory(master_pid, stop, samples, interval=0.5):
+    while not stop.wait(interval):
+        for pid in worker_pids(master_pid):
+            rss = rss_kib(pid)
+            if rss is not None:
+                samples.setdefault(pid, []).append(rss)
+
+
+def wait_until_up(base_url, timeout=90):
+    url = urlsplit(base_url)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=5)
+            connection.request('GET', '/api/test')
+            response = connection.getresponse()
+            response.read()
+            connection.close()
+            if response.status == 200:
+                return True
+            time.sleep(0.5)
+        except (OSError, http.client.HTTPException):
+            time.sleep(0.5)
+    return False
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_servers(args):
+    """Start the stub Gemini server and gunicorn; returns both processes"""
+    stub_port = free_port()
+    stub = subprocess.Popen([sys.executable, os.path.join(BASE_DIR, 'stub_gemini_server.py'),
+                             '--port', str(stub_port), '--delay', str(args.gemini_delay)],
+                            cwd=BASE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    env = dict(os.environ,
+               GEMINI_API_KEY=os.getenv('GEMINI_API_KEY', 'loadtest'),
+               GEMINI_API_URL=f'http://127.0.0.1:{stub_port}/v1beta/models/gemini-pro:generateContent',
+               LOG_LEVEL=os.getenv('LOG_LEVEL', 'WARNING'))
+    command = [sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{args.port}',
+               '--workers', str(args.workers), '--worker-class', args.worker_class,
+               '--threads', str(args.threads), '--timeout', '120', 'app:app']
+    server = subprocess.Popen(command, cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL)
+    return stub, server
+
+
+def stop_process(process):
+    if process.poll() is None:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def percentile(sorted_values, pct):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))]
+
+
+def summarize(results, elapsed, memory):
+    report = {'elapsed_s': round(elapsed, 2), 'endpoints': {}}
+    total = failed = 0
+    for name, latencies in sorted(results.latencies.items()):
+        latencies = sorted(latencies)
+        statuses = results.statuses.get(name, {})
+        errors = results.errors.get(name, {})
+        bad = sum(count for status, count in statuses.items() if status >= 500) + sum(errors.values())
+        total += len(latencies)
+        failed += bad
+        report['endpoints'][name] = {
+            'requests': len(latencies),
+            'throughput_rps': round(len(latencies) / elapsed, 2),
+            'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+            'p90_ms': round(percentile(latencies, 90) * 1000, 1),
+            'p99_ms': round(percentile(latencies, 99) * 1000, 1),
+            'max_ms': round(latencies[-1] * 1000, 1),
+            'mean_ms': round(statistics.mean(latencies) * 1000, 1),
+            'error_rate': round(bad / len(latencies), 4),
+            'statuses': {str(status): count for status, count in sorted(statuses.items())},
+            'errors': errors,
+        }
+    report['total'] = {'requests': total, 'throughput_rps': round(total / elapsed, 2) if elapsed else 0,
+                       'error_rate': round(failed / total, 4) if total else 0}
+    report['workers'] = {str(pid): {'rss_start_mib': round(values[0] / 1024, 1),
+                                    'rss_end_mib': round(values[-1] / 1024, 1),
+                                    'rss_peak_mib': round(max(values) / 1024, 1)}
+                         for pid, values in sorted(memory.items())}
+    return report
+
+
+def print_report(report):
+    print(f"\n{'endpoint':<10} {'reqs':>7} {'rps':>8} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9} {'errors':>8}")
+    for name, stats in report['endpoints'].items():
+        print(f"{name:<10} {stats['requests']:>7} {stats['throughput_rps']:>8} {stats['p50_ms']:>9} "
+              f"{stats['p90_ms']:>9} {stats['p99_ms']:>9} {stats['max_ms']:>9} {stats['error_rate']:>8.2%}")
+    total = report['total']
+    print(f"{'total':<10} {total['requests']:>7} {total['throughput_rps']:>8} {'':>39} {total['error_rate']:>8.2%}")
+    for pid, memory in report['workers'].items():
+        print(f"worker {pid}: RSS {memory['rss_start_mib']} -> {memory['rss_end_mib']} MiB (peak {memory['rss_peak_mib']} MiB)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load test the Flask endpoints')
+    parser.add_argument('--url', help='test a running server instead of starting gunicorn')
+    parser.add_argument('--port', type=int, default=0, help='port for the gunicorn started here (default: a free one)')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--worker-class', default='sync', help='gunicorn worker class: sync, gthread, gevent, ...')
+    parser.add_argument('--threads', type=int, default=1, help='threads per gthread worker')
+    parser.add_argument('--concurrency', type=int, default=8, help='client threads')
+    parser.add_argument('--duration', type=float, default=30, help='seconds to run')
+    parser.add_argument('--requests', type=int, default=0, help='stop after this many requests (0: no limit)')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'endpoint weights (default {DEFAULT_MIX})')
+    parser.add_argument('--cv', default=SAMPLE_RESUME, help='CV file to upload')
+    parser.add_argument('--gemini-delay', type=float, default=1.0, help='stub Gemini response time in seconds')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='write the report as JSON')
+    args = parser.parse_args(argv)
+
+    weights = parse_mix(args.mix)
+    with open(args.cv, 'rb') as f:
+        scenarios = Scenarios(f.read())
+
+    stub = server = None
+    base_url = args.url
+    if not base_url:
+        args.port = args.port or free_port()
+        stub, server = start_servers(args)
+        base_url = f'http://127.0.0.1:{args.port}'
+    memory = {}
+    stop_sampling = threading.Event()
+    try:
+        if not wait_until_up(base_url) or (server is not None and server.poll() is not None):
+            print(f"Server at {base_url} did not come up")
+            return 1
+        if server is not None:
+            threading.Thread(target=sample_worker_memory, args=(server.pid, stop_sampling, memory), daemon=True).start()
+
+        print(f"Load testing {base_url}: {args.concurrency} clients, {args.duration}s, mix {args.mix}")
+        results = Results()
+        counter = {'lock': threading.Lock(), 'sent': 0}
+        deadline = time.monotonic() + args.duration
+        clients = [threading.Thread(target=run_client, args=(client, base_url, scenarios, weights, deadline,
+                                                             args.requests, counter, results, args.seed))
+                   for client in range(args.concurrency)]
+        start = time.monotonic()
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+        elapsed = time.monotonic() - start
+    finally:
+        stop_sampling.set()
+        for process in (server, stub):
+            if process is not None:
+                stop_process(process)
+        for path in glob.glob(os.path.join(BASE_DIR, 'uploads', f'{UPLOAD_PREFIX}*')):
+            os.remove(path)
+
+    report = summarize(results, elapsed, memory)
+    report['config'] = {key: value for key, value in vars(args).items() if key != 'output'}
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
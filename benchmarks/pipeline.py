@@ -0,0 +1,236 @@
+"""
+CV Pipeline Benchmarks
+
+Times each stage of /upload separately and end to end over the synthetic
+corpus, records the peak memory each stage allocates, and measures how job
+matching and next-skill ranking scale with the size of the job catalogue.
+Results are written as JSON, and a previous results file can be compared
+against to catch regressions.
+
+Stages run on every corpus case: extract_text_from_file,
+extract_skills_from_text, match_skills_to_jobs, next_skills,
+enhance_job_recommendations_with_courses and analyze_cv_for_ats. Matching
+and courses use the skills planted in the synthetic CV, so their timings do
+not move when the skill extractor changes. A stage that fails (for example
+when the NLTK data is not installed) is recorded with its error and the run
+carries on.
+
+Usage:
+    python -m benchmarks.pipeline                          # full run
+    python -m benchmarks.pipeline --quick                  # a few cases, fewer repeats
+    python -m benchmarks.pipeline --compare OLD.json       # exit 1 on regressions
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(BASE_DIR, 'benchmarks', 'results')
+
+# Catalogue sizes for the scaling curves, as multiples of jobs.json
+SCALES = (0.125, 0.25, 0.5, 1, 2, 4)
+# A stage is a regression when its median is this much slower than the baseline
+REGRESSION_TOLERANCE = 0.2
+
+
+def measure(func, repeat):
+    """Median, p95 and min milliseconds of func over repeat runs, and its peak KiB"""
+    func()  # warm caches and lazy loads
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    # Separate run for memory: tracemalloc slows the code it traces
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        'median_ms': round(statistics.median(times), 3),
+        'p95_ms': round(times[min(len(times) - 1, int(len(times) * 0.95))], 3),
+        'min_ms': round(times[0], 3),
+        'peak_kib': round(peak / 1024, 1),
+        'runs': repeat,
+    }
+
+
+def measure_or_error(func, repeat):
+    try:
+        return measure(func, repeat)
+    except Exception as e:
+        return {'error': f"{type(e).__name__}: {' '.join(str(e).split())[:300]}"}
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def bench_stages(cases, repeat):
+    from file_upload import extract_text_from_file
+    from skills_extractor import extract_skills_from_text
+    from job_match import match_skills_to_jobs
+    from course_recommender import enhance_job_recommendations_with_courses
+    from ats_analyzer import analyze_cv_for_ats
+    from catalogue import get_catalogue
+
+    graph = get_catalogue()['skill_graph']
+    results = {}
+    for case in cases:
+        print(f"  {case['name']}")
+        text = extract_text_from_file(case['path'])
+        try:
+            extracted = extract_skills_from_text(text)
+        except Exception:
+            extracted = []
+        skills = case['skills'] or extracted
+        jobs = match_skills_to_jobs(skills)
+
+        def end_to_end():
+            cv_text = extract_text_from_file(case['path'])
+            found = extract_skills_from_text(cv_text)
+            matched = match_skills_to_jobs(found)
+            graph.next_skills(found)
+            enhance_job_recommendations_with_courses(matched)
+            analyze_cv_for_ats(cv_text)
+
+        results[case['name']] = {
+            'input': {'format': case['format'], 'chars': len(text), 'pages': text.count('\f') or 1,
+                      'skills': len(skills), 'jobs_matched': len(jobs)},
+            'extract_text_from_file': measure_or_error(lambda: extract_text_from_file(case['path']), repeat),
+            'extract_skills_from_text': measure_or_error(lambda: extract_skills_from_text(text), repeat),
+            'match_skills_to_jobs': measure_or_error(lambda: match_skills_to_jobs(skills), repeat),
+            'next_skills': measure_or_error(lambda: graph.next_skills(skills), repeat),
+            'enhance_job_recommendations_with_courses': measure_or_error(
+                lambda: enhance_job_recommendations_with_courses(jobs), repeat),
+            'analyze_cv_for_ats': measure_or_error(lambda: analyze_cv_for_ats(text), repeat),
+            'end_to_end': measure_or_error(end_to_end, repeat),
+        }
+    return results
+
+
+def bench_scaling(skills, repeat):
+    """Matching and next-skill ranking over catalogues of SCALES x jobs.json"""
+    import job_match
+    from skill_graph import SkillGraph
+    from collections import Counter
+
+    full_jobs, full_sets = job_match.get_jobs()
+    curves = {'match_skills_to_jobs': [], 'next_skills': []}
+    try:
+        for scale in SCALES:
+            size = max(1, int(len(full_jobs) * scale))
+            jobs = [full_jobs[i % len(full_jobs)] for i in range(size)]
+            sets = [full_sets[i % len(full_sets)] for i in range(size)]
+            print(f"  {size} jobs")
+
+            job_match._jobs = (jobs, sets)
+            curves['match_skills_to_jobs'].append({'jobs': size, **measure_or_error(lambda: job_match.match_skills_to_jobs(skills), repeat)})
+
+            graph = SkillGraph()
+            graph.build(Counter(skill_set for skill_set in sets if skill_set))
+            curves['next_skills'].append({'jobs': size, **measure_or_error(lambda: graph.next_skills(skills), repeat)})
+    finally:
+        job_match._jobs = (full_jobs, full_sets)
+    return curves
+
+
+def compare(results, baseline, tolerance=REGRESSION_TOLERANCE):
+    """(name, old ms, new ms) of every timing slower than the baseline by more than tolerance"""
+    def timings(run):
+        for case, stages in run.get('stages', {}).items():
+            for stage, stats in stages.items():
+                if 'median_ms' in stats:
+                    yield f'{case}/{stage}', stats['median_ms']
+        for stage, curve in run.get('scaling', {}).items():
+            for point in curve:
+                if 'median_ms' in point:
+                    yield f"scaling/{stage}/{point['jobs']}", point['median_ms']
+
+    old = dict(timings(baseline))
+    regressions = []
+    for name, new_ms in timings(results):
+        old_ms = old.get(name)
+        if old_ms and new_ms > old_ms * (1 + tolerance):
+            regressions.append((name, old_ms, new_ms))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the CV analysis pipeline')
+    parser.add_argument('--repeat', type=int, default=20, help='timed runs per stage')
+    parser.add_argument('--quick', action='store_true', help='medium-length CVs only, 5 runs per stage')
+    parser.add_argument('--output', help='results file (default benchmarks/results/<time>.json)')
+    parser.add_argument('--compare', help='earlier results file to check for regressions')
+    parser.add_argument('--tolerance', type=float, default=REGRESSION_TOLERANCE,
+                        help='allowed slowdown before a stage counts as a regression')
+    args = parser.parse_args(argv)
+
+    # The app modules load their data files relative to the working directory
+    os.chdir(BASE_DIR)
+    sys.path.insert(0, BASE_DIR)
+    from benchmarks.corpus import build_corpus, LENGTHS, DENSITIES
+
+    repeat = 5 if args.quick else args.repeat
+    lengths = ('medium',) if args.quick else tuple(LENGTHS)
+
+    with tempfile.TemporaryDirectory() as corpus_dir:
+        cases = build_corpus(corpus_dir, lengths=lengths, densities=tuple(DENSITIES))
+        print(f"Timing {len(cases)} CVs, {repeat} runs per stage")
+        stages = bench_stages(cases, repeat)
+
+    print("Timing catalogue scaling")
+    scaling_skills = next(case['skills'] for case in cases if case['skills'])
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': repeat,
+        },
+        'stages': stages,
+        'scaling': bench_scaling(scaling_skills, repeat),
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+    for name, stats in stages.get('medium-medium-pdf', {}).items():
+        if 'median_ms' in stats:
+            print(f"  {name:<42} {stats['median_ms']:>9.2f} ms  {stats['peak_kib']:>9.1f} KiB")
+        elif 'error' in stats:
+            print(f"  {name:<42} failed: {stats['error'][:60]}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for name, old_ms, new_ms in regressions:
+            print(f"REGRESSION {name}: {old_ms:.2f} ms -> {new_ms:.2f} ms")
+        if regressions:
+            return 1
+        print("No regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Job Catalogue for Career Path Finder
+
+Everything that request handlers derive from the job datasets (jobs.json,
+job_details.csv, ...) is precomputed here once, at catalogue build time, and
+saved to a pickle artifact. Workers load the artifact on first use instead of
+scanning the raw data on every request. Derived sections, such as search
+indexes that are cheap to rebuild but large to store, are built from the
+loaded sections instead of being saved.
+
+Usage:
+    python catalogue.py          # rebuild catalogue.pkl
+"""
+
+import logging
+import os
+import pickle
+import threading
+
+from job_profiles import build_title_profiles
+from market_stats import build_market_aggregates
+from skill_graph import build_skill_graph
+from title_index import build_title_index
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CATALOGUE_PATH = os.path.join(BASE_DIR, 'catalogue.pkl')
+
+# Bump when the structure of any section changes so stale artifacts are rebuilt
+CATALOGUE_VERSION = 6
+
+# The artifact is stale when any of these is newer than it
+SOURCE_FILES = [
+    os.path.join(BASE_DIR, 'jobs.json'),
+    os.path.join(BASE_DIR, 'job_details.csv'),
+    os.path.join(BASE_DIR, 'skill_aliases.json'),
+]
+
+# Section name -> function building it
+SECTIONS = {
+    'market_stats': build_market_aggregates,
+    'title_profiles': build_title_profiles,
+    'skill_graph': build_skill_graph,
+}
+
+# Section name -> function building it from the loaded catalogue
+DERIVED_SECTIONS = {
+    'title_index': build_title_index,
+}
+
+_catalogue = None
+_catalogue_lock = threading.Lock()
+
+
+def build_catalogue():
+    """Build every catalogue section from the raw data"""
+    catalogue = {'version': CATALOGUE_VERSION}
+    for name, builder in SECTIONS.items():
+        catalogue[name] = builder()
+    return catalogue
+
+
+def save_catalogue(catalogue, path=CATALOGUE_PATH):
+    # Write to a temporary file first so other workers never read a partial artifact
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(catalogue, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def _artifact_is_fresh(path):
+    if not os.path.exists(path):
+        return False
+    built_at = os.path.getmtime(path)
+    return all(not os.path.exists(source) or os.path.getmtime(source) <= built_at for source in SOURCE_FILES)
+
+
+def load_catalogue(path=CATALOGUE_PATH):
+    """Load the saved catalogue, or None if it is missing, stale or from another version"""
+    if not _artifact_is_fresh(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            catalogue = pickle.load(f)
+    except Exception:
+        logger.warning("Could not load catalogue artifact; rebuilding it", exc_info=True)
+        return None
+    if catalogue.get('version') != CATALOGUE_VERSION or set(SECTIONS) - set(catalogue):
+        return None
+    return catalogue
+
+
+def get_catalogue():
+    """The process-wide catalogue, loaded (or built and saved) on first use"""
+    global _catalogue
+    if _catalogue is None:
+        with _catalogue_lock:
+            if _catalogue is None:
+                catalogue = load_catalogue()
+                if catalogue is None:
+                    logger.info("Catalogue artifact missing or stale, rebuilding")
+                    catalogue = build_catalogue()
+                    try:
+                        save_catalogue(catalogue)
+                    except OSError:
+                        logger.warning("Could not save catalogue artifact", exc_info=True)
+                for name, builder in DERIVED_SECTIONS.items():
+                    catalogue[name] = builder(catalogue)
+                _catalogue = catalogue
+    return _catalogue
+
+
+if __name__ == '__main__':
+    catalogue = build_catalogue()
+    save_catalogue(catalogue)
+    print(f"Catalogue written to {CATALOGUE_PATH} with sections: {', '.join(SECTIONS)}")
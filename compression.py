@@ -0,0 +1,85 @@
+"""
+Response Compression for Career Path Finder
+
+Compresses JSON, HTML and text responses with brotli or gzip, whichever the
+client prefers in Accept-Encoding. Brotli is used only when the brotli
+package is installed. Small responses, streamed responses and other types
+(PDFs, zips) are sent as they are.
+
+Settings:
+    COMPRESS_MIN_BYTES      smallest response body compressed (default 1024)
+    COMPRESS_GZIP_LEVEL     gzip level, 1-9 (default 5)
+    COMPRESS_BROTLI_QUALITY brotli quality, 0-11 (default 4)
+"""
+
+import gzip
+import os
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+COMPRESS_MIN_BYTES = int(os.getenv('COMPRESS_MIN_BYTES', '1024'))
+COMPRESS_GZIP_LEVEL = int(os.getenv('COMPRESS_GZIP_LEVEL', '5'))
+COMPRESS_BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', '4'))
+
+COMPRESSIBLE_TYPES = {'application/json', 'text/html', 'text/plain', 'text/css', 'text/csv', 'application/javascript'}
+
+
+def _accepted_encodings(header):
+    """Encoding -> q-value from an Accept-Encoding header"""
+    accepted = {}
+    for part in header.split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+    return accepted
+
+
+def choose_encoding(header):
+    """'br', 'gzip' or None for an Accept-Encoding header"""
+    accepted = _accepted_encodings(header or '')
+    candidates = (['br'] if BROTLI_AVAILABLE else []) + ['gzip']
+    best = None
+    for encoding in candidates:
+        quality = accepted.get(encoding, accepted.get('*', 0.0))
+        if quality > 0 and (best is None or quality > best[1]):
+            best = (encoding, quality)
+    return best[0] if best else None
+
+
+def compress_response(response, accept_encoding):
+    if (response.direct_passthrough or response.is_streamed or response.status_code != 200
+            or response.mimetype not in COMPRESSIBLE_TYPES or 'Content-Encoding' in response.headers):
+        return response
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_BYTES:
+        return response
+    encoding = choose_encoding(accept_encoding)
+    if encoding == 'br':
+        body = brotli.compress(body, quality=COMPRESS_BROTLI_QUALITY)
+    elif encoding == 'gzip':
+        body = gzip.compress(body, compresslevel=COMPRESS_GZIP_LEVEL)
+    else:
+        return response
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def install_compression(app):
+    from flask import request
+
+    @app.after_request
+    def compress(response):
+        return compress_response(response, request.headers.get('Accept-Encoding'))
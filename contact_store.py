@@ -0,0 +1,214 @@
+"""
+Contact Form Storage for Career Path Finder
+
+Stores /submit contact form entries in SQLite, in WAL mode, so every
+gunicorn worker can write to the same file without interleaving, and
+readers never block writers. A submission is appended to an in-process
+buffer and the request returns straight away. A background thread writes
+the buffer in one transaction every CONTACT_FLUSH_SECONDS, or as soon as
+CONTACT_BATCH_SIZE entries are waiting, and once more when the worker
+exits. An entry can be lost only if a worker is killed outright before its
+next flush.
+
+Entries are read back a page at a time in id order: pass the last id of a
+page as `after` to get the next one.
+
+Usage:
+    python contact_store.py import contact_data.json   # load the old JSON-lines file
+    python contact_store.py export > contacts.jsonl
+
+Settings:
+    CONTACT_DB             SQLite file for contact entries (default contact_data.db)
+    CONTACT_FLUSH_SECONDS  longest time an entry waits in the buffer (default 1)
+    CONTACT_BATCH_SIZE     buffered entries that trigger an early write (default 100)
+"""
+
+import argparse
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CONTACT_DB = os.getenv('CONTACT_DB', os.path.join(BASE_DIR, 'contact_data.db'))
+CONTACT_FLUSH_SECONDS = float(os.getenv('CONTACT_FLUSH_SECONDS', '1'))
+CONTACT_BATCH_SIZE = int(os.getenv('CONTACT_BATCH_SIZE', '100'))
+
+# Form fields with their own column; anything else the client sends is kept in extra
+CONTACT_FIELDS = ('name', 'email', 'subject', 'message')
+MAX_PAGE_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
+
+class ContactStore:
+    def __init__(self, db_path=CONTACT_DB, flush_seconds=CONTACT_FLUSH_SECONDS, batch_size=CONTACT_BATCH_SIZE):
+        self.db_path = db_path
+        self.flush_seconds = flush_seconds
+        self.batch_size = batch_size
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._local = threading.local()
+        os.register_at_fork(after_in_child=self._after_fork)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS contacts ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL, "
+                "name TEXT, email TEXT, subject TEXT, message TEXT, extra TEXT)"
+            )
+
+    def _after_fork(self):
+        # The parent still owns and writes its buffered entries
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def _connect(self):
+        # One connection per thread, and a new one after a fork
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # WAL keeps committed transactions safe with NORMAL; only the last one can be lost on power failure
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def _row(entry):
+        extra = {key: value for key, value in entry.items() if key not in CONTACT_FIELDS and key != 'timestamp'}
+        return (entry['timestamp'], *(_text(entry.get(field)) for field in CONTACT_FIELDS),
+                json.dumps(extra) if extra else None)
+
+    def add(self, entry):
+        """Queue an entry (a dict with a timestamp) for the next batch write"""
+        row = self._row(entry)
+        with self._lock:
+            self._buffer.append(row)
+            pending = len(self._buffer)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='contact-store', daemon=True)
+                self._thread.start()
+        if pending >= self.batch_size:
+            self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Write every buffered entry in one transaction; returns how many were written"""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+            if not rows:
+                return 0
+            try:
+                with self._connect() as conn:
+                    conn.executemany(
+                        "INSERT INTO contacts (timestamp, name, email, subject, message, extra) VALUES (?, ?, ?, ?, ?, ?)",
+                        rows)
+            except sqlite3.Error:
+                logger.exception("Could not write %d contact entries; keeping them for the next flush", len(rows))
+                with self._lock:
+                    self._buffer[:0] = rows
+                return 0
+            return len(rows)
+
+    def count(self):
+        return self._connect().execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+
+    def page(self, after=0, limit=50):
+        """Up to limit entries with an id above after, oldest first"""
+        # Include this worker's own recent submissions
+        self.flush()
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        rows = self._connect().execute(
+            "SELECT id, timestamp, name, email, subject, message, extra FROM contacts WHERE id > ? ORDER BY id LIMIT ?",
+            (after, limit)).fetchall()
+        entries = []
+        for row in rows:
+            entry = {'id': row[0], 'timestamp': row[1], **dict(zip(CONTACT_FIELDS, row[2:6]))}
+            if row[6]:
+                entry.update({key: value for key, value in json.loads(row[6]).items() if key not in entry})
+            entries.append(entry)
+        return entries
+
+    def iter_entries(self, after=0, batch=MAX_PAGE_SIZE):
+        """Every entry with an id above after, read a page at a time"""
+        while True:
+            entries = self.page(after, batch)
+            yield from entries
+            if len(entries) < batch:
+                return
+            after = entries[-1]['id']
+
+    def import_jsonl(self, path):
+        """Copy the entries of a JSON-lines file (the old contact_data.json); returns how many"""
+        rows = []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entry = json.loads(line)
+                    entry.setdefault('timestamp', '')
+                    rows.append(self._row(entry))
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO contacts (timestamp, name, email, subject, message, extra) VALUES (?, ?, ?, ?, ?, ?)",
+                rows)
+        return len(rows)
+
+
+def _text(value):
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_contact_store():
+    """The process-wide store, opened on first use"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ContactStore()
+                atexit.register(_store.flush)
+    return _store
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Import or export contact form entries')
+    commands = parser.add_subparsers(dest='command', required=True)
+    importer = commands.add_parser('import', help='load a JSON-lines file of entries')
+    importer.add_argument('path')
+    exporter = commands.add_parser('export', help='write every entry as JSON lines to stdout')
+    exporter.add_argument('--after', type=int, default=0, help='start after this entry id')
+    args = parser.parse_args(argv)
+
+    store = get_contact_store()
+    if args.command == 'import':
+        print(f"Imported {store.import_jsonl(args.path)} entries into {store.db_path}")
+    else:
+        for entry in store.iter_entries(args.after):
+            sys.stdout.write(json.dumps(entry) + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
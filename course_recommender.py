@@ -5,6 +5,8 @@ This module provides course recommendations for skills that users need to acquir
 It uses a predefined database of courses mapped to skills.
 """
 
+from skill_normalizer import course_topic
+
 # Sample course database - In a production environment, this would be in a real database
 # Each skill can have multiple courses from different platforms
 COURSE_DATABASE = {
@@ -797,17 +799,11 @@ COURSE_DATABASE = {
 
 def get_courses_for_skill(skill):
     
-    # Normalize the skill name to lowercase for case-insensitive matching
-    skill_lower = skill.lower()
-    
-    # Direct match in the database
-    if skill_lower in COURSE_DATABASE:
-        return COURSE_DATABASE[skill_lower]
-    
-    # Try to find partial matches
-    for db_skill in COURSE_DATABASE:
-        if skill_lower in db_skill or db_skill in skill_lower:
-            return COURSE_DATABASE[db_skill]
+    # Resolve aliases and related skills ("nodejs", "react native") to a course
+    # topic through the precomputed skill table
+    topic = course_topic(skill)
+    if topic:
+        return COURSE_DATABASE.get(topic, [])
     
     # No match found
     return []
@@ -844,4 +840,24 @@ def enhance_job_recommendations_with_courses(job_recommendations):
         
         enhanced_recommendations.append(enhanced_job)
     
-    return enhanced_recommendations
\ No newline at end of file
+    return enhanced_recommendations
+
+def compact_job_recommendations(job_recommendations):
+    """
+    Compact form of the recommendations for large responses: jobs with the
+    same title, match and missing skills are merged with a postings count,
+    and each skill's courses are listed once instead of in every job.
+    Returns (jobs, courses by skill).
+    """
+    merged = {}
+    for job in job_recommendations:
+        key = (job['title'], job['match'], tuple(job.get('skillsToAcquire', ())))
+        if key in merged:
+            merged[key]['postings'] += 1
+        else:
+            compact_job = {key: value for key, value in job.items() if value is not None}
+            compact_job['postings'] = 1
+            merged[key] = compact_job
+
+    missing_skills = sorted({skill for job in merged.values() for skill in job.get('skillsToAcquire', ())})
+    return list(merged.values()), get_courses_for_skills(missing_skills)
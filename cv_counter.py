@@ -0,0 +1,165 @@
+"""
+CV Counter and Upload Retention for Career Path Finder
+
+/cv-count used to list the uploads folder on every page load, and that
+folder only ever grew. Now the count lives in a SQLite counter, which
+every worker increments atomically when /upload saves a CV. Only /upload
+counts; files saved by /api/ats-analysis do not. Workers cache
+the value for CV_COUNT_CACHE_SECONDS. The first time the counter is
+created, it starts from the number of files already in the uploads
+folder, so the displayed number does not drop.
+
+Uploaded CVs are only needed while their request runs. A background
+thread in each worker deletes uploads older than UPLOAD_RETENTION_HOURS,
+except sample_resume.pdf. Deleting a file does not change the count.
+
+Settings:
+    CV_COUNTER_DB           SQLite file for the counter (default cv_counter.db)
+    CV_COUNT_CACHE_SECONDS  how long a worker reuses the count it read (default 5)
+    UPLOAD_RETENTION_HOURS  age at which uploads are deleted (default 24; 0 keeps them)
+    UPLOAD_GC_SECONDS       time between cleanup passes (default 600)
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from file_upload import UPLOAD_FOLDER
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CV_COUNTER_DB = os.getenv('CV_COUNTER_DB', os.path.join(BASE_DIR, 'cv_counter.db'))
+CV_COUNT_CACHE_SECONDS = float(os.getenv('CV_COUNT_CACHE_SECONDS', '5'))
+UPLOAD_RETENTION_HOURS = float(os.getenv('UPLOAD_RETENTION_HOURS', '24'))
+UPLOAD_GC_SECONDS = float(os.getenv('UPLOAD_GC_SECONDS', '600'))
+
+# Files the cleanup never deletes
+KEEP_UPLOADS = {'sample_resume.pdf'}
+
+logger = logging.getLogger(__name__)
+
+
+def _count_files(folder):
+    try:
+        with os.scandir(folder) as entries:
+            return sum(1 for entry in entries if entry.is_file())
+    except OSError:
+        return 0
+
+
+class CVCounter:
+    """A counter shared by every worker through SQLite, read through a short cache"""
+
+    def __init__(self, db_path=CV_COUNTER_DB, name='cvs', cache_seconds=CV_COUNT_CACHE_SECONDS, seed_folder=UPLOAD_FOLDER):
+        self.db_path = db_path
+        self.name = name
+        self.cache_seconds = cache_seconds
+        self._cached = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        # BEGIN IMMEDIATE so only the first worker to get here seeds the counter
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM counters WHERE name = ?", (name,)).fetchone() is None:
+                conn.execute("INSERT INTO counters (name, value) VALUES (?, ?)", (name, _count_files(seed_folder)))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _connect(self):
+        # One connection per thread, and a new one after a fork
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            # Autocommit: each statement below is its own transaction
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _remember(self, value):
+        with self._lock:
+            self._cached = (value, time.monotonic())
+        return value
+
+    def increment(self, amount=1):
+        """Add to the counter; returns the new value"""
+        row = self._connect().execute(
+            "UPDATE counters SET value = value + ? WHERE name = ? RETURNING value", (amount, self.name)).fetchone()
+        return self._remember(row[0])
+
+    def value(self):
+        with self._lock:
+            cached = self._cached
+        if cached is not None and time.monotonic() - cached[1] < self.cache_seconds:
+            return cached[0]
+        row = self._connect().execute("SELECT value FROM counters WHERE name = ?", (self.name,)).fetchone()
+        return self._remember(row[0] if row else 0)
+
+
+def prune_uploads(folder=UPLOAD_FOLDER, max_age_seconds=UPLOAD_RETENTION_HOURS * 3600, keep=KEEP_UPLOADS):
+    """Delete files in folder last modified more than max_age_seconds ago; returns how many"""
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.name in keep or not entry.is_file():
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                        removed += 1
+                except FileNotFoundError:
+                    pass  # another worker pruned it first
+    except OSError:
+        logger.exception("Upload cleanup failed")
+    return removed
+
+
+def _gc_loop(interval, max_age_seconds):
+    while True:
+        removed = prune_uploads(max_age_seconds=max_age_seconds)
+        if removed:
+            logger.info("Deleted old uploads", extra={'removed_uploads': removed})
+        time.sleep(interval)
+
+
+_counter = None
+_counter_lock = threading.Lock()
+_gc_thread = None
+
+
+def get_cv_counter():
+    """The process-wide counter, opened on first use"""
+    global _counter
+    if _counter is None:
+        with _counter_lock:
+            if _counter is None:
+                _counter = CVCounter()
+    return _counter
+
+
+def record_upload():
+    """Count a saved CV; a counter failure is logged, never raised to the upload"""
+    try:
+        get_cv_counter().increment()
+    except sqlite3.Error:
+        logger.exception("Could not update the CV counter")
+
+
+def start_upload_gc(interval=UPLOAD_GC_SECONDS, retention_hours=UPLOAD_RETENTION_HOURS):
+    """Start this worker's cleanup thread (once); returns it, or None when retention is off"""
+    global _gc_thread
+    if retention_hours <= 0:
+        return None
+    with _counter_lock:
+        if _gc_thread is None:
+            _gc_thread = threading.Thread(target=_gc_loop, args=(interval, retention_hours * 3600),
+                                          name='upload-gc', daemon=True)
+            _gc_thread.start()
+    return _gc_thread
@@ -0,0 +1,142 @@
+"""
+CV HTML Templates for the CV Builder
+
+Renders the builder's cv_data into HTML with Jinja2 templates from
+templates/cv_themes. The environment autoescapes all user data, and every
+theme is compiled once at import so requests only pay for rendering.
+"""
+
+import os
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+CV_THEMES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates', 'cv_themes')
+CV_THEMES = ('classic', 'modern', 'minimal')
+DEFAULT_CV_THEME = 'classic'
+# Builder template choices without a theme of their own
+THEME_ALIASES = {'creative': 'modern'}
+
+SAFE_URL_SCHEMES = ('http://', 'https://', 'mailto:')
+
+
+def safe_url(url):
+    """Only let through link targets that cannot run script"""
+    url = str(url).strip()
+    if url.lower().startswith(SAFE_URL_SCHEMES):
+        return url
+    # Bare domains such as "linkedin.com/in/me" are common in the builder
+    if url and ':' not in url.split('/', 1)[0]:
+        return f'https://{url}'
+    return '#'
+
+
+_env = Environment(
+    loader=FileSystemLoader(CV_THEMES_DIR),
+    autoescape=select_autoescape(['html']),
+    auto_reload=False,
+    trim_blocks=True,
+    lstrip_blocks=True,
+)
+_env.filters['safe_url'] = safe_url
+
+# Compile every theme up front
+_templates = {theme: _env.get_template(f'{theme}.html') for theme in CV_THEMES}
+
+
+def resolve_theme(theme):
+    theme = THEME_ALIASES.get(theme, theme)
+    return theme if theme in _templates else DEFAULT_CV_THEME
+
+
+def build_cv_context(cv_data):
+    """Normalize cv_data into the template context, applying the builder's defaults"""
+    # Helper function to safely get nested data
+    def safe_get(data, key, default=''):
+        if data and isinstance(data, dict):
+            return data.get(key, default)
+        return default
+
+    def dict_items(key):
+        items = cv_data.get(key, [])
+        if not isinstance(items, list):
+            return []
+        return [item for item in items if isinstance(item, dict)]
+
+    # Validate required data
+    if not cv_data or not isinstance(cv_data, dict):
+        raise ValueError("Invalid CV data provided")
+
+    personal = cv_data.get('personal', {})
+    email = safe_get(personal, 'email', '')
+    phone = safe_get(personal, 'phone', '')
+    location = safe_get(personal, 'location', '')
+    linkedin = safe_get(personal, 'linkedin', '')
+    website = safe_get(personal, 'website', '')
+
+    contact = []
+    if email:
+        contact.append({'label': email, 'href': f'mailto:{email}'})
+    if phone:
+        contact.append({'label': phone})
+    if location:
+        contact.append({'label': location})
+    if linkedin:
+        contact.append({'label': 'LinkedIn', 'href': linkedin, 'external': True})
+    if website:
+        contact.append({'label': 'Website', 'href': website, 'external': True})
+
+    languages = []
+    for lang in cv_data.get('languages', []) or []:
+        if isinstance(lang, dict):
+            languages.append({
+                'language': safe_get(lang, 'language', 'Language'),
+                'proficiency': safe_get(lang, 'proficiency', ''),
+            })
+        elif isinstance(lang, str):
+            languages.append({'language': lang, 'proficiency': ''})
+
+    skills = cv_data.get('skills', [])
+    return {
+        'full_name': safe_get(personal, 'fullName', 'Your Name'),
+        'contact': contact,
+        'summary': (cv_data.get('summary') or '').strip(),
+        'experience': [{
+            'position': safe_get(exp, 'position', 'Position'),
+            'company': safe_get(exp, 'company', 'Company'),
+            'start_date': safe_get(exp, 'startDate', ''),
+            'end_date': safe_get(exp, 'endDate', 'Present'),
+            'description': safe_get(exp, 'description', ''),
+        } for exp in dict_items('experience')],
+        'education': [{
+            'degree': safe_get(edu, 'degree', 'Degree'),
+            'school': safe_get(edu, 'school', 'Institution'),
+            'graduation_date': safe_get(edu, 'graduationDate', ''),
+            'gpa': safe_get(edu, 'gpa', ''),
+        } for edu in dict_items('education')],
+        'skills': [skill.strip() for skill in skills if skill and isinstance(skill, str)] if isinstance(skills, list) else [],
+        'projects': [{
+            'name': safe_get(project, 'name', 'Project'),
+            'description': safe_get(project, 'description', ''),
+            'technologies': safe_get(project, 'technologies', ''),
+        } for project in dict_items('projects')],
+        'certifications': [{
+            'name': safe_get(cert, 'name', 'Certification'),
+            'issuer': safe_get(cert, 'issuer', ''),
+            'date': safe_get(cert, 'date', ''),
+        } for cert in dict_items('certifications')],
+        'languages': languages,
+    }
+
+
+def render_cv_html(cv_data, theme=DEFAULT_CV_THEME):
+    """Render the whole CV to an HTML string"""
+    return _templates[resolve_theme(theme)].render(build_cv_context(cv_data))
+
+
+def stream_cv_html(cv_data, theme=DEFAULT_CV_THEME):
+    """
+    Render the CV as a generator of HTML chunks for a streamed response.
+    The context is built eagerly so invalid data fails before streaming starts.
+    """
+    context = build_cv_context(cv_data)
+    return _templates[resolve_theme(theme)].generate(context)
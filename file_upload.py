@@ -1,7 +1,7 @@
 from werkzeug.utils import secure_filename
 import os
-from pdfminer.high_level import extract_text
-from docx import Document
+
+from warmup import lazy_import
 
 # Folder where uploaded CVs will be saved
 UPLOAD_FOLDER = 'uploads'
@@ -17,11 +17,12 @@ def allowed_file(filename):
 
 # Extract text from PDF file
 def extract_text_from_pdf(file_path):
-    return extract_text(file_path)
+    # pdfminer and python-docx are imported on first use to keep app start fast
+    return lazy_import('pdfminer.high_level').extract_text(file_path)
 
 # Extract text from DOCX file
 def extract_text_from_docx(file_path):
-    doc = Document(file_path)
+    doc = lazy_import('docx').Document(file_path)
     full_text = []
     for para in doc.paragraphs:
         full_text.append(para.text)
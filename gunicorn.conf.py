@@ -0,0 +1,67 @@
+"""
+Gunicorn Settings for Career Path Finder
+
+Gunicorn reads this file automatically when started from the project
+directory, so the Procfile, Render and Railway start commands all use it.
+Command-line flags still override anything set here.
+
+The default worker class is gevent when it is installed. A gevent worker
+serves many requests at once, and each request yields while it waits on
+the network (the Gemini call behind /generate_roadmap, SQLite aside), so a
+slow roadmap no longer holds a whole worker. CPU-heavy work (PDF parsing,
+ATS analysis, PDF rendering) goes to each worker's process pool (see
+worker_pool.py), so it does not stall the worker's event loop.
+Without gevent, the default is gthread workers.
+
+Settings:
+    PORT                   port to bind on all interfaces (default 5000)
+    WEB_CONCURRENCY        server worker processes (default 2)
+    GUNICORN_WORKER_CLASS  gevent, gthread or sync (default gevent if installed)
+    GUNICORN_CONNECTIONS   concurrent requests per gevent worker (default 100)
+    GUNICORN_THREADS       threads per gthread worker (default 4)
+    GUNICORN_TIMEOUT       seconds before a silent worker is restarted (default 120)
+"""
+
+import glob
+import importlib.util
+import os
+import shutil
+import tempfile
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', '2'))
+worker_class = os.getenv('GUNICORN_WORKER_CLASS') or ('gevent' if importlib.util.find_spec('gevent') else 'gthread')
+worker_connections = int(os.getenv('GUNICORN_CONNECTIONS', '100'))
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+graceful_timeout = 30
+keepalive = 5
+
+# The app is imported by each worker, after gevent has patched it, so
+# requests and the other blocking clients cooperate with the event loop
+preload_app = False
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def on_starting(server):
+    """Give this run its own metrics directory and drop those of servers that have stopped"""
+    # The workers inherit it; see metrics.py
+    os.environ['METRICS_RUN_ID'] = str(server.pid)
+    # Same default as metrics.py, which is not imported here so the master stays app-free
+    metrics_dir = os.getenv('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'cv-analyser-metrics'))
+    for path in glob.glob(os.path.join(metrics_dir, 'run-*')):
+        pid = path.rsplit('-', 1)[-1]
+        if not pid.isdigit() or int(pid) == server.pid or not _pid_alive(int(pid)):
+            shutil.rmtree(path, ignore_errors=True)
+    # Snapshots written before runs had their own directory
+    for path in glob.glob(os.path.join(metrics_dir, 'metrics-*.json')):
+        os.remove(path)
@@ -1,17 +1,42 @@
 import json
+import threading
 
-# Load job dataset (replace this with a database or more advanced dataset in production)
-with open('jobs.json') as f:
-    job_dataset = json.load(f)
+from catalogue import get_catalogue
+from job_profiles import split_job_skills
+from skill_normalizer import canonical_skill
+
+_jobs = None
+_jobs_lock = threading.Lock()
+
+
+def get_jobs():
+    """(job dataset, each job's canonical skill set), loaded on first use"""
+    global _jobs
+    if _jobs is None:
+        with _jobs_lock:
+            if _jobs is None:
+                # Load job dataset (replace this with a database or more advanced dataset in production)
+                with open('jobs.json') as f:
+                    job_dataset = json.load(f)
+                # Each job's skills, split out of the comma-joined strings and normalized once
+                job_skill_sets = [
+                    frozenset(canonical_skill(skill) for skill in split_job_skills(job['skills']))
+                    for job in job_dataset
+                ]
+                _jobs = (job_dataset, job_skill_sets)
+    return _jobs
 
 def match_skills_to_jobs(extracted_skills):
     job_recommendations = []
     
-    # Convert extracted_skills to a set for intersection
-    extracted_skills = set(extracted_skills)
+    # Convert extracted_skills to a set of canonical skills for intersection
+    extracted_skills = {canonical_skill(skill) for skill in extracted_skills}
+    title_index = get_catalogue()['title_index']
+    job_dataset, job_skill_sets = get_jobs()
     
-    for job in job_dataset:
-        job_skills = set(job['skills'])
+    for job, job_skills in zip(job_dataset, job_skill_sets):
+        if not job_skills:
+            continue
         
         # Calculate the match score based on intersection of extracted and job skills
         common_skills = extracted_skills.intersection(job_skills)
@@ -20,9 +45,10 @@ def match_skills_to_jobs(extracted_skills):
         if match_score > 0:
             job_recommendations.append({
                 'title': job['title'],
+                'role_id': title_index.resolve(job['title']),
                 'match': round(match_score, 2),
                 # 'description': job['description'],
-                'skillsToAcquire': list(job_skills - common_skills)
+                'skillsToAcquire': sorted(job_skills - common_skills)
             })
     
     # Sort recommendations by match score in descending order
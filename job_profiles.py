@@ -0,0 +1,261 @@
+"""
+Job Title Profiles for Career Path Finder
+
+Aggregates jobs.json into one skill profile per distinct job title: how many
+postings use the title and what share of them ask for each skill. Profiles
+are built once as part of the job catalogue and stored as a sparse
+title x skill matrix, so targeted ATS scoring is a dictionary lookup and
+scoring a CV against every title only visits the titles that ask for one of
+the CV's skills. The scoring is a plain Python loop over those matrix
+entries, not vectorized code; numpy is not a dependency, and a CV's skills
+touch a few thousand entries at most.
+"""
+
+import json
+import os
+import re
+from array import array
+from collections import Counter, defaultdict
+from functools import lru_cache
+
+from similar_roles import build_similar_roles, SIMILAR_ROLES
+from skill_normalizer import canonical_skill, SKILL_ALIASES
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+JOBS_PATH = os.path.join(BASE_DIR, 'jobs.json')
+
+# Skills kept per title profile, most requested first
+PROFILE_SIZE = 25
+# Titles need this many postings to be ranked when scoring against all titles
+MIN_RANKED_POSTINGS = 3
+# Longest skill name, in tokens, looked up in CV text
+MAX_SKILL_TOKENS = 5
+
+# Perks scraped into the skills field alongside the real skills
+PERK_TERMS = {
+    '5 days a week', 'informal dress code', 'free snacks & beverages', 'flexible work hours',
+    'health insurance', 'life insurance', 'cab/transportation facility', 'job offer',
+    'certificate', 'letter of recommendation',
+}
+# Placeholders some postings have instead of a skills list
+MISSING_SKILL_VALUES = {'n/a', 'na', 'none', 'nil', '-'}
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.&/'-]*")
+
+
+def normalize_title(title):
+    return ' '.join(str(title).lower().split())
+
+
+def skill_tokens(text):
+    """Lowercase word tokens, keeping skill punctuation such as c++, c#, node.js, ms-excel"""
+    return [token.rstrip(".-/'") for token in _TOKEN_PATTERN.findall(text.lower())]
+
+
+def skill_key(skill):
+    """Lookup key for a skill name; matches the token n-grams of CV text"""
+    return ' '.join(skill_tokens(skill))
+
+
+def split_job_skills(raw_skills):
+    """
+    The skills of one jobs.json entry. Most entries hold a single
+    comma-joined string, a few a list of separate skills.
+    """
+    if isinstance(raw_skills, str):
+        raw_skills = [raw_skills]
+    skills = []
+    for raw in raw_skills or []:
+        for skill in str(raw).split(','):
+            skill = ' '.join(skill.lower().split())
+            if skill and skill not in PERK_TERMS and skill not in MISSING_SKILL_VALUES and skill not in skills:
+                skills.append(skill)
+    return skills
+
+
+class TitleProfiles:
+    """
+    Skill profiles of every job title. Row i of the matrix is title i; each
+    entry is the share of that title's postings asking for the skill. The
+    matrix is stored both by title (CSR) for profile lookups and by skill
+    (CSC) for scoring a CV against all titles.
+    """
+
+    def __init__(self):
+        self.titles = []
+        self.title_ids = {}
+        self.postings = array('I')
+        self.skills = []
+        self.skill_ids = {}
+        # Title-major: skills of title i are at row_ptr[i]:row_ptr[i + 1]
+        self.row_ptr = array('I', [0])
+        self.row_skills = array('I')
+        self.row_weights = array('f')
+        self.row_totals = array('d')
+        # Skill-major: titles asking for skill j are at col_ptr[j]:col_ptr[j + 1]
+        self.col_ptr = array('I')
+        self.col_titles = array('I')
+        self.col_weights = array('f')
+        # Nearest titles by profile skills, set by build_title_profiles()
+        self.similar_roles = None
+
+    def _skill_id(self, skill):
+        key = skill_key(skill)
+        skill_id = self.skill_ids.get(key)
+        if skill_id is None:
+            skill_id = self.skill_ids[key] = len(self.skills)
+            self.skills.append(skill)
+        return skill_id
+
+    def add(self, title, postings, skill_counts):
+        self.title_ids[normalize_title(title)] = len(self.titles)
+        self.titles.append(title)
+        self.postings.append(postings)
+        top = sorted(skill_counts.items(), key=lambda item: (-item[1], item[0]))[:PROFILE_SIZE]
+        total = 0.0
+        for skill, count in top:
+            weight = count / postings
+            self.row_skills.append(self._skill_id(skill))
+            self.row_weights.append(weight)
+            total += weight
+        self.row_totals.append(total)
+        self.row_ptr.append(len(self.row_skills))
+
+    def finish(self):
+        """Build the skill-major copy of the matrix once all titles are added"""
+        columns = defaultdict(list)
+        for title_id in range(len(self.titles)):
+            for i in range(self.row_ptr[title_id], self.row_ptr[title_id + 1]):
+                columns[self.row_skills[i]].append((title_id, self.row_weights[i]))
+        for skill_id in range(len(self.skills)):
+            self.col_ptr.append(len(self.col_titles))
+            for title_id, weight in columns.get(skill_id, ()):
+                self.col_titles.append(title_id)
+                self.col_weights.append(weight)
+        self.col_ptr.append(len(self.col_titles))
+
+    def add_aliases(self, aliases):
+        """Let find_skills() match every known spelling of the profile skills"""
+        for alias, canonical in aliases.items():
+            skill_id = self.skill_ids.get(skill_key(canonical))
+            if skill_id is not None:
+                self.skill_ids.setdefault(skill_key(alias), skill_id)
+
+    def resolve(self, title):
+        """Title id for a job title, or None if it is not in the catalogue"""
+        return self.title_ids.get(normalize_title(title))
+
+    def profile(self, title_id):
+        start, end = self.row_ptr[title_id], self.row_ptr[title_id + 1]
+        return {
+            'id': title_id,
+            'title': self.titles[title_id],
+            'postings': self.postings[title_id],
+            'skills': [(self.row_skills[i], self.skills[self.row_skills[i]], round(self.row_weights[i], 3))
+                       for i in range(start, end)],
+            'total_weight': self.row_totals[title_id],
+        }
+
+    def row(self, title_id):
+        return self.row_skills[self.row_ptr[title_id]:self.row_ptr[title_id + 1]]
+
+    def similar(self, title_id, limit=SIMILAR_ROLES):
+        """Titles whose profile skills overlap most with this title's"""
+        return [{
+            'id': other,
+            'title': self.titles[other],
+            'postings': self.postings[other],
+            'similarity': round(similarity, 3),
+        } for other, similarity in self.similar_roles.similar(title_id, limit)]
+
+    def find_skills(self, text):
+        """Ids of catalogue skills mentioned in text, via token n-gram lookups"""
+        tokens = skill_tokens(text)
+        found = set()
+        for start in range(len(tokens)):
+            for length in range(1, MAX_SKILL_TOKENS + 1):
+                if start + length > len(tokens):
+                    break
+                skill_id = self.skill_ids.get(' '.join(tokens[start:start + length]))
+                if skill_id is not None:
+                    found.add(skill_id)
+        return found
+
+    def score_titles(self, skill_ids, title_ids=None, top_n=10):
+        """
+        Score one CV's skills against many titles: a sparse matrix-vector
+        product, computed by looping over the skill-major column of each of
+        the CV's skills, so the cost is the number of (skill, title) pairs
+        for those skills. Returns the best titles by weighted coverage of
+        their profile.
+        """
+        matched = defaultdict(float)
+        for skill_id in skill_ids:
+            start, end = self.col_ptr[skill_id], self.col_ptr[skill_id + 1]
+            for title_id, weight in zip(self.col_titles[start:end], self.col_weights[start:end]):
+                matched[title_id] += weight
+
+        if title_ids is None:
+            candidates = [title_id for title_id in matched if self.postings[title_id] >= MIN_RANKED_POSTINGS]
+        else:
+            candidates = [title_id for title_id in title_ids if title_id is not None]
+
+        scored = []
+        for title_id in candidates:
+            total = self.row_totals[title_id]
+            coverage = matched.get(title_id, 0.0) / total if total else 0.0
+            scored.append((coverage, self.postings[title_id], title_id))
+        scored.sort(key=lambda item: (-item[0], -item[1]))
+
+        return [{
+            'id': title_id,
+            'title': self.titles[title_id],
+            'postings': postings,
+            'coverage': round(coverage * 100, 1),
+        } for coverage, postings, title_id in scored[:top_n]]
+
+
+def build_title_profiles(jobs_path=JOBS_PATH):
+    with open(jobs_path) as f:
+        jobs = json.load(f)
+
+    labels = {}
+    postings = Counter()
+    skill_counts = defaultdict(Counter)
+    for job in jobs:
+        title = ' '.join(str(job.get('title', '')).split())
+        if not title:
+            continue
+        key = normalize_title(title)
+        labels.setdefault(key, title)
+        postings[key] += 1
+        skill_counts[key].update({canonical_skill(skill) for skill in split_job_skills(job.get('skills'))})
+
+    profiles = TitleProfiles()
+    for key in sorted(labels):
+        profiles.add(labels[key], postings[key], skill_counts[key])
+    profiles.finish()
+    profiles.similar_roles = build_similar_roles(
+        [profiles.row(title_id) for title_id in range(len(profiles.titles))],
+        len(profiles.skills), profiles.postings)
+    profiles.add_aliases(SKILL_ALIASES)
+    return profiles
+
+
+def get_title_profiles():
+    from catalogue import get_catalogue
+    return get_catalogue()['title_profiles']
+
+
+@lru_cache(maxsize=1024)
+def role_profile(title):
+    """
+    The skill profile for a target job title, or None if it cannot be
+    resolved. Titles not in the catalogue resolve to the closest fuzzy match.
+    """
+    if not title or not title.strip():
+        return None
+    from catalogue import get_catalogue
+    catalogue = get_catalogue()
+    title_id = catalogue['title_index'].resolve(title)
+    return None if title_id is None else catalogue['title_profiles'].profile(title_id)
@@ -0,0 +1,198 @@
+"""
+Logging for Career Path Finder
+
+Structured logging for the request handlers. Records are JSON lines carrying
+the id of the request that logged them, and any extra= fields. Handlers only
+put records on an in-memory queue; a listener thread formats and writes
+them, so log I/O never blocks a request. When the queue is full, records are
+dropped and counted rather than waiting.
+
+A forked child never touches its parent's queue: the parent's listener may
+have held the queue's lock at the moment of the fork, and records still on it
+would be written twice. The child gets a fresh queue, and its listener thread
+starts with its first record. Worker pool processes serve no requests, so
+they skip the queue and log straight to stdout (setup_pool_process_logging).
+
+Log with %-style arguments so messages are only formatted when the level is
+enabled, and use log_payload() for large debug payloads (CV data, job lists),
+which only logs a sample of them:
+
+    logger.info("CV uploaded", extra={'skills': len(skills)})
+    log_payload(logger, "CV data: %s", cv_data)
+
+Settings:
+    LOG_LEVEL             minimum level logged (default INFO)
+    LOG_FORMAT            json or text (default json)
+    LOG_PAYLOAD_SAMPLE    share of log_payload() calls logged at DEBUG (default 0.01)
+    LOG_QUEUE_SIZE        records buffered before new ones are dropped (default 10000)
+"""
+
+import atexit
+import contextvars
+import copy
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import uuid
+from datetime import datetime, timezone
+
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json').lower()
+LOG_PAYLOAD_SAMPLE = float(os.getenv('LOG_PAYLOAD_SAMPLE', '0.01'))
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+
+request_id_var = contextvars.ContextVar('request_id', default=None)
+
+# Attributes every LogRecord has; anything else came from extra=
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'request_id'}
+
+
+def new_request_id(incoming=None):
+    """Use the caller's request id if it sent a sane one, else make one"""
+    if incoming and len(incoming) <= 64 and incoming.replace('-', '').isalnum():
+        request_id = incoming
+    else:
+        request_id = uuid.uuid4().hex
+    request_id_var.set(request_id)
+    return request_id
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the current request id while still on the request thread"""
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if getattr(record, 'request_id', None):
+            entry['request_id'] = record.request_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s')
+
+    def format(self, record):
+        record.request_id = getattr(record, 'request_id', None) or '-'
+        return super().format(record)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records when the listener falls behind"""
+
+    dropped = 0
+
+    def __init__(self, log_queue, start_listener=None):
+        super().__init__(log_queue)
+        # Called with the first record, in a forked child
+        self._start_listener = start_listener
+
+    def prepare(self, record):
+        # Merge the arguments and render the traceback here, as neither can cross
+        # the queue, but leave the rest of the formatting to the listener thread
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        # Runs under the handler's lock, so the listener starts once
+        if self._start_listener is not None:
+            start, self._start_listener = self._start_listener, None
+            start()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            DroppingQueueHandler.dropped += 1
+
+
+_listener = None
+_setup_lock = threading.Lock()
+
+
+def _output_handler():
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter() if LOG_FORMAT == 'json' else TextFormatter())
+    return output
+
+
+def _start_listener(log_queue, handler):
+    global _listener
+    _listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+
+
+def _stop_listener():
+    # None in a forked child until its first record
+    if _listener is not None:
+        _listener.stop()
+
+
+def _install_queue(output, lazy=False):
+    log_queue = queue.Queue(LOG_QUEUE_SIZE)
+    start = functools.partial(_start_listener, log_queue, output)
+    queue_handler = DroppingQueueHandler(log_queue, start if lazy else None)
+    queue_handler.addFilter(RequestIdFilter())
+    logging.getLogger().handlers = [queue_handler]
+    if not lazy:
+        start()
+
+
+def _after_fork_in_child(output):
+    # The thread holding _setup_lock or reading the old queue did not survive the fork
+    global _listener, _setup_lock
+    _setup_lock = threading.Lock()
+    _listener = None
+    _install_queue(output, lazy=True)
+
+
+def setup_logging():
+    """Route the root logger through the queue; safe to call more than once"""
+    with _setup_lock:
+        if _listener is not None:
+            return
+        output = _output_handler()
+        logging.getLogger().setLevel(LOG_LEVEL)
+        _install_queue(output)
+        atexit.register(_stop_listener)
+        os.register_at_fork(after_in_child=lambda: _after_fork_in_child(output))
+
+
+def setup_pool_process_logging():
+    """Log straight to stdout, with no queue or thread; the initializer of worker pool processes"""
+    global _listener
+    with _setup_lock:
+        _listener = None
+        root = logging.getLogger()
+        root.handlers = [_output_handler()]
+        root.setLevel(LOG_LEVEL)
+
+
+def log_payload(logger, msg, *args):
+    """Log a large debug payload for a sample of calls only"""
+    if logger.isEnabledFor(logging.DEBUG) and random.random() < LOG_PAYLOAD_SAMPLE:
+        logger.debug(msg, *args, extra={'sampled': True})
@@ -0,0 +1,291 @@
+"""
+Market Data Ingest for Career Path Finder
+
+The scrapers store salaries, dates, durations and skills as the raw text shown
+on Internshala (e.g. "₹ 2,00,000 - 2,80,000 /year", "Starts immediately",
+"16 May' 25"). This module parses those columns once into typed values and
+writes them to Parquet files next to the CSVs, so consumers can read just the
+columns they need without re-parsing text.
+
+Each Parquet file records PARQUET_VERSION and its dataset name in its schema
+metadata. A file that is older than its CSV, or that lacks that metadata or
+records a different value (for example a file written by another tool), is
+rebuilt from the CSV the next time it is read.
+
+Usage:
+    python market_data.py          # (re)build the Parquet files
+"""
+
+import csv
+import importlib.util
+import logging
+import os
+import re
+from datetime import datetime
+
+from warmup import lazy_import
+
+# pyarrow is imported only when Parquet is read or written, which the app
+# does only while rebuilding the catalogue
+PYARROW_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Bump when the typed columns or their parsing change so old Parquet files are rebuilt
+PARQUET_VERSION = 1
+
+# Dataset name -> (CSV path, column mapping of typed name -> CSV header)
+DATASETS = {
+    'jobs': (os.path.join(BASE_DIR, 'job_details.csv'), {
+        'title': 'Job Title',
+        'company': 'Company Name',
+        'location': 'Location',
+        'start_date': 'Start Date',
+        'salary': 'CTC (Annual)',
+        'experience': 'Experience',
+        'apply_by': 'Apply By',
+        'skills': 'Skills Required',
+        'perks': 'Perks',
+    }),
+    'internships': (os.path.join(BASE_DIR, 'Scraping', 'internship_details.csv'), {
+        'title': 'Internship Title',
+        'company': 'Company Name',
+        'location': 'Location',
+        'start_date': 'Start Date',
+        'duration': 'Duration',
+        'salary': 'Stipend',
+        'apply_by': 'Apply By',
+        'skills': 'Skills Required',
+        'perks': 'Perks',
+    }),
+}
+
+MISSING_VALUES = {'', 'n/a', 'not provided'}
+
+_AMOUNT_RANGE = re.compile(r'([₹$])\s*([\d,]+)(?:\s*-\s*([\d,]+))?')
+_DURATION = re.compile(r'(\d+(?:\.\d+)?)\s*(day|week|month|year)s?', re.IGNORECASE)
+_EXPERIENCE = re.compile(r'(\d+)\s*year')
+_SHORT_DATE = re.compile(r"(\d{1,2}) (\w{3})' (\d{2})")
+
+CURRENCIES = {'₹': 'INR', '$': 'USD'}
+MONTHS_PER_UNIT = {'day': 1 / 30.4, 'week': 12 / 52, 'month': 1, 'year': 12}
+
+
+def _is_missing(text):
+    return text is None or text.strip().lower() in MISSING_VALUES
+
+
+def parse_salary_range(text):
+    """
+    Parse a CTC or stipend string into (min, max, currency, period).
+    The scraped CTC text repeats the amount twice; only the first is used.
+    Non-numeric values ("Competitive salary", "Unpaid") give None amounts,
+    except "Unpaid" which is a 0 - 0 range.
+    """
+    if _is_missing(text):
+        return None, None, None, None
+    text = text.strip()
+    if text.lower() == 'unpaid':
+        return 0.0, 0.0, 'INR', 'month'
+
+    match = _AMOUNT_RANGE.search(text)
+    if not match:
+        return None, None, None, None
+    low = float(match.group(2).replace(',', ''))
+    high = float(match.group(3).replace(',', '')) if match.group(3) else low
+
+    lowered = text.lower()
+    if 'lump sum' in lowered:
+        period = 'lump_sum'
+    elif '/month' in lowered:
+        period = 'month'
+    elif '/week' in lowered:
+        period = 'week'
+    else:
+        period = 'year'
+    return low, high, CURRENCIES[match.group(1)], period
+
+
+def parse_duration_months(text):
+    """Parse "3 Months", "2 Weeks", "1 Day" into a number of months"""
+    if _is_missing(text):
+        return None
+    match = _DURATION.search(text)
+    if not match:
+        return None
+    return round(float(match.group(1)) * MONTHS_PER_UNIT[match.group(2).lower()], 2)
+
+
+def parse_short_date(text):
+    """Parse Internshala's "16 May' 25" format into a date"""
+    if _is_missing(text):
+        return None
+    match = _SHORT_DATE.search(text)
+    if not match:
+        return None
+    try:
+        return datetime.strptime(' '.join(match.groups()), '%d %b %y').date()
+    except ValueError:
+        return None
+
+
+def parse_start_date(text):
+    """Return (starts_immediately, start_date) for a "Start Date" value"""
+    if _is_missing(text):
+        return None, None
+    if 'immediately' in text.lower():
+        return True, None
+    # Ranges such as "26 May - 2 Jun' 25" only carry the year on the end date
+    start, _, end = text.partition(' - ')
+    if end:
+        year = end.rsplit("'", 1)[-1].strip()
+        start = f"{start.strip()}' {year}"
+    return False, parse_short_date(start)
+
+
+def parse_experience_years(text):
+    if _is_missing(text):
+        return None
+    match = _EXPERIENCE.search(text)
+    return int(match.group(1)) if match else None
+
+
+def parse_list(text):
+    """Split a comma separated skills/perks column into a list of lowercase items"""
+    if _is_missing(text):
+        return []
+    return [item.strip().lower() for item in text.split(',') if item.strip()]
+
+
+def parse_locations(text):
+    if _is_missing(text):
+        return []
+    return [item.strip() for item in text.split(',') if item.strip()]
+
+
+def parse_row(row, columns):
+    """Convert one raw CSV row into a dict of typed values"""
+    salary_min, salary_max, currency, period = parse_salary_range(row.get(columns['salary']))
+    starts_immediately, start_date = parse_start_date(row.get(columns['start_date']))
+    locations = parse_locations(row.get(columns['location']))
+
+    record = {
+        'title': (row.get(columns['title']) or '').strip(),
+        'company': (row.get(columns['company']) or '').strip(),
+        'locations': locations,
+        'work_from_home': any(loc.lower() == 'work from home' for loc in locations),
+        'salary_min': salary_min,
+        'salary_max': salary_max,
+        'salary_currency': currency,
+        'salary_period': period,
+        'starts_immediately': starts_immediately,
+        'start_date': start_date,
+        'apply_by': parse_short_date(row.get(columns['apply_by'])),
+        'skills': parse_list(row.get(columns['skills'])),
+        'perks': parse_list(row.get(columns['perks'])),
+    }
+    if 'duration' in columns:
+        record['duration_months'] = parse_duration_months(row.get(columns['duration']))
+    if 'experience' in columns:
+        record['experience_years'] = parse_experience_years(row.get(columns['experience']))
+    return record
+
+
+def _parquet_schema(dataset):
+    pa = lazy_import('pyarrow')
+
+    fields = [
+        ('title', pa.string()),
+        ('company', pa.string()),
+        ('locations', pa.list_(pa.string())),
+        ('work_from_home', pa.bool_()),
+        ('salary_min', pa.float64()),
+        ('salary_max', pa.float64()),
+        ('salary_currency', pa.dictionary(pa.int8(), pa.string())),
+        ('salary_period', pa.dictionary(pa.int8(), pa.string())),
+        ('starts_immediately', pa.bool_()),
+        ('start_date', pa.date32()),
+        ('apply_by', pa.date32()),
+        ('skills', pa.list_(pa.string())),
+        ('perks', pa.list_(pa.string())),
+    ]
+    if 'duration' in DATASETS[dataset][1]:
+        fields.append(('duration_months', pa.float64()))
+    if 'experience' in DATASETS[dataset][1]:
+        fields.append(('experience_years', pa.int16()))
+    return pa.schema(fields, metadata={'market_data_version': str(PARQUET_VERSION), 'dataset': dataset})
+
+
+def parquet_path(dataset):
+    csv_path = DATASETS[dataset][0]
+    return os.path.splitext(csv_path)[0] + '.parquet'
+
+
+def read_typed_rows(dataset):
+    """Parse a dataset's CSV into a list of typed records"""
+    csv_path, columns = DATASETS[dataset]
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        return [parse_row(row, columns) for row in csv.DictReader(f)]
+
+
+def build_parquet(dataset):
+    """Parse a dataset's CSV and write the typed Parquet file next to it"""
+    if not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow is required to write Parquet files")
+    pa = lazy_import('pyarrow')
+    pq = lazy_import('pyarrow.parquet')
+
+    records = read_typed_rows(dataset)
+    schema = _parquet_schema(dataset)
+    table = pa.Table.from_pylist(records, schema=schema)
+    path = parquet_path(dataset)
+    # Write to a temporary file first so other workers never read a partial file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    pq.write_table(table, tmp_path, compression='zstd')
+    os.replace(tmp_path, path)
+    return path, table.num_rows
+
+
+def _parquet_is_fresh(dataset):
+    path = parquet_path(dataset)
+    if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(DATASETS[dataset][0]):
+        return False
+    pq = lazy_import('pyarrow.parquet')
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+    except Exception:
+        return False
+    return (metadata.get(b'market_data_version') == str(PARQUET_VERSION).encode()
+            and metadata.get(b'dataset') == dataset.encode())
+
+
+def load_columns(dataset, columns):
+    """
+    Load only the requested typed columns of a dataset as {column: list}.
+    Reads the memory-mapped Parquet file, rebuilding it first when it is
+    stale, missing or from another version. Without pyarrow, or when the
+    file cannot be written, the CSV is parsed instead.
+    """
+    if dataset not in DATASETS:
+        raise ValueError(f"Unknown dataset: {dataset}")
+    if PYARROW_AVAILABLE:
+        pq = lazy_import('pyarrow.parquet')
+        try:
+            if not _parquet_is_fresh(dataset):
+                logger.info("Parquet file for %s missing or stale, rebuilding", dataset)
+                build_parquet(dataset)
+            table = pq.read_table(parquet_path(dataset), columns=list(columns), memory_map=True)
+            return table.to_pydict()
+        except OSError:
+            logger.warning("Could not write the %s Parquet file; parsing the CSV", dataset, exc_info=True)
+
+    records = read_typed_rows(dataset)
+    return {column: [record.get(column) for record in records] for column in columns}
+
+
+if __name__ == '__main__':
+    for name in DATASETS:
+        path, count = build_parquet(name)
+        print(f"Wrote {count} {name} rows to {path}")
@@ -0,0 +1,170 @@
+"""
+Market Statistics for Career Path Finder
+
+Precomputes demand (posting counts) and salary percentiles per skill, job
+title and location from the scraped job postings. The aggregates are built
+once as part of the job catalogue and stored in flat arrays, so a query is a
+few dictionary lookups and array reads.
+
+Each key also keeps the sorted ids of the postings it appears in. When a
+query names more than one of skill, title and location, those lists are
+intersected, and the percentiles of the matching postings' salaries are
+computed at query time.
+"""
+
+import math
+
+from array import array
+
+from market_data import load_columns
+
+PERCENTILES = (10, 25, 50, 75, 90)
+DIMENSIONS = ('skill', 'title', 'location')
+
+
+def normalize_key(value):
+    return ' '.join(value.lower().split())
+
+
+def percentile(sorted_values, pct):
+    """Linear-interpolated percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = (len(sorted_values) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+class MarketAggregates:
+    """
+    Posting counts and annual salary percentiles for every skill, title and
+    location seen in the job postings. For each dimension, keys map to a row
+    index into array-backed columns.
+    """
+
+    def __init__(self, total_postings, salaried_postings, salaries):
+        self.total_postings = total_postings
+        self.salaried_postings = salaried_postings
+        # Annual INR salary per posting id; NaN when the posting has none
+        self.salaries = salaries
+        self.keys = {dimension: {} for dimension in DIMENSIONS}
+        self.labels = {dimension: [] for dimension in DIMENSIONS}
+        self.counts = {dimension: array('I') for dimension in DIMENSIONS}
+        self.salary_counts = {dimension: array('I') for dimension in DIMENSIONS}
+        # len(PERCENTILES) values per row; NaN when a key has no salary data
+        self.percentiles = {dimension: array('d') for dimension in DIMENSIONS}
+        # Sorted posting ids per row
+        self.postings = {dimension: [] for dimension in DIMENSIONS}
+
+    def add(self, dimension, label, posting_ids, salaries):
+        self.keys[dimension][normalize_key(label)] = len(self.labels[dimension])
+        self.labels[dimension].append(label)
+        self.counts[dimension].append(len(posting_ids))
+        self.postings[dimension].append(array('I', posting_ids))
+        self.salary_counts[dimension].append(len(salaries))
+        salaries.sort()
+        for pct in PERCENTILES:
+            value = percentile(salaries, pct)
+            self.percentiles[dimension].append(float('nan') if value is None else value)
+
+    def _share(self, count):
+        return round(count / self.total_postings * 100, 2) if self.total_postings else 0
+
+    @staticmethod
+    def _salary(values):
+        return {'currency': 'INR', 'period': 'year', **{f'p{pct}': round(value) for pct, value in zip(PERCENTILES, values)}}
+
+    def lookup(self, dimension, value):
+        """Stats for one key of a dimension, or None if it never appears"""
+        index = self.keys[dimension].get(normalize_key(value))
+        if index is None:
+            return None
+
+        stats = {
+            'value': self.labels[dimension][index],
+            'postings': self.counts[dimension][index],
+            'share_of_postings': self._share(self.counts[dimension][index]),
+            'postings_with_salary': self.salary_counts[dimension][index],
+            'salary': None,
+        }
+        if self.salary_counts[dimension][index]:
+            offset = index * len(PERCENTILES)
+            stats['salary'] = self._salary(self.percentiles[dimension][offset:offset + len(PERCENTILES)])
+        return stats
+
+    def combined(self, filters):
+        """Stats for the postings matching every (dimension, value) filter"""
+        id_lists = []
+        for dimension, value in filters:
+            index = self.keys[dimension].get(normalize_key(value))
+            if index is None:
+                id_lists = []
+                break
+            id_lists.append(self.postings[dimension][index])
+
+        matching = set()
+        if id_lists:
+            # Start from the rarest key so the intersection stays small
+            id_lists.sort(key=len)
+            matching = set(id_lists[0])
+            for ids in id_lists[1:]:
+                matching.intersection_update(ids)
+        salaries = sorted(self.salaries[i] for i in matching if not math.isnan(self.salaries[i]))
+
+        return {
+            'postings': len(matching),
+            'share_of_postings': self._share(len(matching)),
+            'postings_with_salary': len(salaries),
+            'salary': self._salary(percentile(salaries, pct) for pct in PERCENTILES) if salaries else None,
+        }
+
+    def query(self, skill='', title='', location=''):
+        """
+        Stats for each filter that was given, keyed by dimension. With more
+        than one filter, 'combined' holds the stats of the postings that
+        match all of them.
+        """
+        result = {'total_postings': self.total_postings}
+        filters = [(dimension, value) for dimension, value in zip(DIMENSIONS, (skill, title, location)) if value]
+        for dimension, value in filters:
+            result[dimension] = self.lookup(dimension, value)
+        if len(filters) > 1:
+            result['combined'] = self.combined(filters)
+        return result
+
+
+def build_market_aggregates():
+    """Aggregate the job postings into MarketAggregates"""
+    columns = load_columns('jobs', ['title', 'locations', 'skills', 'salary_min', 'salary_max', 'salary_currency', 'salary_period'])
+
+    groups = {dimension: {} for dimension in DIMENSIONS}
+    total = len(columns['title'])
+    salaried = 0
+    posting_salaries = array('d')
+
+    for i in range(total):
+        # Only annual INR salaries are comparable across postings
+        salary = None
+        if columns['salary_min'][i] is not None and columns['salary_currency'][i] == 'INR' and columns['salary_period'][i] == 'year':
+            salary = (columns['salary_min'][i] + columns['salary_max'][i]) / 2
+            salaried += 1
+        posting_salaries.append(float('nan') if salary is None else salary)
+
+        keys = {
+            'skill': set(columns['skills'][i]),
+            'title': {columns['title'][i]} if columns['title'][i] and columns['title'][i] != 'N/A' else set(),
+            'location': set(columns['locations'][i]),
+        }
+        for dimension, labels in keys.items():
+            for label in labels:
+                group = groups[dimension].setdefault(normalize_key(label), [label, [], []])
+                group[1].append(i)
+                if salary is not None:
+                    group[2].append(salary)
+
+    aggregates = MarketAggregates(total, salaried, posting_salaries)
+    for dimension, dimension_groups in groups.items():
+        for label, posting_ids, salaries in dimension_groups.values():
+            aggregates.add(dimension, label, posting_ids, salaries)
+    return aggregates
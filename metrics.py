@@ -0,0 +1,247 @@
+"""
+Request Metrics for Career Path Finder
+
+Stage timings, input sizes and error counts kept as Prometheus-style
+histograms and counters, and rendered in the Prometheus text format for
+/metrics. Time a stage with stage(), as a context manager or decorator:
+
+    with stage('extract'):
+        cv_text = extract_text_from_file(file_path)
+
+    @stage('match')
+    def match_skills_to_jobs(...): ...
+
+Each worker process keeps its own values. Under gunicorn, gunicorn.conf.py
+sets METRICS_RUN_ID to the master's pid when the server starts, and every
+worker that has recorded something periodically writes a snapshot file to
+that run's directory inside METRICS_DIR. /metrics adds up the snapshots of
+the run, so the output covers the whole server whichever worker answers.
+Snapshots of exited workers are kept so counters never go backwards; the
+next server start removes the directories of runs whose master is gone.
+
+A process started any other way (python app.py, tests, benchmarks) writes
+no files and /metrics reports that process alone.
+
+Settings:
+    METRICS_DIR            directory for per-worker snapshots (default: a temp dir)
+    METRICS_FLUSH_SECONDS  how often a worker writes its snapshot (default 5)
+"""
+
+import atexit
+import glob
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from functools import wraps
+
+logger = logging.getLogger(__name__)
+
+METRICS_DIR = os.getenv('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'cv-analyser-metrics'))
+METRICS_FLUSH_SECONDS = float(os.getenv('METRICS_FLUSH_SECONDS', '5'))
+# Set by gunicorn.conf.py; unset outside a gunicorn server
+METRICS_RUN_ID = os.getenv('METRICS_RUN_ID')
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+COUNT_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+PAGE_BUCKETS = (1, 2, 3, 4, 5, 10, 20)
+CHAR_BUCKETS = (500, 1000, 2500, 5000, 10000, 25000, 50000, 100000)
+
+# name -> (type, help, buckets); histogram values are recorded with observe()
+METRICS = {
+    'cv_stage_duration_seconds': ('histogram', 'Time spent in each request stage', DURATION_BUCKETS),
+    'cv_stage_errors_total': ('counter', 'Stages that raised an exception', None),
+    'cv_upload_pages': ('histogram', 'Pages per uploaded CV', PAGE_BUCKETS),
+    'cv_upload_chars': ('histogram', 'Characters of text extracted per uploaded CV', CHAR_BUCKETS),
+    'cv_skills_found': ('histogram', 'Skills extracted per uploaded CV', COUNT_BUCKETS),
+    'cv_jobs_matched': ('histogram', 'Job recommendations per uploaded CV', COUNT_BUCKETS),
+    'cv_uploads_total': ('counter', 'CV uploads by outcome', None),
+}
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items())) if labels else ()
+
+
+def run_dir(run_id):
+    """Directory holding the worker snapshots of one server run"""
+    return os.path.join(METRICS_DIR, f'run-{run_id}')
+
+
+class Registry:
+    """The metric values of this process"""
+
+    def __init__(self):
+        self._reset()
+        # A forked worker starts from zero; the parent's values are its own
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._counters = {}
+        # (name, labels) -> [bucket counts..., count, sum]
+        self._histograms = {}
+        # Values recorded since the last snapshot was written
+        self._dirty = False
+        self._last_flush = 0.0
+        self._path = None
+
+    def inc(self, name, labels=None, amount=1):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+            self._dirty = True
+        self._maybe_flush()
+
+    def observe(self, name, value, labels=None):
+        buckets = METRICS[name][2]
+        key = (name, _label_key(labels))
+        with self._lock:
+            values = self._histograms.get(key)
+            if values is None:
+                values = self._histograms[key] = [0] * (len(buckets) + 2)
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    values[i] += 1
+            values[-2] += 1
+            values[-1] += value
+            self._dirty = True
+        self._maybe_flush()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'counters': [[name, list(labels), value] for (name, labels), value in self._counters.items()],
+                'histograms': [[name, list(labels), list(values)] for (name, labels), values in self._histograms.items()],
+            }
+
+    def _maybe_flush(self):
+        if time.monotonic() - self._last_flush >= METRICS_FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self):
+        """Write this process's snapshot for the other workers' /metrics, if it has new values"""
+        if METRICS_RUN_ID is None:
+            return
+        with self._flush_lock:
+            self._last_flush = time.monotonic()
+            with self._lock:
+                if not self._dirty:
+                    return
+                self._dirty = False
+            if self._path is None:
+                # The start time keeps a later process that reuses this pid from overwriting the file
+                self._path = os.path.join(run_dir(METRICS_RUN_ID), f'metrics-{os.getpid()}-{time.time_ns()}.json')
+            try:
+                os.makedirs(os.path.dirname(self._path), exist_ok=True)
+                tmp_path = f'{self._path}.tmp'
+                with open(tmp_path, 'w') as f:
+                    json.dump(self.snapshot(), f)
+                os.replace(tmp_path, self._path)
+            except OSError as e:
+                with self._lock:
+                    self._dirty = True
+                logger.warning("Could not write metrics snapshot: %s", e)
+
+
+registry = Registry()
+atexit.register(registry.flush)
+
+
+def inc(name, labels=None, amount=1):
+    registry.inc(name, labels, amount)
+
+
+def observe(name, value, labels=None):
+    registry.observe(name, value, labels)
+
+
+class stage:
+    """Time a block or function as one stage; exceptions are counted and re-raised"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        registry.observe('cv_stage_duration_seconds', time.perf_counter() - self._start, {'stage': self.name})
+        if exc_type is not None:
+            registry.inc('cv_stage_errors_total', {'stage': self.name})
+        return False
+
+    def __call__(self, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(self.name):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+def _collect():
+    """Counters and histograms summed over every worker's snapshot"""
+    if METRICS_RUN_ID is None:
+        snapshots = [registry.snapshot()]
+    else:
+        registry.flush()
+        snapshots = []
+        for path in glob.glob(os.path.join(run_dir(METRICS_RUN_ID), 'metrics-*.json')):
+            try:
+                with open(path) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+    counters = {}
+    histograms = {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot.get('counters', []):
+            key = (name, tuple(tuple(label) for label in labels))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, values in snapshot.get('histograms', []):
+            key = (name, tuple(tuple(label) for label in labels))
+            total = histograms.get(key)
+            histograms[key] = values if total is None else [a + b for a, b in zip(total, values)]
+    return counters, histograms
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, extra=None):
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus():
+    """All metrics in the Prometheus text exposition format"""
+    counters, histograms = _collect()
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        if kind == 'counter':
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+            continue
+        for (metric, labels), values in sorted(histograms.items()):
+            if metric != name:
+                continue
+            for bound, count in zip(buckets, values):
+                lines.append(f'{name}_bucket{_format_labels(labels, ("le", _format_value(float(bound))))} {count}')
+            lines.append(f'{name}_bucket{_format_labels(labels, ("le", "+Inf"))} {values[-2]}')
+            lines.append(f'{name}_count{_format_labels(labels)} {values[-2]}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(float(values[-1]))}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,287 @@
+"""
+PDF Rendering Engine for the CV Builder
+
+Builds the ReportLab style sheets for every CV theme (and registers any
+bundled TrueType fonts) once per process, then renders cv_data to PDF with
+those cached styles. Rendering a CV only creates its flowables and lays out
+the document.
+"""
+
+import importlib.util
+import io
+import logging
+import os
+import threading
+from collections import namedtuple
+from xml.sax.saxutils import escape
+
+from cv_templates import THEME_ALIASES, DEFAULT_CV_THEME
+from warmup import lazy_import
+
+# ReportLab is imported when the engine is first built, not with this module
+REPORTLAB_AVAILABLE = importlib.util.find_spec('reportlab') is not None
+
+logger = logging.getLogger(__name__)
+
+# TrueType fonts dropped in here are registered under their file name,
+# e.g. fonts/DejaVuSans.ttf -> "DejaVuSans"
+FONTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fonts')
+
+# Theme definitions; fonts fall back to the built-in Helvetica family when a
+# named TrueType font is not registered
+PDF_THEMES = {
+    'classic': {
+        'font': 'Helvetica', 'bold_font': 'Helvetica-Bold', 'italic_font': 'Helvetica-Oblique',
+        'primary': '#2c3e50', 'accent': '#3498db', 'muted': '#666666',
+        'name_size': 24, 'section_size': 14, 'item_size': 12, 'body_size': 10,
+        'header_alignment': 'center', 'section_border': 1,
+    },
+    'modern': {
+        'font': 'Helvetica', 'bold_font': 'Helvetica-Bold', 'italic_font': 'Helvetica-Oblique',
+        'primary': '#4c51bf', 'accent': '#c3dafe', 'muted': '#52606d',
+        'name_size': 26, 'section_size': 13, 'item_size': 12, 'body_size': 10,
+        'header_alignment': 'left', 'section_border': 0,
+    },
+    'minimal': {
+        'font': 'Times-Roman', 'bold_font': 'Times-Bold', 'italic_font': 'Times-Italic',
+        'primary': '#111111', 'accent': '#999999', 'muted': '#444444',
+        'name_size': 18, 'section_size': 11, 'item_size': 10.5, 'body_size': 9.5,
+        'header_alignment': 'center', 'section_border': 0,
+    },
+}
+
+ThemeStyles = namedtuple('ThemeStyles', ['title', 'contact', 'section', 'item_title', 'item_company', 'body'])
+
+
+def register_fonts(fonts_dir=FONTS_DIR):
+    """Register every .ttf in fonts_dir with ReportLab; returns the registered names"""
+    registered = []
+    if not os.path.isdir(fonts_dir):
+        return registered
+    pdfmetrics = lazy_import('reportlab.pdfbase.pdfmetrics')
+    TTFont = lazy_import('reportlab.pdfbase.ttfonts').TTFont
+    for filename in sorted(os.listdir(fonts_dir)):
+        name, ext = os.path.splitext(filename)
+        if ext.lower() != '.ttf':
+            continue
+        try:
+            pdfmetrics.registerFont(TTFont(name, os.path.join(fonts_dir, filename)))
+            registered.append(name)
+        except Exception:
+            logger.warning("Could not register font %s", filename, exc_info=True)
+    return registered
+
+
+def _text(value):
+    """Escape user text for ReportLab's paragraph markup"""
+    return escape(str(value))
+
+
+class PDFEngine:
+    def __init__(self, themes=PDF_THEMES):
+        if not REPORTLAB_AVAILABLE:
+            raise ImportError("ReportLab library not available")
+        # Flowables and the page layout are used on every render
+        self._platypus = lazy_import('reportlab.platypus')
+        self._page_size = lazy_import('reportlab.lib.pagesizes').A4
+        self.fonts = set(register_fonts())
+        self.fonts.update(lazy_import('reportlab.pdfbase.pdfmetrics').standardFonts)
+        base = lazy_import('reportlab.lib.styles').getSampleStyleSheet()
+        self.body_fallback = base['Normal']
+        self.themes = {name: self._build_theme(name, spec, base) for name, spec in themes.items()}
+
+    def _font(self, name, fallback):
+        return name if name in self.fonts else fallback
+
+    def _build_theme(self, name, spec, base):
+        colors = lazy_import('reportlab.lib.colors')
+        enums = lazy_import('reportlab.lib.enums')
+        ParagraphStyle = lazy_import('reportlab.lib.styles').ParagraphStyle
+        font = self._font(spec['font'], 'Helvetica')
+        bold = self._font(spec['bold_font'], 'Helvetica-Bold')
+        italic = self._font(spec['italic_font'], 'Helvetica-Oblique')
+        primary = colors.HexColor(spec['primary'])
+        accent = colors.HexColor(spec['accent'])
+        muted = colors.HexColor(spec['muted'])
+        header_alignment = enums.TA_CENTER if spec['header_alignment'] == 'center' else enums.TA_LEFT
+
+        section_kwargs = {}
+        if spec['section_border']:
+            section_kwargs = {'borderWidth': spec['section_border'], 'borderColor': accent, 'borderPadding': 4}
+
+        return ThemeStyles(
+            title=ParagraphStyle(f'{name}-Title', parent=base['Heading1'], fontName=bold,
+                                 fontSize=spec['name_size'], leading=spec['name_size'] * 1.2,
+                                 spaceAfter=12, alignment=header_alignment, textColor=primary),
+            contact=ParagraphStyle(f'{name}-Contact', parent=base['Normal'], fontName=font,
+                                   fontSize=spec['body_size'], alignment=header_alignment,
+                                   spaceAfter=20, textColor=muted),
+            section=ParagraphStyle(f'{name}-Section', parent=base['Heading2'], fontName=bold,
+                                   fontSize=spec['section_size'], spaceAfter=12, spaceBefore=16,
+                                   textColor=primary, **section_kwargs),
+            item_title=ParagraphStyle(f'{name}-ItemTitle', parent=base['Normal'], fontName=bold,
+                                      fontSize=spec['item_size'], leading=spec['item_size'] * 1.2,
+                                      spaceBefore=8, spaceAfter=4, textColor=primary),
+            item_company=ParagraphStyle(f'{name}-ItemCompany', parent=base['Normal'], fontName=italic,
+                                        fontSize=spec['body_size'], spaceAfter=4, textColor=muted),
+            body=ParagraphStyle(f'{name}-Body', parent=base['Normal'], fontName=font,
+                                fontSize=spec['body_size'], leading=spec['body_size'] * 1.2),
+        )
+
+    def resolve_theme(self, theme):
+        theme = THEME_ALIASES.get(theme, theme)
+        return theme if theme in self.themes else DEFAULT_CV_THEME
+
+    # -- flowable factories --------------------------------------------------
+
+    def _section(self, story, title, styles):
+        story.append(self._platypus.Paragraph(title, styles.section))
+
+    def _item(self, story, styles, title, subtitle='', lines=()):
+        Paragraph = self._platypus.Paragraph
+        story.append(Paragraph(_text(title), styles.item_title))
+        if subtitle:
+            story.append(Paragraph(_text(subtitle), styles.item_company))
+        for line in lines:
+            if line:
+                story.append(Paragraph(line, styles.body))
+        story.append(self._platypus.Spacer(1, 8))
+
+    def build_story(self, cv_data, styles):
+        """Create the flowables for a CV"""
+        # Helper function to safely get nested data
+        def safe_get(data, key, default=''):
+            if data and isinstance(data, dict):
+                return data.get(key, default)
+            return default
+
+        def dict_items(key):
+            items = cv_data.get(key, [])
+            if not items or not isinstance(items, list):
+                return []
+            return [item for item in items if isinstance(item, dict)]
+
+        Paragraph, Spacer = self._platypus.Paragraph, self._platypus.Spacer
+        story = []
+
+        # Personal information
+        personal = cv_data.get('personal', {})
+        story.append(Paragraph(_text(safe_get(personal, 'fullName', 'Your Name')), styles.title))
+        contact_parts = [safe_get(personal, key) for key in ('email', 'phone', 'location') if safe_get(personal, key)]
+        if contact_parts:
+            story.append(Paragraph(_text(' | '.join(contact_parts)), styles.contact))
+
+        # Professional Summary
+        summary = (cv_data.get('summary') or '').strip()
+        if summary:
+            self._section(story, 'Professional Summary', styles)
+            story.append(Paragraph(_text(summary), styles.body))
+            story.append(Spacer(1, 12))
+
+        # Experience Section
+        experience = dict_items('experience')
+        if experience:
+            self._section(story, 'Professional Experience', styles)
+            for exp in experience:
+                position_text = safe_get(exp, 'position', 'Position')
+                start_date = safe_get(exp, 'startDate', '')
+                end_date = safe_get(exp, 'endDate', 'Present')
+                if start_date or end_date:
+                    position_text += f" ({start_date} - {end_date})"
+                description = safe_get(exp, 'description', '')
+                self._item(story, styles, position_text, safe_get(exp, 'company', 'Company'),
+                           [_text(description) if description else ''])
+
+        # Education Section
+        education = dict_items('education')
+        if education:
+            self._section(story, 'Education', styles)
+            for edu in education:
+                degree_text = safe_get(edu, 'degree', 'Degree')
+                graduation_date = safe_get(edu, 'graduationDate', '')
+                if graduation_date:
+                    degree_text += f" ({graduation_date})"
+                gpa = safe_get(edu, 'gpa', '')
+                self._item(story, styles, degree_text, safe_get(edu, 'school', 'Institution'),
+                           [f"GPA: {_text(gpa)}" if gpa else ''])
+
+        # Skills Section
+        skills = cv_data.get('skills', [])
+        if skills and isinstance(skills, list):
+            skills_text = ' • '.join(_text(skill.strip()) for skill in skills if skill and isinstance(skill, str))
+            if skills_text:
+                self._section(story, 'Skills', styles)
+                story.append(Paragraph(skills_text, styles.body))
+                story.append(Spacer(1, 12))
+
+        # Projects Section
+        projects = dict_items('projects')
+        if projects:
+            self._section(story, 'Projects', styles)
+            for project in projects:
+                description = safe_get(project, 'description', '')
+                technologies = safe_get(project, 'technologies', '')
+                self._item(story, styles, safe_get(project, 'name', 'Project'), '', [
+                    _text(description) if description else '',
+                    f"<b>Technologies:</b> {_text(technologies)}" if technologies else '',
+                ])
+
+        # Certifications Section
+        certifications = dict_items('certifications')
+        if certifications:
+            self._section(story, 'Certifications', styles)
+            for cert in certifications:
+                cert_text = safe_get(cert, 'name', 'Certification')
+                date = safe_get(cert, 'date', '')
+                if date:
+                    cert_text += f" ({date})"
+                self._item(story, styles, cert_text, safe_get(cert, 'issuer', ''))
+
+        # Languages Section
+        languages = cv_data.get('languages', [])
+        if languages and isinstance(languages, list):
+            lang_texts = []
+            for lang in languages:
+                if isinstance(lang, dict):
+                    language = safe_get(lang, 'language', 'Language')
+                    proficiency = safe_get(lang, 'proficiency', '')
+                    lang_texts.append(f"{language} ({proficiency})" if proficiency else language)
+                elif isinstance(lang, str):
+                    lang_texts.append(lang)
+            if lang_texts:
+                self._section(story, 'Languages', styles)
+                story.append(Paragraph(_text(' • '.join(lang_texts)), styles.body))
+
+        return story
+
+    def render_to(self, cv_data, buffer, theme=DEFAULT_CV_THEME):
+        """Render the CV as PDF into a file-like buffer"""
+        if not cv_data or not isinstance(cv_data, dict):
+            raise ValueError("Invalid CV data provided")
+        styles = self.themes[self.resolve_theme(theme)]
+        doc = self._platypus.SimpleDocTemplate(buffer, pagesize=self._page_size, leftMargin=72, rightMargin=72, topMargin=72, bottomMargin=72)
+        doc.build(self.build_story(cv_data, styles))
+
+    def render(self, cv_data, theme=DEFAULT_CV_THEME):
+        """Render the CV and return the PDF bytes"""
+        buffer = io.BytesIO()
+        self.render_to(cv_data, buffer, theme)
+        return buffer.getvalue()
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_pdf_engine():
+    """The process-wide engine, built on first call"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = PDFEngine()
+    return _engine
+
+
+def render(cv_data, theme=DEFAULT_CV_THEME):
+    return get_pdf_engine().render(cv_data, theme)
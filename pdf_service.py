@@ -0,0 +1,87 @@
+"""
+PDF Service for /api/generate-cv
+
+Renders CV PDFs in the shared worker pool and caches the results. The cache
+key is a hash of the canonical JSON of cv_data plus the theme, so the
+builder's preview/download flow, which posts the same payload repeatedly,
+renders each CV once.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import pdf_engine
+from worker_pool import get_worker_pool, PoolSaturated
+
+PDF_CACHE_MAX_BYTES = int(os.getenv('PDF_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+PDF_RENDER_TIMEOUT = float(os.getenv('PDF_RENDER_TIMEOUT', '30'))
+
+# Request fields that do not change the rendered PDF
+_NON_CONTENT_FIELDS = {'output_format', 'template', 'theme'}
+
+
+def cv_cache_key(cv_data, theme):
+    content = {key: value for key, value in cv_data.items() if key not in _NON_CONTENT_FIELDS}
+    canonical = json.dumps(content, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    digest = hashlib.sha256(canonical.encode('utf-8'))
+    digest.update(b'\0' + theme.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class PDFCache:
+    """LRU cache of rendered PDFs, bounded by total size in bytes"""
+
+    def __init__(self, max_bytes=PDF_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            pdf_bytes = self._entries.get(key)
+            if pdf_bytes is not None:
+                self._entries.move_to_end(key)
+            return pdf_bytes
+
+    def set(self, key, pdf_bytes):
+        if len(pdf_bytes) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._entries[key] = pdf_bytes
+            self.size += len(pdf_bytes)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+
+pdf_cache = PDFCache()
+
+
+def render_cv_pdf(cv_data, theme=pdf_engine.DEFAULT_CV_THEME):
+    """
+    Return the PDF bytes for cv_data, from the cache or rendered in the
+    worker pool. Returns None when the pool is saturated so the caller can
+    fall back to HTML.
+    """
+    theme = pdf_engine.THEME_ALIASES.get(theme, theme)
+    if theme not in pdf_engine.PDF_THEMES:
+        theme = pdf_engine.DEFAULT_CV_THEME
+
+    key = cv_cache_key(cv_data, theme)
+    pdf_bytes = pdf_cache.get(key)
+    if pdf_bytes is not None:
+        return pdf_bytes
+
+    try:
+        pdf_bytes = get_worker_pool().run(pdf_engine.render, cv_data, theme, timeout=PDF_RENDER_TIMEOUT)
+    except PoolSaturated:
+        return None
+    pdf_cache.set(key, pdf_bytes)
+    return pdf_bytes
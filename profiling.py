@@ -0,0 +1,242 @@
+"""
+Profiling for Career Path Finder
+
+Opt-in tools for finding out why a worker is slow, all behind the admin
+token and absent unless PROFILING_ENABLED is set:
+
+    - Per-request cProfile: send "X-Profile: 1" with the admin token on any
+      request. The response carries an X-Profile-Id header; fetch the
+      report from /admin/profile/requests/<id> (?format=pstats for a file
+      snakeviz or pstats can open).
+    - Sampling profiler: /admin/profile/stacks?seconds=10 samples every
+      thread's stack and returns collapsed stacks ("a;b;c 42" lines) for
+      flamegraph.pl or speedscope. With PROFILE_SAMPLER_ALWAYS the sampler
+      runs for the whole life of the worker and the endpoint returns what
+      it has gathered so far, which also works with sync workers, whose one
+      thread is busy answering the profiling request itself.
+      The sampler reads OS thread stacks (sys._current_frames), so it needs
+      gthread or sync workers. Under gevent, the default worker class, every
+      request is a greenlet on one OS thread and the samples would only show
+      the sampler, so the endpoint answers 409 and the always-on sampler is
+      not started; run with GUNICORN_WORKER_CLASS=gthread to sample.
+    - Memory: /admin/profile/memory starts tracemalloc on its first call;
+      later calls return the top allocation sites and the change since the
+      previous call. DELETE stops tracing.
+
+Each worker profiles only itself, so with several workers repeat a request
+until the worker you want answers.
+
+Settings:
+    PROFILING_ENABLED           register the profiling hooks and endpoints (default off)
+    PROFILE_SAMPLE_INTERVAL     seconds between stack samples (default 0.005)
+    PROFILE_SAMPLER_ALWAYS      sample continuously from worker start (default off)
+    PROFILE_MAX_SECONDS         longest on-demand sampling run (default 60)
+    PROFILE_KEEP_REQUESTS       request profiles kept per worker (default 20)
+    PROFILE_TRACEMALLOC_FRAMES  stack depth recorded per allocation (default 10)
+"""
+
+import cProfile
+import io
+import logging
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, OrderedDict
+
+from flask import Response, g, jsonify, request
+
+from admin_auth import is_admin_request, require_admin
+from worker_pool import gevent_patched
+
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', '').lower() in ('1', 'true', 'yes')
+PROFILE_SAMPLE_INTERVAL = float(os.getenv('PROFILE_SAMPLE_INTERVAL', '0.005'))
+PROFILE_SAMPLER_ALWAYS = os.getenv('PROFILE_SAMPLER_ALWAYS', '').lower() in ('1', 'true', 'yes')
+PROFILE_MAX_SECONDS = float(os.getenv('PROFILE_MAX_SECONDS', '60'))
+PROFILE_KEEP_REQUESTS = int(os.getenv('PROFILE_KEEP_REQUESTS', '20'))
+PROFILE_TRACEMALLOC_FRAMES = int(os.getenv('PROFILE_TRACEMALLOC_FRAMES', '10'))
+
+SORT_KEYS = sorted(key.value for key in pstats.SortKey)
+
+logger = logging.getLogger(__name__)
+
+
+class StackSampler:
+    """Samples every thread's Python stack and counts the collapsed stacks"""
+
+    def __init__(self, interval=PROFILE_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                self.samples += 1
+                for thread_id, frame in frames.items():
+                    if thread_id != own_id:
+                        self.stacks[self._collapse(frame)] += 1
+
+    @staticmethod
+    def _collapse(frame):
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f'{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}')
+            frame = frame.f_back
+        return ';'.join(reversed(names))
+
+    def collapsed(self, reset=False):
+        """Flamegraph-compatible "frame;frame;frame count" lines, heaviest first"""
+        with self._lock:
+            lines = [f'{stack} {count}' for stack, count in self.stacks.most_common()]
+            if reset:
+                self.stacks.clear()
+                self.samples = 0
+        return '\n'.join(lines) + '\n'
+
+
+_request_profiles = OrderedDict()
+_request_profiles_lock = threading.Lock()
+_sampling_lock = threading.Lock()
+_always_sampler = None
+_last_snapshot = None
+
+
+def _start_request_profile():
+    if request.headers.get('X-Profile') == '1' and is_admin_request():
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+
+def _finish_request_profile(response):
+    profiler = g.pop('profiler', None)
+    if profiler is None:
+        return response
+    profiler.disable()
+    profile_id = f'{os.getpid()}-{time.time_ns()}'
+    with _request_profiles_lock:
+        _request_profiles[profile_id] = (request.method, request.path, profiler)
+        while len(_request_profiles) > PROFILE_KEEP_REQUESTS:
+            _request_profiles.popitem(last=False)
+    response.headers['X-Profile-Id'] = profile_id
+    return response
+
+
+@require_admin
+def request_profile(profile_id):
+    with _request_profiles_lock:
+        entry = _request_profiles.get(profile_id)
+    if entry is None:
+        return jsonify({'error': 'Unknown profile id; it may belong to another worker or have expired'}), 404
+    method, path, profiler = entry
+    if request.args.get('format') == 'pstats':
+        profiler.create_stats()
+        return Response(marshal.dumps(profiler.stats), mimetype='application/octet-stream',
+                        headers={'Content-Disposition': f'attachment; filename="{profile_id}.pstats"'})
+    sort = request.args.get('sort', 'cumulative')
+    if sort not in SORT_KEYS:
+        return jsonify({'error': f"sort must be one of {', '.join(SORT_KEYS)}"}), 400
+    output = io.StringIO()
+    stats = pstats.Stats(profiler, stream=output)
+    stats.sort_stats(sort).print_stats(request.args.get('limit', 40, type=int))
+    return Response(f'{method} {path}\n{output.getvalue()}', mimetype='text/plain')
+
+
+@require_admin
+def stacks():
+    if gevent_patched():
+        return jsonify({'error': 'Stack sampling needs gthread or sync workers; '
+                                 'gevent runs every request on one thread'}), 409
+    if _always_sampler is not None:
+        return Response(_always_sampler.collapsed(reset=request.args.get('reset') == '1'), mimetype='text/plain')
+    seconds = min(request.args.get('seconds', 10, type=float), PROFILE_MAX_SECONDS)
+    interval = request.args.get('interval', PROFILE_SAMPLE_INTERVAL, type=float)
+    if not _sampling_lock.acquire(blocking=False):
+        return jsonify({'error': 'A sampling run is already in progress in this worker'}), 409
+    try:
+        sampler = StackSampler(max(interval, 0.001))
+        sampler.start()
+        time.sleep(seconds)
+        sampler.stop()
+    finally:
+        _sampling_lock.release()
+    return Response(sampler.collapsed(), mimetype='text/plain')
+
+
+@require_admin
+def memory():
+    global _last_snapshot
+    if request.method == 'DELETE':
+        tracemalloc.stop()
+        _last_snapshot = None
+        return jsonify({'tracing': False})
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(PROFILE_TRACEMALLOC_FRAMES)
+        return jsonify({'tracing': True, 'message': 'tracemalloc started; call again for a snapshot'}), 202
+
+    limit = request.args.get('limit', 25, type=int)
+    key = request.args.get('key', 'lineno')
+    if key not in ('lineno', 'filename', 'traceback'):
+        return jsonify({'error': 'key must be lineno, filename or traceback'}), 400
+    snapshot = tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+    ])
+    current, peak = tracemalloc.get_traced_memory()
+    result = {
+        'tracing': True,
+        'current_kib': round(current / 1024, 1),
+        'peak_kib': round(peak / 1024, 1),
+        'top': [{'where': str(stat.traceback), 'size_kib': round(stat.size / 1024, 1), 'count': stat.count}
+                for stat in snapshot.statistics(key)[:limit]],
+    }
+    if _last_snapshot is not None:
+        result['changed_since_last'] = [
+            {'where': str(stat.traceback), 'size_diff_kib': round(stat.size_diff / 1024, 1), 'count_diff': stat.count_diff}
+            for stat in snapshot.compare_to(_last_snapshot, key)[:limit]
+        ]
+    _last_snapshot = snapshot
+    return jsonify(result)
+
+
+def register_profiling(app):
+    """Add the profiling hooks and /admin/profile endpoints when PROFILING_ENABLED is set"""
+    global _always_sampler
+    if not PROFILING_ENABLED:
+        return False
+    app.before_request(_start_request_profile)
+    app.after_request(_finish_request_profile)
+    app.add_url_rule('/admin/profile/requests/<profile_id>', 'profile_request', request_profile)
+    app.add_url_rule('/admin/profile/stacks', 'profile_stacks', stacks)
+    app.add_url_rule('/admin/profile/memory', 'profile_memory', memory, methods=['GET', 'DELETE'])
+    if PROFILE_SAMPLER_ALWAYS and gevent_patched():
+        logger.warning("PROFILE_SAMPLER_ALWAYS is ignored under gevent workers; use gthread or sync")
+    elif PROFILE_SAMPLER_ALWAYS and _always_sampler is None:
+        _always_sampler = StackSampler()
+        _always_sampler.start()
+        # A forked server worker does not inherit the sampler thread
+        os.register_at_fork(after_in_child=_always_sampler.start)
+    return True
@@ -0,0 +1,273 @@
+"""
+Roadmap Generator Client for Career Path Finder
+
+Wraps the Gemini API call behind /generate_roadmap with:
+- a pooled requests.Session with connect/read timeouts and retries,
+- a roadmap cache keyed by normalized job role + sorted skill set
+  (in-memory LRU, plus an optional SQLite tier shared by all workers),
+- request coalescing, so concurrent identical requests share one upstream call.
+
+Set GEMINI_API_URL to point the client at a local stub server (see
+stub_gemini_server.py) for testing.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from warmup import lazy_import
+
+logger = logging.getLogger(__name__)
+
+GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+GEMINI_API_URL = os.getenv('GEMINI_API_URL', 'https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent')
+
+# (connect, read) timeouts in seconds
+GEMINI_TIMEOUT = (float(os.getenv('GEMINI_CONNECT_TIMEOUT', '5')), float(os.getenv('GEMINI_READ_TIMEOUT', '60')))
+
+ROADMAP_CACHE_SIZE = int(os.getenv('ROADMAP_CACHE_SIZE', '256'))
+ROADMAP_CACHE_TTL = int(os.getenv('ROADMAP_CACHE_TTL', str(7 * 24 * 3600)))
+# Path of the SQLite cache tier; leave unset to only cache in memory
+ROADMAP_CACHE_DB = os.getenv('ROADMAP_CACHE_DB')
+
+ROADMAP_PROMPT = """
+You are an expert career coach and instructional designer.
+Your task is to generate a structured career roadmap for a student who wants to become a {job_role}.
+The roadmap must be actionable, beginner-friendly, and personalized to the user's current skills: {current_skills}.
+
+Instructions:
+1. Break the roadmap into sequential stages (Stage 1, Stage 2, etc.).
+2. For each stage, include:
+   - Stage Name
+   - Description (2-3 sentences)
+   - Skills to learn (list)
+   - Recommended projects (list)
+   - Certifications/courses (list)
+   - Estimated duration in months
+3. Suggest learning order so skills build progressively.
+4. Highlight any skill gaps based on {current_skills}.
+5. Output the result ONLY in the following JSON format:
+
+{{
+  "job_role": "...",
+  "total_duration_months": ...,
+  "stages": [
+    {{
+      "stage_number": 1,
+      "stage_name": "...",
+      "description": "...",
+      "skills": ["...", "..."],
+      "projects": ["...", "..."],
+      "certifications": ["...", "..."],
+      "duration_months": ...
+    }}
+  ],
+  "skill_gaps": ["...", "..."]
+}}
+"""
+
+
+def normalize_role(job_role):
+    return ' '.join(job_role.lower().split())
+
+
+def normalize_skills(current_skills):
+    """Lowercased, de-duplicated, sorted skill list"""
+    return sorted({' '.join(str(skill).lower().split()) for skill in current_skills if str(skill).strip()})
+
+
+def roadmap_cache_key(job_role, current_skills):
+    canonical = json.dumps([normalize_role(job_role), normalize_skills(current_skills)])
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class RoadmapCache:
+    """LRU cache of generated roadmaps with an optional SQLite tier behind it"""
+
+    def __init__(self, max_entries=ROADMAP_CACHE_SIZE, ttl=ROADMAP_CACHE_TTL, db_path=ROADMAP_CACHE_DB):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.db_path = db_path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        if db_path:
+            with self._connect() as conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS roadmaps (key TEXT PRIMARY KEY, roadmap TEXT NOT NULL, created REAL NOT NULL)")
+
+    def _connect(self):
+        # One connection per thread; sqlite3 connections are not shareable by default
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _remember(self, key, roadmap, created):
+        with self._lock:
+            self._entries[key] = (roadmap, created)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry[1] < self.ttl:
+                    self._entries.move_to_end(key)
+                    return entry[0]
+                del self._entries[key]
+
+        if self.db_path:
+            try:
+                row = self._connect().execute("SELECT roadmap, created FROM roadmaps WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error:
+                logger.exception("Roadmap cache read failed")
+                row = None
+            if row and now - row[1] < self.ttl:
+                roadmap = json.loads(row[0])
+                self._remember(key, roadmap, row[1])
+                return roadmap
+        return None
+
+    def set(self, key, roadmap):
+        created = time.time()
+        self._remember(key, roadmap, created)
+        if self.db_path:
+            try:
+                with self._connect() as conn:
+                    conn.execute("INSERT OR REPLACE INTO roadmaps (key, roadmap, created) VALUES (?, ?, ?)",
+                                 (key, json.dumps(roadmap), created))
+            except sqlite3.Error:
+                logger.exception("Roadmap cache write failed")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.db_path:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM roadmaps")
+
+
+class _InFlight:
+    """A pending upstream call that identical requests wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = (None, None)
+
+
+class RoadmapClient:
+    def __init__(self, api_url=GEMINI_API_URL, api_key=GEMINI_API_KEY, timeout=GEMINI_TIMEOUT, cache=None, pool_size=10):
+        self.api_url = api_url
+        self.api_key = api_key
+        self.timeout = timeout
+        # requests is imported with the first client, not at app start
+        requests = lazy_import('requests')
+        HTTPAdapter = lazy_import('requests.adapters').HTTPAdapter
+        Retry = lazy_import('urllib3.util.retry').Retry
+
+        self.cache = cache if cache is not None else RoadmapCache()
+        self.session = requests.Session()
+        # A read timeout is not retried: the model may still be generating and a retry would double the wait
+        retries = Retry(total=2, read=0, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504), allowed_methods=None)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._in_flight = {}
+        self._in_flight_lock = threading.Lock()
+
+    def _call_gemini(self, job_role, current_skills):
+        prompt = ROADMAP_PROMPT.format(job_role=job_role, current_skills=current_skills)
+        # The key goes in a header: a query parameter would put it in every URL that
+        # requests copies into its exception messages
+        headers = {
+            'Content-Type': 'application/json',
+            'x-goog-api-key': self.api_key or '',
+        }
+        data = {
+            "contents": [{"parts": [{"text": prompt}]}],
+            "generationConfig": {"temperature": 0.7, "maxOutputTokens": 2048}
+        }
+        requests = lazy_import('requests')
+        try:
+            response = self.session.post(self.api_url, headers=headers, json=data, timeout=self.timeout)
+        except requests.RequestException:
+            logger.exception("Gemini API request failed")
+            return None, "Roadmap service is unavailable, please try again later"
+
+        if response.status_code == 200:
+            try:
+                result = response.json()
+                # Extract the model's text output
+                text = result['candidates'][0]['content']['parts'][0]['text'].strip()
+                # The model sometimes wraps the JSON in a markdown code fence
+                if text.startswith('```'):
+                    text = text.strip('`').strip()
+                    if text.startswith('json'):
+                        text = text[4:]
+                roadmap_json = json.loads(text)
+                return roadmap_json, None
+            except Exception:
+                logger.exception("Could not parse the Gemini response")
+                return None, "Roadmap service returned an invalid response"
+        else:
+            logger.error("Gemini API error %s: %s", response.status_code, response.text[:500])
+            return None, "Roadmap service is unavailable, please try again later"
+
+    def generate(self, job_role, current_skills):
+        """Return (roadmap, error) for a role and skill list, using the cache when possible"""
+        key = roadmap_cache_key(job_role, current_skills)
+        roadmap = self.cache.get(key)
+        if roadmap is not None:
+            return roadmap, None
+
+        with self._in_flight_lock:
+            pending = self._in_flight.get(key)
+            leader = pending is None
+            if leader:
+                pending = self._in_flight[key] = _InFlight()
+
+        if not leader:
+            # Someone is already asking Gemini for this roadmap
+            pending.done.wait()
+            return pending.result
+
+        try:
+            # The canonical role/skill form is sent so the cached answer fits every request with this key
+            pending.result = self._call_gemini(job_role.strip(), normalize_skills(current_skills))
+            if pending.result[0] is not None:
+                self.cache.set(key, pending.result[0])
+        except Exception:
+            logger.exception("Roadmap generation failed")
+            pending.result = (None, "Roadmap generation failed")
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[key]
+            pending.done.set()
+        return pending.result
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_roadmap_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = RoadmapClient()
+    return _client
+
+
+def generate_roadmap_with_gemini(job_role, current_skills):
+    return get_roadmap_client().generate(job_role, current_skills)
@@ -0,0 +1,92 @@
+"""
+Similar Roles for Career Path Finder
+
+Nearest neighbours of every job title by the Jaccard similarity of their
+profile skills. Neighbours are found once when the title profiles are built:
+MinHash signatures are banded into locality-sensitive hash buckets, and only
+titles sharing a bucket are compared exactly, so the build grows with the
+number of likely-similar pairs rather than with every pair of titles. The
+top neighbours are stored as flat arrays, so a lookup is one slice.
+"""
+
+import random
+from array import array
+from collections import defaultdict
+
+# Neighbours kept per title
+SIMILAR_ROLES = 10
+# Pairs below this Jaccard similarity are not neighbours
+MIN_SIMILARITY = 0.1
+# MinHash signature length is LSH_BANDS * LSH_ROWS. Two rows per band puts
+# the LSH candidate threshold near (1 / 32) ** (1 / 2), about 0.18 Jaccard
+LSH_BANDS = 32
+LSH_ROWS = 2
+# Titles in one bucket beyond this are only compared with this many bucket
+# neighbours, so a bucket of near-identical profiles cannot go quadratic
+LSH_MAX_BUCKET = 200
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_SEED = 2024
+
+
+def minhash_signatures(skill_sets, num_skills, num_hashes=LSH_BANDS * LSH_ROWS):
+    """One MinHash signature per set of skill ids; empty sets get None"""
+    rng = random.Random(_SEED)
+    params = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(_MERSENNE_PRIME)) for _ in range(num_hashes)]
+    # Each skill's hash under every function, so a signature is an elementwise min
+    skill_hashes = [tuple((a * skill_id + b) % _MERSENNE_PRIME for a, b in params) for skill_id in range(num_skills)]
+    return [list(map(min, zip(*(skill_hashes[skill_id] for skill_id in skills)))) if skills else None
+            for skills in skill_sets]
+
+
+def candidate_pairs(signatures, bands=LSH_BANDS, rows=LSH_ROWS):
+    """Pairs of set indexes sharing at least one LSH bucket"""
+    pairs = set()
+    for band in range(bands):
+        buckets = defaultdict(list)
+        for index, signature in enumerate(signatures):
+            if signature is not None:
+                buckets[tuple(signature[band * rows:(band + 1) * rows])].append(index)
+        for members in buckets.values():
+            for i, a in enumerate(members):
+                for b in members[i + 1:i + 1 + LSH_MAX_BUCKET]:
+                    pairs.add((a, b))
+    return pairs
+
+
+class SimilarRoles:
+    """Top neighbours of title i are ids[ptr[i]:ptr[i + 1]], most similar first"""
+
+    def __init__(self, neighbours):
+        self.ptr = array('I', [0])
+        self.ids = array('I')
+        self.similarities = array('f')
+        for ranked in neighbours:
+            for title_id, similarity in ranked:
+                self.ids.append(title_id)
+                self.similarities.append(similarity)
+            self.ptr.append(len(self.ids))
+
+    def similar(self, title_id, limit=SIMILAR_ROLES):
+        start = self.ptr[title_id]
+        end = min(self.ptr[title_id + 1], start + limit)
+        return [(self.ids[i], self.similarities[i]) for i in range(start, end)]
+
+
+def build_similar_roles(skill_sets, num_skills, postings, k=SIMILAR_ROLES):
+    """Top-k Jaccard neighbours of each skill set, ties broken by postings"""
+    sets = [frozenset(skills) for skills in skill_sets]
+    signatures = minhash_signatures(sets, num_skills)
+
+    scored = defaultdict(list)
+    for a, b in candidate_pairs(signatures):
+        similarity = len(sets[a] & sets[b]) / len(sets[a] | sets[b])
+        if similarity >= MIN_SIMILARITY:
+            scored[a].append((similarity, b))
+            scored[b].append((similarity, a))
+
+    neighbours = []
+    for index in range(len(sets)):
+        ranked = sorted(scored.get(index, ()), key=lambda item: (-item[0], -postings[item[1]], item[1]))[:k]
+        neighbours.append([(other, round(similarity, 3)) for similarity, other in ranked])
+    return SimilarRoles(neighbours)
@@ -0,0 +1,201 @@
+"""
+Skill Graph for Career Path Finder
+
+Skill co-occurrence across the job postings and "next skill" recommendations.
+Postings are reduced to their distinct skill sets (with how many postings
+share each set) and stored as a sparse set x skill incidence matrix, both by
+set (CSR) and by skill (CSC), next to the sparse skill x skill co-occurrence
+matrix. Both are built once as part of the job catalogue.
+
+A posting counts as matched when a CV covers at least min_match percent of
+its skills, the same percentage job_match reports. A missing skill unlocks
+every posting that it alone would lift over that line, so ranking the missing
+skills only touches postings sharing a skill with the CV plus a per-skill
+table of the smallest postings.
+"""
+
+import json
+import math
+import os
+from array import array
+from collections import Counter, defaultdict
+
+from job_profiles import split_job_skills
+from skill_normalizer import canonical_skill
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+JOBS_PATH = os.path.join(BASE_DIR, 'jobs.json')
+
+# Default share of a posting's skills a CV needs for the posting to count as matched
+MATCH_THRESHOLD = 50
+NEXT_SKILLS_LIMIT = 10
+# CV skills listed as the reason a recommended skill fits the CV
+RELATED_LIMIT = 3
+
+
+class SkillGraph:
+    """
+    Distinct posting skill sets and skill co-occurrence counts. Set i's
+    skills are set_skills[set_ptr[i]:set_ptr[i + 1]]; skill j's sets are
+    col_sets[col_ptr[j]:col_ptr[j + 1]]; skill j's co-occurring skills are
+    co_skills[co_ptr[j]:co_ptr[j + 1]] with the postings asking for both.
+    """
+
+    def __init__(self):
+        self.skills = []
+        self.skill_ids = {}
+        self.skill_postings = array('I')
+        self.total_postings = 0
+        # Set-major incidence matrix; set_weights is the postings sharing the set
+        self.set_ptr = array('I', [0])
+        self.set_skills = array('I')
+        self.set_weights = array('I')
+        # Skill-major incidence matrix
+        self.col_ptr = array('I')
+        self.col_sets = array('I')
+        # Postings per (skill, set size), for sets too small to need a CV skill
+        self.max_set_size = 0
+        self.size_postings = array('I')
+        # Skill x skill co-occurrence
+        self.co_ptr = array('I')
+        self.co_skills = array('I')
+        self.co_counts = array('I')
+
+    def _skill_id(self, skill):
+        skill_id = self.skill_ids.get(skill)
+        if skill_id is None:
+            skill_id = self.skill_ids[skill] = len(self.skills)
+            self.skills.append(skill)
+        return skill_id
+
+    def build(self, skill_sets):
+        """Fill the matrices from a Counter of frozenset(skills) -> postings"""
+        skill_postings = Counter()
+        co_counts = defaultdict(Counter)
+        columns = defaultdict(list)
+        for set_id, (skills, postings) in enumerate(sorted(skill_sets.items(), key=lambda item: sorted(item[0]))):
+            ids = sorted(self._skill_id(skill) for skill in skills)
+            for skill_id in ids:
+                skill_postings[skill_id] += postings
+                columns[skill_id].append(set_id)
+                for other in ids:
+                    if other != skill_id:
+                        co_counts[skill_id][other] += postings
+            self.set_skills.extend(ids)
+            self.set_ptr.append(len(self.set_skills))
+            self.set_weights.append(postings)
+            self.total_postings += postings
+            self.max_set_size = max(self.max_set_size, len(ids))
+
+        size_postings = [[0] * (self.max_set_size + 1) for _ in self.skills]
+        for set_id in range(len(self.set_weights)):
+            start, end = self.set_ptr[set_id], self.set_ptr[set_id + 1]
+            for i in range(start, end):
+                size_postings[self.set_skills[i]][end - start] += self.set_weights[set_id]
+
+        for skill_id in range(len(self.skills)):
+            self.skill_postings.append(skill_postings[skill_id])
+            self.col_ptr.append(len(self.col_sets))
+            self.col_sets.extend(columns[skill_id])
+            self.size_postings.extend(size_postings[skill_id])
+            self.co_ptr.append(len(self.co_skills))
+            for other, count in sorted(co_counts[skill_id].items()):
+                self.co_skills.append(other)
+                self.co_counts.append(count)
+        self.col_ptr.append(len(self.col_sets))
+        self.co_ptr.append(len(self.co_skills))
+
+    def resolve(self, skills):
+        """Ids of the known canonical skills among skill names"""
+        ids = (self.skill_ids.get(canonical_skill(skill)) for skill in skills)
+        return {skill_id for skill_id in ids if skill_id is not None}
+
+    def co_occurrence(self, skill_id, other_id):
+        start, end = self.co_ptr[skill_id], self.co_ptr[skill_id + 1]
+        for i in range(start, end):
+            if self.co_skills[i] == other_id:
+                return self.co_counts[i]
+        return 0
+
+    def next_skills(self, skills, min_match=MATCH_THRESHOLD, limit=NEXT_SKILLS_LIMIT):
+        """
+        The missing skills that would each add the most matched postings for
+        a CV with these skills, with the CV skills they most often appear with.
+        """
+        known = self.resolve(skills)
+        threshold = min(max(min_match, 1), 100) / 100
+
+        def needed(size):
+            # Skills a CV needs from a set of this size; rounding guards 0.3 * 10 and the like
+            return max(math.ceil(round(threshold * size, 9)), 1)
+
+        # Sparse product of the CV's skill vector with the incidence matrix:
+        # how many CV skills each posting skill set contains
+        overlap = Counter()
+        for skill_id in known:
+            overlap.update(self.col_sets[self.col_ptr[skill_id]:self.col_ptr[skill_id + 1]])
+
+        unlocks = Counter()
+        matched_postings = 0
+        for set_id, count in overlap.items():
+            start, end = self.set_ptr[set_id], self.set_ptr[set_id + 1]
+            need = needed(end - start)
+            weight = self.set_weights[set_id]
+            if count >= need:
+                matched_postings += weight
+                if need == 1:
+                    # Counted below as a set one skill would unlock, but it is already matched
+                    for i in range(start, end):
+                        unlocks[self.set_skills[i]] -= weight
+            elif count == need - 1:
+                for i in range(start, end):
+                    unlocks[self.set_skills[i]] += weight
+
+        # Sets small enough that any one of their skills matches them,
+        # including those sharing no skill with the CV
+        one_skill_sizes = [size for size in range(1, self.max_set_size + 1) if needed(size) == 1]
+        row = self.max_set_size + 1
+        for skill_id in range(len(self.skills)):
+            offset = skill_id * row
+            small = sum(self.size_postings[offset + size] for size in one_skill_sizes)
+            if small:
+                unlocks[skill_id] += small
+
+        candidates = [(count, self.skill_postings[skill_id], skill_id)
+                      for skill_id, count in unlocks.items() if count > 0 and skill_id not in known]
+        candidates.sort(key=lambda item: (-item[0], -item[1], self.skills[item[2]]))
+
+        recommendations = []
+        for count, postings, skill_id in candidates[:limit]:
+            related = sorted(((self.co_occurrence(skill_id, other), self.skills[other]) for other in known),
+                             key=lambda item: (-item[0], item[1]))
+            recommendations.append({
+                'skill': self.skills[skill_id],
+                'unlocks_jobs': count,
+                'matched_jobs_after': matched_postings + count,
+                'postings': postings,
+                'related_skills': [skill for together, skill in related[:RELATED_LIMIT] if together],
+            })
+
+        return {
+            'known_skills': sorted(self.skills[skill_id] for skill_id in known),
+            'min_match': round(threshold * 100, 1),
+            'matched_jobs': matched_postings,
+            'total_jobs': self.total_postings,
+            'next_skills': recommendations,
+        }
+
+
+def build_skill_graph(jobs_path=JOBS_PATH):
+    with open(jobs_path) as f:
+        jobs = json.load(f)
+
+    skill_sets = Counter()
+    for job in jobs:
+        skills = frozenset(canonical_skill(skill) for skill in split_job_skills(job.get('skills')))
+        if skills:
+            skill_sets[skills] += 1
+
+    graph = SkillGraph()
+    graph.build(skill_sets)
+    return graph
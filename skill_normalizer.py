@@ -0,0 +1,288 @@
+"""
+Skill Normalization for Career Path Finder
+
+Maps the many spellings of a skill ("nodejs", "node.js", "Node JS") to one
+canonical skill name, so the skill extractor, the job matcher and the course
+recommender agree on what a skill is. The alias table is built offline from
+every skill source (skills.json, jobs.json and the course database) and
+committed as skill_aliases.json; at runtime a lookup is one or two dict gets.
+
+Skills are grouped when their names:
+    - differ only in case, spacing or punctuation ("ms excel", "ms-excel")
+    - are an acronym and its expansion ("search engine optimization (seo)", "seo")
+    - differ only by a trailing version ("angular 7.0", "angular")
+    - differ in one word whose spellings are near-identical by character
+      trigram similarity and are plural forms or a one-letter typo
+      ("negotiation", "negotiations"; "tensorfow", "tensorflow")
+    - are listed in SEED_SYNONYMS
+
+Usage:
+    python skill_normalizer.py       # rebuild skill_aliases.json
+"""
+
+import json
+import logging
+import os
+import re
+from collections import Counter, defaultdict
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ALIASES_PATH = os.path.join(BASE_DIR, 'skill_aliases.json')
+SKILLS_PATH = os.path.join(BASE_DIR, 'skills.json')
+JOBS_PATH = os.path.join(BASE_DIR, 'jobs.json')
+
+# alias -> preferred canonical name, for synonyms no string rule can find
+SEED_SYNONYMS = {
+    'node': 'node.js', 'nodejs': 'node.js', 'node js': 'node.js',
+    'seo': 'search engine optimization (seo)', 'seo basics': 'search engine optimization (seo)',
+    'go lang': 'golang',
+    'js': 'javascript', 'ts': 'typescript',
+    'vue': 'vue.js', 'vuejs': 'vue.js',
+    'reactjs': 'react', 'react.js': 'react',
+    'postgres': 'postgresql', 'postgre': 'postgresql',
+    'excel': 'ms-excel', 'microsoft excel': 'ms-excel',
+    'microsoft word': 'ms-word',
+    'powerpoint': 'ms-powerpoint', 'microsoft powerpoint': 'ms-powerpoint',
+    'microsoft office': 'ms-office',
+    'ml': 'machine learning', 'ai': 'artificial intelligence',
+    'k8s': 'kubernetes',
+    'photoshop': 'adobe photoshop', 'illustrator': 'adobe illustrator',
+}
+
+# Words ignored when matching an acronym against the initials of its expansion
+ACRONYM_SKIP_WORDS = {'of', 'and', '&', 'for', 'the', 'to', 'in'}
+# Acronyms that are also everyday words; mapping them would turn prose into skills
+AMBIGUOUS_ACRONYMS = {'can', 'it', 'us', 'go', 'am', 'do', 'as', 'is', 'or', 'on', 'at'}
+# Two one-word spellings must share this prefix and trigram similarity to be grouped
+SPELLING_PREFIX = 4
+SPELLING_SIMILARITY = 0.7
+
+_VERSION_PATTERN = re.compile(r'^v?\d+(\.\d+)*$')
+_PARENTHETICAL_PATTERN = re.compile(r'^(.*?)\s*\(([^()]+)\)$')
+
+
+def skill_lookup_key(name):
+    return ' '.join(str(name).lower().split())
+
+
+def compact_key(name):
+    """Name with everything but letters, digits, + and # removed"""
+    return re.sub(r'[^\w+#]|_', '', skill_lookup_key(name))
+
+
+def _trigrams(word):
+    padded = f'  {word} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _is_acronym(short, long):
+    short = re.sub(r'[^a-z0-9]', '', short)
+    words = [word for word in re.split(r'[\s/-]+', long) if word]
+    initials = ''.join(word[0] for word in words)
+    content_initials = ''.join(word[0] for word in words if word not in ACRONYM_SKIP_WORDS)
+    return len(short) >= 2 and short in (initials, content_initials)
+
+
+def _plural_or_typo(x, y):
+    if len(x) > len(y):
+        x, y = y, x
+    if y in (x + 's', x + 'es') or (x.endswith('y') and y == x[:-1] + 'ies'):
+        return True
+    if len(y) - len(x) > 1:
+        return False
+    # One insertion, deletion or substitution
+    i = 0
+    while i < len(x) and x[i] == y[i]:
+        i += 1
+    return x[i + (len(x) == len(y)):] == y[i + 1:]
+
+
+def _spelling_variants(a, b):
+    """True when two names differ in exactly one word and those words are near-identical"""
+    words_a, words_b = a.split(' '), b.split(' ')
+    if len(words_a) != len(words_b):
+        return False
+    differing = [(x, y) for x, y in zip(words_a, words_b) if x != y]
+    if len(differing) != 1:
+        return False
+    x, y = differing[0]
+    if min(len(x), len(y)) <= SPELLING_PREFIX or x[:SPELLING_PREFIX] != y[:SPELLING_PREFIX]:
+        return False
+    grams_x, grams_y = _trigrams(x), _trigrams(y)
+    similar = 2 * len(grams_x & grams_y) / (len(grams_x) + len(grams_y)) >= SPELLING_SIMILARITY
+    return similar and _plural_or_typo(x, y)
+
+
+class _Groups:
+    """Union-find over skill names"""
+
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, name):
+        self.parent.setdefault(name, name)
+        while self.parent[name] != name:
+            self.parent[name] = self.parent[self.parent[name]]
+            name = self.parent[name]
+        return name
+
+    def union(self, a, b):
+        self.parent[self.find(a)] = self.find(b)
+
+
+def build_alias_table(skills_path=SKILLS_PATH, jobs_path=JOBS_PATH):
+    """Group every known skill name and pick a canonical name per group"""
+    from course_recommender import COURSE_DATABASE
+    from job_profiles import split_job_skills
+
+    with open(jobs_path) as f:
+        jobs = json.load(f)
+    with open(skills_path) as f:
+        extractor_skills = {skill_lookup_key(skill) for skill in json.load(f)}
+    job_counts = Counter(skill for job in jobs for skill in split_job_skills(job.get('skills')))
+    course_keys = {skill_lookup_key(skill) for skill in COURSE_DATABASE}
+
+    names = set(job_counts) | extractor_skills | course_keys
+    names |= {skill_lookup_key(alias) for alias in SEED_SYNONYMS}
+    names |= {skill_lookup_key(target) for target in SEED_SYNONYMS.values()}
+
+    groups = _Groups()
+    for name in names:
+        groups.find(name)
+
+    by_compact = defaultdict(list)
+    for name in names:
+        by_compact[compact_key(name)].append(name)
+    for same in by_compact.values():
+        for other in same[1:]:
+            groups.union(other, same[0])
+
+    for name in sorted(names):
+        match = _PARENTHETICAL_PATTERN.match(name)
+        if match:
+            outside, inside = match.group(1).strip(), match.group(2).strip()
+            if _is_acronym(inside, outside) or _is_acronym(outside, inside):
+                for alias in (outside, inside):
+                    if alias not in AMBIGUOUS_ACRONYMS:
+                        groups.union(alias, name)
+                        names.add(alias)
+
+        words = name.split(' ')
+        if len(words) > 1 and _VERSION_PATTERN.match(words[-1]):
+            unversioned = ' '.join(words[:-1])
+            if unversioned in names:
+                groups.union(name, unversioned)
+
+    # Spelling variants: only compare names sharing their word count and a
+    # differing word's prefix, so the build stays far from quadratic
+    buckets = defaultdict(list)
+    for name in names:
+        words = name.split(' ')
+        for position, word in enumerate(words):
+            masked = words[:position] + ['*'] + words[position + 1:]
+            buckets[(' '.join(masked), word[:SPELLING_PREFIX])].append(name)
+    for bucket in buckets.values():
+        for i, a in enumerate(bucket):
+            for b in bucket[i + 1:]:
+                if _spelling_variants(a, b):
+                    groups.union(a, b)
+
+    for alias, target in SEED_SYNONYMS.items():
+        groups.union(skill_lookup_key(alias), skill_lookup_key(target))
+
+    members = defaultdict(list)
+    for name in names:
+        members[groups.find(name)].append(name)
+
+    preferred = {skill_lookup_key(target) for target in SEED_SYNONYMS.values()}
+    aliases = {}
+    canonical_names = []
+    for group in members.values():
+        canonical = min(group, key=lambda name: (
+            name not in preferred, -job_counts[name], name not in extractor_skills, len(name), name))
+        canonical_names.append(canonical)
+        for name in group:
+            if name != canonical:
+                aliases[name] = canonical
+
+    def canonical_of(name):
+        return aliases.get(name, name)
+
+    # Course topic for each skill: its own group's course, else the course
+    # whose name (or an alias of it) is the most specific set of words all
+    # appearing in the skill, e.g. "aws lambda" -> "aws"
+    courses_by_canonical = defaultdict(list)
+    for key in sorted(course_keys):
+        courses_by_canonical[canonical_of(key)].append(key)
+    topic_of_group = {
+        canonical: canonical if canonical in keys else keys[0]
+        for canonical, keys in courses_by_canonical.items()
+    }
+    topic_words = []
+    for canonical, topic in topic_of_group.items():
+        for name in members[groups.find(canonical)]:
+            if len(name) > 1:
+                topic_words.append((set(name.split(' ')), topic))
+    topic_words.sort(key=lambda item: (-len(item[0]), item[1]))
+
+    course_topics = {}
+    for canonical in canonical_names:
+        if canonical in topic_of_group:
+            course_topics[canonical] = topic_of_group[canonical]
+            continue
+        words = set(re.split(r'[\s()/-]+', canonical))
+        for required, topic in topic_words:
+            if required <= words:
+                course_topics[canonical] = topic
+                break
+
+    return {
+        'skills': sorted(canonical_names),
+        'aliases': dict(sorted(aliases.items())),
+        'course_topics': dict(sorted(course_topics.items())),
+    }
+
+
+def save_alias_table(table, path=ALIASES_PATH):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(table, f, indent=1, ensure_ascii=False)
+        f.write('\n')
+
+
+def load_alias_table(path=ALIASES_PATH):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning("Could not load skill aliases, skills will not be normalized: %s", e)
+        return {'skills': [], 'aliases': {}, 'course_topics': {}}
+
+
+_table = load_alias_table()
+SKILL_ALIASES = _table['aliases']
+COURSE_TOPICS = _table['course_topics']
+# Punctuation-insensitive fallback for spellings the table has not seen
+_COMPACT_ALIASES = {compact_key(name): SKILL_ALIASES.get(name, name) for name in _table['skills']}
+_COMPACT_ALIASES.update({compact_key(alias): canonical for alias, canonical in SKILL_ALIASES.items()})
+
+
+def canonical_skill(name):
+    """The canonical name of a skill; unknown skills map to their normalized name"""
+    key = skill_lookup_key(name)
+    canonical = SKILL_ALIASES.get(key)
+    if canonical is None:
+        canonical = _COMPACT_ALIASES.get(compact_key(key), key)
+    return canonical
+
+
+def course_topic(name):
+    """The COURSE_DATABASE key with courses for a skill, or None"""
+    return COURSE_TOPICS.get(canonical_skill(name))
+
+
+if __name__ == '__main__':
+    table = build_alias_table()
+    save_alias_table(table)
+    print(f"Wrote {len(table['aliases'])} aliases for {len(table['skills'])} skills to {ALIASES_PATH}")
@@ -1,28 +1,49 @@
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
 import string
 import json
+import threading
+
+from skill_normalizer import canonical_skill
+from warmup import lazy_import
 
 # Download necessary NLTK data
 # nltk.download('punkt')
 # nltk.download('stopwords')
 
-# Load the skill dataset (you can load it from a file or database)
-with open('skills.json') as f:
-    skills_dataset = json.load(f)
+# NLTK and the skill dataset are loaded on first use (or by the app's warm-up
+# thread), so importing this module stays cheap
+_vocabulary = None
+_vocabulary_lock = threading.Lock()
+
+
+def get_skill_vocabulary():
+    """(canonical names of the skills we extract, stop words), loaded once"""
+    global _vocabulary
+    if _vocabulary is None:
+        with _vocabulary_lock:
+            if _vocabulary is None:
+                stopwords = lazy_import('nltk.corpus').stopwords
+
+                # Load the skill dataset (you can load it from a file or database)
+                with open('skills.json') as f:
+                    skills_dataset = json.load(f)
+                # Canonical names, so every spelling of a skill matches
+                extractable_skills = {canonical_skill(skill) for skill in skills_dataset}
+                stop_words = set(stopwords.words('english') + list(string.punctuation))
+                _vocabulary = (extractable_skills, stop_words)
+    return _vocabulary
 
 def extract_skills_from_text(text):
+    extractable_skills, stop_words = get_skill_vocabulary()
     # Tokenize the text
-    tokens = word_tokenize(text.lower())
+    tokens = lazy_import('nltk.tokenize').word_tokenize(text.lower())
     # Remove stopwords and punctuation
-    stop_words = set(stopwords.words('english') + list(string.punctuation))
-    filtered_tokens = [token for token in tokens if token not in stop_words]
+    filtered_tokens = {token for token in tokens if token not in stop_words}
     
-    # Extract skills by matching tokens with the predefined skills dataset
+    # Extract skills by resolving each token to a canonical skill
     extracted_skills = set()
-    for skill in skills_dataset:
-        if skill.lower() in filtered_tokens:
+    for token in filtered_tokens:
+        skill = canonical_skill(token)
+        if skill in extractable_skills:
             extracted_skills.add(skill)
     
     return list(extracted_skills)
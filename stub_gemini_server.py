@@ -0,0 +1,109 @@
+"""
+Stub Gemini Server for local testing
+
+Answers generateContent calls with a canned roadmap so /generate_roadmap can
+be exercised (and load tested) without a Gemini API key.
+
+Usage:
+    python stub_gemini_server.py --port 8089 --delay 1.5
+    GEMINI_API_URL=http://127.0.0.1:8089/v1beta/models/gemini-pro:generateContent python app.py
+
+GET /stats returns the number of generateContent calls served, and the
+path and x-goog-api-key header of the last one. With --fail-first N, the
+first N calls get a 503, to exercise the client's retries.
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubGeminiHandler(BaseHTTPRequestHandler):
+    delay = 0.0
+    fail_first = 0
+    calls = 0
+    last_path = None
+    last_api_key = None
+    calls_lock = threading.Lock()
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/stats':
+            self._send_json(200, {'calls': StubGeminiHandler.calls, 'last_path': StubGeminiHandler.last_path,
+                                  'last_api_key': StubGeminiHandler.last_api_key})
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            prompt = json.loads(self.rfile.read(length))['contents'][0]['parts'][0]['text']
+        except (ValueError, KeyError, IndexError):
+            self._send_json(400, {'error': 'malformed generateContent request'})
+            return
+
+        with StubGeminiHandler.calls_lock:
+            StubGeminiHandler.calls += 1
+            StubGeminiHandler.last_path = self.path
+            StubGeminiHandler.last_api_key = self.headers.get('x-goog-api-key')
+            failing = StubGeminiHandler.calls <= self.fail_first
+        if self.delay:
+            time.sleep(self.delay)
+        if failing:
+            self._send_json(503, {'error': 'stub failure'})
+            return
+
+        match = re.search(r'wants to become a (.+?)\.\n', prompt)
+        job_role = match.group(1) if match else 'Unknown Role'
+        roadmap = {
+            'job_role': job_role,
+            'total_duration_months': 6,
+            'stages': [
+                {
+                    'stage_number': 1,
+                    'stage_name': 'Foundations',
+                    'description': f'Core fundamentals for a {job_role}.',
+                    'skills': ['fundamentals'],
+                    'projects': ['starter project'],
+                    'certifications': [],
+                    'duration_months': 6,
+                }
+            ],
+            'skill_gaps': [],
+        }
+        self._send_json(200, {'candidates': [{'content': {'parts': [{'text': json.dumps(roadmap)}]}}]})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port=8089, delay=0.0, fail_first=0):
+    """Start the stub server on a background thread and return it; port 0 picks a free port"""
+    StubGeminiHandler.delay = delay
+    StubGeminiHandler.fail_first = fail_first
+    StubGeminiHandler.calls = 0
+    server = ThreadingHTTPServer(('127.0.0.1', port), StubGeminiHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Stub Gemini generateContent server")
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--delay', type=float, default=0.0, help="seconds to wait before answering")
+    parser.add_argument('--fail-first', type=int, default=0, help="answer the first N calls with a 503")
+    args = parser.parse_args()
+    StubGeminiHandler.delay = args.delay
+    StubGeminiHandler.fail_first = args.fail_first
+    print(f"Stub Gemini server listening on http://127.0.0.1:{args.port}")
+    ThreadingHTTPServer(('127.0.0.1', args.port), StubGeminiHandler).serve_forever()
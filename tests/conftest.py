@@ -0,0 +1,11 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The app modules are top-level and read their data files relative to the working directory
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+# Tests load what they use; the background warm-up would only compete with them
+os.environ.setdefault('WARMUP_ENABLED', '0')
@@ -0,0 +1,78 @@
+import io
+import json
+import zipfile
+
+import pytest
+
+from batch_cv import InvalidRecord, iter_rendered, iter_zip, read_cv_records
+
+GOOD = {'personal': {'fullName': 'Ada Lovelace', 'email': 'ada@example.com'}, 'skills': ['Python']}
+
+
+def render(records):
+    return dict(iter_rendered(records, output_format='html', workers=1))
+
+
+def test_malformed_jsonl_lines_become_invalid_records():
+    stream = io.StringIO(json.dumps(GOOD) + '\n{"personal": \n\n' + json.dumps(GOOD) + '\n')
+    records = list(read_cv_records(stream, 'cvs.jsonl'))
+    assert records[0] == GOOD and records[2] == GOOD
+    assert isinstance(records[1], InvalidRecord)
+    assert 'not valid JSON' in records[1].reason
+
+
+def test_malformed_csv_json_cell_becomes_an_invalid_record():
+    stream = io.StringIO('fullName,email,experience\n'
+                         'Ada Lovelace,ada@example.com,"[{""position"": ""Analyst""}]"\n'
+                         'Bad Row,bad@example.com,[{oops\n')
+    records = list(read_cv_records(stream, 'cvs.csv'))
+    assert records[0]['experience'] == [{'position': 'Analyst'}]
+    assert isinstance(records[1], InvalidRecord)
+    assert 'experience' in records[1].reason
+
+
+def test_bad_records_are_reported_in_the_archive_and_the_rest_render():
+    stream = io.StringIO(json.dumps(GOOD) + '\nnot json\n[1, 2]\n' + json.dumps(GOOD) + '\n')
+    rendered = render(read_cv_records(stream, 'cvs.jsonl'))
+    assert sorted(rendered) == ['0001_Ada_Lovelace.html', '0002_CV.error.txt', '0003_CV.error.txt',
+                                '0004_Ada_Lovelace.html']
+    assert b'not valid JSON' in rendered['0002_CV.error.txt']
+    assert b'not an object' in rendered['0003_CV.error.txt']
+
+
+def test_a_failing_record_source_still_produces_a_complete_zip():
+    def records():
+        yield GOOD
+        raise UnicodeDecodeError('utf-8', b'\xff', 0, 1, 'invalid start byte')
+
+    archive = zipfile.ZipFile(io.BytesIO(b''.join(iter_zip(iter_rendered(records(), 'html', workers=1)))))
+    assert archive.testzip() is None
+    assert sorted(archive.namelist()) == ['0001_Ada_Lovelace.html', 'BATCH_ERROR.txt']
+    assert b'after record 1' in archive.read('BATCH_ERROR.txt')
+
+
+@pytest.fixture
+def client():
+    import app
+    return app.app.test_client()
+
+
+def post_batch(client, body, filename='cvs.jsonl'):
+    return client.post('/api/generate-cv/batch', data={'file': (io.BytesIO(body), filename), 'output_format': 'html'})
+
+
+def test_batch_slot_is_released_when_spooling_fails(client, monkeypatch):
+    import app
+
+    def broken_spool(*args, **kwargs):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(app.tempfile, 'SpooledTemporaryFile', broken_spool)
+    for _ in range(3):
+        assert post_batch(client, b'{}').status_code == 500
+    monkeypatch.undo()
+
+    response = post_batch(client, json.dumps(GOOD).encode() + b'\n{broken\n')
+    assert response.status_code == 200
+    archive = zipfile.ZipFile(io.BytesIO(response.get_data()))
+    assert sorted(archive.namelist()) == ['0001_Ada_Lovelace.html', '0002_CV.error.txt']
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from contact_store import MAX_PAGE_SIZE, ContactStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    # A long flush interval so only explicit flushes (and page()) write
+    return ContactStore(db_path=str(tmp_path / 'contacts.db'), flush_seconds=60, batch_size=1000)
+
+
+def entry(i, **extra):
+    return {'timestamp': f'2026-01-01T00:00:{i:02d}', 'name': f'User {i}', 'email': f'user{i}@example.com',
+            'subject': 'Hello', 'message': f'Message {i}', **extra}
+
+
+def test_page_reads_buffered_entries_in_id_order(store):
+    for i in range(5):
+        store.add(entry(i))
+    page = store.page(limit=3)
+    assert [e['name'] for e in page] == ['User 0', 'User 1', 'User 2']
+    assert [e['id'] for e in page] == sorted(e['id'] for e in page)
+    assert store.count() == 5
+
+
+def test_page_cursor_continues_after_the_last_id(store):
+    for i in range(7):
+        store.add(entry(i))
+    first = store.page(limit=3)
+    second = store.page(after=first[-1]['id'], limit=3)
+    third = store.page(after=second[-1]['id'], limit=3)
+    assert [e['name'] for e in first + second + third] == [f'User {i}' for i in range(7)]
+    assert len(third) == 1
+    assert store.page(after=third[-1]['id']) == []
+
+
+def test_page_limit_is_clamped(store):
+    store.add(entry(0))
+    assert len(store.page(limit=0)) == 1
+    store.add(entry(1))
+    assert len(store.page(limit=MAX_PAGE_SIZE * 10)) == 2
+
+
+@pytest.mark.parametrize('count', [0, 4, 5, 11])
+def test_iter_entries_walks_every_page(store, count):
+    for i in range(count):
+        store.add(entry(i))
+    assert [e['name'] for e in store.iter_entries(batch=5)] == [f'User {i}' for i in range(count)]
+
+
+def test_iter_entries_starts_after_the_given_id(store):
+    for i in range(6):
+        store.add(entry(i))
+    ids = [e['id'] for e in store.page()]
+    assert [e['id'] for e in store.iter_entries(after=ids[2], batch=2)] == ids[3:]
+
+
+def test_extra_fields_round_trip_without_shadowing_columns(store):
+    store.add(entry(0, phone='123', tags=['a', 'b']))
+    stored = store.page()[0]
+    assert stored['phone'] == '123' and stored['tags'] == ['a', 'b']
+    assert stored['name'] == 'User 0'
+
+
+def test_import_jsonl_appends_after_existing_entries(store, tmp_path):
+    store.add(entry(0))
+    store.flush()
+    path = tmp_path / 'contact_data.json'
+    path.write_text('\n'.join(json.dumps(entry(i)) for i in (1, 2)) + '\n\n', encoding='utf-8')
+    assert store.import_jsonl(path) == 2
+    assert [e['name'] for e in store.iter_entries(batch=2)] == ['User 0', 'User 1', 'User 2']
@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs fork')
+
+# Fork with the parent's queue locked and a record still waiting on it
+FORK_SCRIPT = """
+import logging, os, signal, sys, threading
+import log_config
+
+log_config.setup_logging()
+logger = logging.getLogger('forktest')
+log_config._listener.stop()
+logger.warning('queued before fork')
+parent_queue = logging.getLogger().handlers[0].queue
+
+held, release = threading.Event(), threading.Event()
+def hold():
+    with parent_queue.mutex:
+        held.set()
+        release.wait()
+threading.Thread(target=hold, daemon=True).start()
+held.wait()
+
+pid = os.fork()
+if pid == 0:
+    signal.alarm(10)
+    logger.warning('from child')
+    sys.exit(0)
+_, status = os.waitpid(pid, 0)
+release.set()
+log_config._listener.start()
+logger.warning('child exit %s', os.waitstatus_to_exitcode(status))
+"""
+
+POOL_SCRIPT = """
+import logging
+import log_config
+from worker_pool import BoundedProcessPool
+
+log_config.setup_logging()
+pool = BoundedProcessPool(max_workers=1, max_pending=1)
+pool.run(logging.getLogger('pooltest').warning, 'from pool process', timeout=30)
+pool.shutdown()
+"""
+
+
+def run(script):
+    env = dict(os.environ, LOG_FORMAT='text')
+    result = subprocess.run([sys.executable, '-c', script], cwd=ROOT, env=env, capture_output=True, text=True,
+                            timeout=60)
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+def test_forked_child_logs_through_its_own_queue():
+    output = run(FORK_SCRIPT)
+    assert output.count('from child') == 1
+    assert output.count('queued before fork') == 1
+    assert 'child exit 0' in output
+
+
+def test_pool_processes_log_to_stdout():
+    assert run(POOL_SCRIPT).count('from pool process') == 1
@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+import market_data
+
+pq = pytest.importorskip('pyarrow.parquet')
+pa = pytest.importorskip('pyarrow')
+
+CSV = ('Job Title,Company Name,Location,Start Date,CTC (Annual),Experience,Apply By,Skills Required,Perks\n'
+       'Data Analyst,Acme,"Pune, Work from home",Starts immediately,"₹ 3,00,000 - 4,00,000 /year",'
+       '1 year(s),16 May\' 25,"Python, SQL",Flexible hours\n')
+
+
+@pytest.fixture
+def jobs_csv(tmp_path, monkeypatch):
+    path = tmp_path / 'jobs.csv'
+    path.write_text(CSV, encoding='utf-8')
+    monkeypatch.setitem(market_data.DATASETS, 'jobs', (str(path), market_data.DATASETS['jobs'][1]))
+    return path
+
+
+def test_build_parquet_records_version_and_dataset(jobs_csv):
+    path, rows = market_data.build_parquet('jobs')
+    assert rows == 1
+    metadata = pq.read_schema(path).metadata
+    assert metadata[b'market_data_version'] == str(market_data.PARQUET_VERSION).encode()
+    assert metadata[b'dataset'] == b'jobs'
+    assert market_data._parquet_is_fresh('jobs')
+
+
+def test_foreign_parquet_file_is_rebuilt(jobs_csv):
+    # What Scraping/pipeline.py --parquet used to leave at this path: raw strings, no version
+    path = market_data.parquet_path('jobs')
+    pq.write_table(pa.table({'Job Title': ['Data Analyst'], 'Skills Required': ['Python, SQL']}), path)
+    assert not market_data._parquet_is_fresh('jobs')
+
+    columns = market_data.load_columns('jobs', ['title', 'skills', 'salary_min'])
+    assert columns == {'title': ['Data Analyst'], 'skills': [['python', 'sql']], 'salary_min': [300000.0]}
+    assert market_data._parquet_is_fresh('jobs')
+
+
+def test_other_version_is_rebuilt(jobs_csv, monkeypatch):
+    market_data.build_parquet('jobs')
+    monkeypatch.setattr(market_data, 'PARQUET_VERSION', market_data.PARQUET_VERSION + 1)
+    assert not market_data._parquet_is_fresh('jobs')
+    assert market_data.load_columns('jobs', ['company']) == {'company': ['Acme']}
+    assert market_data._parquet_is_fresh('jobs')
+
+
+def test_parquet_older_than_csv_is_stale(jobs_csv):
+    path, _ = market_data.build_parquet('jobs')
+    os.utime(path, (0, 0))
+    assert not market_data._parquet_is_fresh('jobs')
@@ -0,0 +1,44 @@
+import math
+
+import market_stats
+
+COLUMNS = {
+    'title': ['Data Analyst', 'Data Analyst', 'Web Developer', 'Data Analyst'],
+    'locations': [['Pune'], ['Delhi'], ['Pune'], ['Pune', 'Delhi']],
+    'skills': [['python', 'sql'], ['python'], ['javascript'], ['sql']],
+    'salary_min': [300000.0, 500000.0, 400000.0, None],
+    'salary_max': [500000.0, 500000.0, 400000.0, None],
+    'salary_currency': ['INR', 'INR', 'INR', None],
+    'salary_period': ['year', 'year', 'year', None],
+}
+
+
+def build(monkeypatch):
+    monkeypatch.setattr(market_stats, 'load_columns', lambda dataset, columns: COLUMNS)
+    return market_stats.build_market_aggregates()
+
+
+def test_single_filter_has_no_combined_stats(monkeypatch):
+    result = build(monkeypatch).query(skill='Python')
+    assert result['skill']['postings'] == 2
+    assert 'combined' not in result
+
+
+def test_filters_are_intersected(monkeypatch):
+    result = build(monkeypatch).query(skill='python', title='data analyst', location='pune')
+    assert result['skill']['postings'] == 2
+    assert result['title']['postings'] == 3
+    assert result['location']['postings'] == 3
+    combined = result['combined']
+    assert combined['postings'] == 1
+    assert combined['share_of_postings'] == 25.0
+    assert combined['postings_with_salary'] == 1
+    assert combined['salary']['p50'] == 400000
+
+
+def test_combined_without_salaries_or_matches(monkeypatch):
+    aggregates = build(monkeypatch)
+    assert math.isnan(aggregates.salaries[3])
+    combined = aggregates.query(skill='sql', location='delhi')['combined']
+    assert combined == {'postings': 1, 'share_of_postings': 25.0, 'postings_with_salary': 0, 'salary': None}
+    assert aggregates.query(skill='python', title='nurse')['combined']['postings'] == 0
@@ -0,0 +1,46 @@
+import os
+
+import metrics
+
+
+def test_without_a_server_run_nothing_is_written(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, 'METRICS_DIR', str(tmp_path))
+    monkeypatch.setattr(metrics, 'METRICS_RUN_ID', None)
+    registry = metrics.Registry()
+    registry.inc('cv_uploads_total', {'outcome': 'success'})
+    registry.flush()
+    assert os.listdir(tmp_path) == []
+
+
+def test_only_processes_with_new_values_write_snapshots(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, 'METRICS_DIR', str(tmp_path))
+    monkeypatch.setattr(metrics, 'METRICS_RUN_ID', '123')
+    idle, busy = metrics.Registry(), metrics.Registry()
+    idle.flush()
+    assert not os.path.exists(metrics.run_dir('123'))
+
+    busy.inc('cv_uploads_total', {'outcome': 'success'})
+    busy.flush()
+    files = os.listdir(metrics.run_dir('123'))
+    assert len(files) == 1 and files[0].startswith(f'metrics-{os.getpid()}-')
+
+    # A second registry in the same process (as after pid reuse) gets its own file
+    idle.inc('cv_uploads_total', {'outcome': 'error'})
+    idle.flush()
+    assert len(os.listdir(metrics.run_dir('123'))) == 2
+
+
+def test_collect_adds_up_the_run_only(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, 'METRICS_DIR', str(tmp_path))
+    monkeypatch.setattr(metrics, 'METRICS_RUN_ID', 'old')
+    old = metrics.Registry()
+    old.inc('cv_uploads_total', {'outcome': 'success'}, 5)
+    old.flush()
+
+    monkeypatch.setattr(metrics, 'METRICS_RUN_ID', 'new')
+    worker = metrics.Registry()
+    worker.inc('cv_uploads_total', {'outcome': 'success'}, 2)
+    worker.flush()
+    monkeypatch.setattr(metrics, 'registry', metrics.Registry())
+    counters, _ = metrics._collect()
+    assert counters == {('cv_uploads_total', (('outcome', 'success'),)): 2}
@@ -0,0 +1,106 @@
+import json
+import socket
+import threading
+import urllib.request
+
+import pytest
+
+pytest.importorskip('requests')
+
+import stub_gemini_server
+from roadmap_client import RoadmapClient, RoadmapCache
+
+API_KEY = 'test-secret-key'
+
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def start(delay=0.0, fail_first=0):
+        server = stub_gemini_server.serve(port=0, delay=delay, fail_first=fail_first)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def client_for(server, **kwargs):
+    port = server.server_address[1]
+    url = f'http://127.0.0.1:{port}/v1beta/models/gemini-pro:generateContent'
+    return RoadmapClient(api_url=url, api_key=API_KEY, cache=RoadmapCache(db_path=None), **kwargs)
+
+
+def stats(server):
+    with urllib.request.urlopen(f'http://127.0.0.1:{server.server_address[1]}/stats') as response:
+        return json.load(response)
+
+
+def test_generate_returns_the_stub_roadmap(stub):
+    server = stub()
+    roadmap, error = client_for(server).generate('Data Scientist', ['Python', 'SQL'])
+    assert error is None
+    assert roadmap['job_role'] == 'Data Scientist'
+    assert roadmap['stages'][0]['stage_name'] == 'Foundations'
+
+
+def test_api_key_is_sent_in_a_header_not_the_url(stub):
+    server = stub()
+    client_for(server).generate('Data Scientist', [])
+    calls = stats(server)
+    assert calls['last_api_key'] == API_KEY
+    assert API_KEY not in calls['last_path']
+
+
+def test_repeated_requests_are_served_from_the_cache(stub):
+    server = stub()
+    client = client_for(server)
+    first, _ = client.generate('Data Scientist', ['SQL', 'python'])
+    # Same role and skill set, spelled differently
+    second, _ = client.generate(' data scientist ', ['Python', 'sql'])
+    assert first == second
+    assert stats(server)['calls'] == 1
+
+
+def test_server_errors_are_retried(stub):
+    server = stub(fail_first=1)
+    roadmap, error = client_for(server).generate('Data Scientist', [])
+    assert error is None and roadmap is not None
+    assert stats(server)['calls'] == 2
+
+
+def test_concurrent_identical_requests_share_one_call(stub):
+    server = stub(delay=0.3)
+    client = client_for(server)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(client.generate('Data Scientist', ['Python'])))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 5
+    assert all(roadmap == results[0][0] and error is None for roadmap, error in results)
+    assert stats(server)['calls'] == 1
+
+
+def test_errors_do_not_leak_the_api_key():
+    # Nothing listens on a port that was just freed, so the request fails to connect
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    client = RoadmapClient(api_url=f'http://127.0.0.1:{port}/generate', api_key=API_KEY,
+                           cache=RoadmapCache(db_path=None), timeout=(0.5, 0.5))
+    roadmap, error = client.generate('Data Scientist', [])
+    assert roadmap is None
+    assert API_KEY not in error
+
+
+def test_upstream_error_bodies_are_not_returned(stub):
+    server = stub(fail_first=10)
+    roadmap, error = client_for(server).generate('Data Scientist', [])
+    assert roadmap is None
+    assert 'stub failure' not in error and '503' not in error
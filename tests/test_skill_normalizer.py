@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+import skill_normalizer
+from skill_normalizer import ALIASES_PATH, SEED_SYNONYMS, build_alias_table, canonical_skill
+
+
+@pytest.fixture(scope='module')
+def built_table():
+    return build_alias_table()
+
+
+def test_build_alias_table_reproduces_the_committed_file(built_table):
+    # Fails when skills.json, jobs.json or the grouping rules change without
+    # `python skill_normalizer.py` being rerun
+    with open(ALIASES_PATH, encoding='utf-8') as f:
+        assert built_table == json.load(f)
+
+
+def test_seed_synonyms_are_in_the_table(built_table):
+    for alias in SEED_SYNONYMS:
+        assert built_table['aliases'].get(alias, alias) in built_table['skills']
+
+
+@pytest.mark.parametrize('name, canonical', [
+    ('NodeJS', 'node.js'),
+    ('Excel', 'ms-excel'),
+    ('SEO', 'search engine optimization (seo)'),
+    ('negotiations', 'negotiation'),
+    ('tensorfow', 'tensorflow'),
+    ('  Python ', 'python'),
+])
+def test_canonical_skill(name, canonical):
+    assert canonical_skill(name) == canonical
+
+
+def test_saved_table_round_trips(built_table, tmp_path):
+    path = tmp_path / 'aliases.json'
+    skill_normalizer.save_alias_table(built_table, path)
+    assert skill_normalizer.load_alias_table(path) == built_table
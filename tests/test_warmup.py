@@ -0,0 +1,95 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from conftest import ROOT
+
+# Warm-up and request threads importing NLTK at once, in a fresh interpreter
+RACE_SCRIPT = """
+import json, threading
+import warmup
+
+errors = []
+
+def warm():
+    warmup._run([('nltk_tokenizer', 'nltk.tokenize')])
+    if warmup.warmup_timings['nltk_tokenizer'] is None:
+        errors.append('warm-up step failed')
+
+def request():
+    try:
+        warmup.lazy_import('nltk.corpus').stopwords
+        warmup.lazy_import('nltk.tokenize').word_tokenize
+    except Exception as e:
+        errors.append(repr(e))
+
+threads = [threading.Thread(target=warm)] + [threading.Thread(target=request) for _ in range(4)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+import nltk
+errors += [] if hasattr(nltk, 'data') else ['nltk left half-imported']
+print(json.dumps(errors))
+"""
+
+
+def test_concurrent_lazy_imports_of_nltk_do_not_break_it():
+    pytest.importorskip('nltk')
+    for _ in range(3):
+        result = subprocess.run([sys.executable, '-c', RACE_SCRIPT], cwd=ROOT, capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+        assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+
+
+def test_lazy_import_returns_the_module():
+    from warmup import lazy_import
+
+    assert lazy_import('json') is json
+
+
+def test_lazy_import_skips_the_lock_for_imported_modules():
+    import warmup
+
+    with warmup._import_lock:
+        # Another thread would block here if imported modules took the lock
+        result = []
+        thread = threading.Thread(target=lambda: result.append(warmup.lazy_import('json')))
+        thread.start()
+        thread.join(5)
+    assert result == [json]
+
+
+# Fork while another thread holds the import lock; the child must still import
+FORK_SCRIPT = """
+import os, signal, sys, threading
+import warmup
+
+held, release = threading.Event(), threading.Event()
+
+def hold():
+    with warmup._import_lock:
+        held.set()
+        release.wait()
+
+threading.Thread(target=hold, daemon=True).start()
+held.wait()
+pid = os.fork()
+if pid == 0:
+    signal.alarm(10)
+    warmup.lazy_import('csv')
+    os._exit(0)
+_, status = os.waitpid(pid, 0)
+release.set()
+sys.exit(os.waitstatus_to_exitcode(status))
+"""
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs fork')
+def test_forked_child_does_not_inherit_a_held_import_lock():
+    result = subprocess.run([sys.executable, '-c', FORK_SCRIPT], cwd=ROOT, capture_output=True, text=True, timeout=30)
+    assert result.returncode == 0, result.stderr
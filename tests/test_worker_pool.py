@@ -0,0 +1,69 @@
+import json
+import subprocess
+import sys
+import time
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import pytest
+
+from conftest import ROOT
+from worker_pool import BoundedProcessPool
+
+
+def test_saturated_pool_runs_inline_without_gevent():
+    pool = BoundedProcessPool(max_workers=1, max_pending=1)
+    try:
+        busy = pool.try_submit(time.sleep, 1)
+        assert pool.run_or_inline(sum, [1, 2, 3]) == 6
+        busy.result(timeout=10)
+    finally:
+        pool.shutdown()
+
+
+def test_timeout_raises_and_the_slot_is_released_when_the_job_ends():
+    pool = BoundedProcessPool(max_workers=1, max_pending=1)
+    try:
+        with pytest.raises(FutureTimeout):
+            pool.run(time.sleep, 1, timeout=0.1)
+        assert pool.run(sum, [1, 2], timeout=10, wait=10) == 3
+    finally:
+        pool.shutdown()
+
+
+# Under gevent a saturated pool is waited on cooperatively, then PoolSaturated
+GEVENT_SCRIPT = """
+from gevent import monkey
+monkey.patch_all()
+import json, time
+import gevent
+import worker_pool
+
+worker_pool.WORKER_POOL_SLOT_WAIT = 0.5
+pool = worker_pool.BoundedProcessPool(max_workers=1, max_pending=1)
+busy = pool.try_submit(time.sleep, 2)
+ticks = []
+ticker = gevent.spawn(lambda: [ticks.append(gevent.sleep(0.05)) for _ in range(100)])
+start = time.monotonic()
+try:
+    pool.run_or_inline(sum, [1, 2])
+    outcome = 'ran'
+except worker_pool.PoolSaturated:
+    outcome = 'saturated'
+waited = time.monotonic() - start
+ticker.kill()
+busy.result(timeout=10)
+pool.shutdown()
+print(json.dumps({'outcome': outcome, 'waited': waited, 'ticks': len(ticks)}))
+"""
+
+
+def test_gevent_waits_cooperatively_instead_of_running_inline():
+    pytest.importorskip('gevent')
+    result = subprocess.run([sys.executable, '-c', GEVENT_SCRIPT], cwd=ROOT, capture_output=True, text=True,
+                            timeout=60)
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    assert report['outcome'] == 'saturated'
+    assert 0.4 < report['waited'] < 2
+    # The other greenlet kept running while the request waited for a slot
+    assert report['ticks'] >= 5
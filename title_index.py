@@ -0,0 +1,153 @@
+"""
+Job Title Search for Career Path Finder
+
+Autocomplete and fuzzy resolution over the distinct job titles of the
+catalogue. Completions come from a flattened prefix trie: the sorted list of
+every title and every word-suffix of a title ("senior graphic designer",
+"graphic designer", "designer"), where all keys under a prefix form one
+contiguous range found by binary search. Misspelt or reordered input falls
+back to a character trigram index. Both are built from the catalogue's title
+profiles when the catalogue is loaded, so a query never scans the titles.
+"""
+
+import heapq
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from functools import lru_cache
+
+from job_profiles import normalize_title
+
+SUGGEST_LIMIT = 8
+# Recent queries remembered per process; users typing a title repeat the same prefixes
+SUGGEST_CACHE_SIZE = 4096
+# Prefixes this short match too many titles to rank per query; their
+# completions are ranked once at build time
+SHORT_PREFIX = 2
+# Minimum trigram similarity for fuzzy suggestions and for resolving a title
+FUZZY_SUGGEST_THRESHOLD = 0.3
+FUZZY_RESOLVE_THRESHOLD = 0.6
+
+_PREFIX_END = '\U0010ffff'
+
+
+def trigrams(text):
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TitleIndex:
+    def __init__(self, titles, postings):
+        self.titles = titles
+        self.postings = postings
+        self.normalized = [normalize_title(title) for title in titles]
+        self.title_ids = {key: title_id for title_id, key in enumerate(self.normalized)}
+
+        # Flattened trie: sorted keys with the title and word offset of each
+        entries = []
+        for title_id, key in enumerate(self.normalized):
+            words = key.split(' ')
+            for offset in range(len(words)):
+                entries.append((' '.join(words[offset:]), title_id, offset))
+        entries.sort()
+        self.keys = [key for key, _, _ in entries]
+        self.key_titles = array('I', (title_id for _, title_id, _ in entries))
+        self.key_offsets = array('B', (min(offset, 255) for _, _, offset in entries))
+
+        self.short_prefixes = {}
+        for key, title_id, offset in entries:
+            for length in range(1, SHORT_PREFIX + 1):
+                if len(key) >= length:
+                    self.short_prefixes.setdefault(key[:length], {})
+                    ranked = self.short_prefixes[key[:length]]
+                    ranked[title_id] = min(ranked.get(title_id, offset), offset)
+        self.short_prefixes = {
+            prefix: self._rank(ranked.items(), SUGGEST_LIMIT)
+            for prefix, ranked in self.short_prefixes.items()
+        }
+
+        # Trigram -> titles containing it
+        grams = defaultdict(list)
+        for title_id, key in enumerate(self.normalized):
+            for gram in trigrams(key):
+                grams[gram].append(title_id)
+        self.trigram_titles = {gram: array('I', ids) for gram, ids in grams.items()}
+        self.trigram_counts = array('H', (len(trigrams(key)) for key in self.normalized))
+
+        self._cached_suggest = lru_cache(maxsize=SUGGEST_CACHE_SIZE)(self._suggest)
+
+    def _rank(self, matches, limit):
+        """Best (title_id, word offset) matches: whole-title prefixes first, then by postings"""
+        best = heapq.nsmallest(limit, matches, key=lambda match: (match[1] > 0, -self.postings[match[0]], match[0]))
+        return [title_id for title_id, _ in best]
+
+    def complete(self, prefix, limit=SUGGEST_LIMIT):
+        """Ids of titles with a word starting with prefix"""
+        if not prefix:
+            return []
+        if len(prefix) <= SHORT_PREFIX and limit <= SUGGEST_LIMIT:
+            return self.short_prefixes.get(prefix, [])[:limit]
+        start = bisect_left(self.keys, prefix)
+        end = bisect_left(self.keys, prefix + _PREFIX_END, start)
+        matches = {}
+        for i in range(start, end):
+            title_id = self.key_titles[i]
+            matches[title_id] = min(matches.get(title_id, 255), self.key_offsets[i])
+        return self._rank(matches.items(), limit)
+
+    def fuzzy(self, text, limit=SUGGEST_LIMIT, threshold=FUZZY_SUGGEST_THRESHOLD):
+        """(title_id, similarity) of titles sharing the most trigrams with text"""
+        query = trigrams(text)
+        shared = Counter()
+        for gram in query:
+            shared.update(self.trigram_titles.get(gram, ()))
+        best = []
+        for title_id, count in shared.most_common():
+            # A title sharing count trigrams scores at most 2c / (|query| + c),
+            # so once that cannot beat the current results the rest can't either
+            bound = 2 * count / (len(query) + count)
+            if bound < threshold or (len(best) == limit and bound < best[0][0]):
+                break
+            # Dice coefficient of the two trigram sets
+            similarity = 2 * count / (len(query) + self.trigram_counts[title_id])
+            if similarity >= threshold:
+                item = (similarity, self.postings[title_id], -title_id)
+                if len(best) < limit:
+                    heapq.heappush(best, item)
+                elif item > best[0]:
+                    heapq.heapreplace(best, item)
+        best.sort(reverse=True)
+        return [(-negative_id, similarity) for similarity, _, negative_id in best]
+
+    def suggest(self, query, limit=SUGGEST_LIMIT):
+        """Ranked completions for a partially typed title, topped up with fuzzy matches"""
+        query = normalize_title(query)
+        if not query:
+            return []
+        return [dict(suggestion) for suggestion in self._cached_suggest(query, limit)]
+
+    def _suggest(self, query, limit):
+        suggestions = [{'id': title_id, 'title': self.titles[title_id], 'postings': self.postings[title_id], 'match': 'prefix'}
+                       for title_id in self.complete(query, limit)]
+        if len(suggestions) < limit and len(query) >= 3:
+            seen = {suggestion['id'] for suggestion in suggestions}
+            for title_id, _ in self.fuzzy(query, limit):
+                if title_id not in seen and len(suggestions) < limit:
+                    suggestions.append({'id': title_id, 'title': self.titles[title_id],
+                                        'postings': self.postings[title_id], 'match': 'fuzzy'})
+        return suggestions
+
+    def resolve(self, title):
+        """Title id for a job title: exact match first, then the closest fuzzy match"""
+        key = normalize_title(title)
+        title_id = self.title_ids.get(key)
+        if title_id is None and len(key) >= 3:
+            best = self.fuzzy(key, limit=1, threshold=FUZZY_RESOLVE_THRESHOLD)
+            if best:
+                title_id = best[0][0]
+        return title_id
+
+
+def build_title_index(catalogue):
+    profiles = catalogue['title_profiles']
+    return TitleIndex(profiles.titles, profiles.postings)
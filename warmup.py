@@ -0,0 +1,88 @@
+"""
+Startup Warm-up for Career Path Finder
+
+The app imports its heavy libraries (NLTK, pdfminer, python-docx,
+ReportLab, requests) and loads its datasets on first use, so a worker
+answers the health check at / almost as soon as it starts. A background
+thread then loads them one step at a time, so the first real request does
+not pay for them either. Under gevent workers the thread is a greenlet; it
+yields between steps, so a request waits for one step at most.
+
+Each step is a callable or a module name to import. Failures are logged
+and the step is retried on first use by the code that needs it.
+
+Every lazy import, whether from a warm-up step or from a request, goes
+through lazy_import(). It holds one process-wide lock, so two threads never
+import the same package at once. An overlapping import of NLTK, for
+example, breaks the nltk module for the life of the process. A module that
+is already imported is returned without taking the lock, and a forked child
+(a pool process, say) starts with a fresh lock, since the thread that held
+it in the parent does not exist in the child.
+
+Settings:
+    WARMUP_ENABLED   load libraries and data in the background at worker start (default on)
+"""
+
+import importlib
+import logging
+import os
+import sys
+import threading
+import time
+
+WARMUP_ENABLED = os.getenv('WARMUP_ENABLED', '1').lower() in ('1', 'true', 'yes')
+
+logger = logging.getLogger(__name__)
+
+# Reentrant: a module being imported may itself lazy-import another
+_import_lock = threading.RLock()
+
+
+def _reset_import_lock():
+    global _import_lock
+    _import_lock = threading.RLock()
+
+
+os.register_at_fork(after_in_child=_reset_import_lock)
+
+# step name -> seconds taken, or None when it failed
+warmup_timings = {}
+warmup_done = threading.Event()
+
+
+def lazy_import(name):
+    """Import a module on first use, one thread at a time; returns the module"""
+    module = sys.modules.get(name)
+    # A module still being executed by another thread is in sys.modules too
+    if module is not None and not getattr(getattr(module, '__spec__', None), '_initializing', False):
+        return module
+    with _import_lock:
+        return importlib.import_module(name)
+
+
+def _run(steps):
+    for name, step in steps:
+        start = time.perf_counter()
+        try:
+            if isinstance(step, str):
+                lazy_import(step)
+            else:
+                step()
+            warmup_timings[name] = round(time.perf_counter() - start, 3)
+        except Exception:
+            logger.warning("Warm-up step %s failed; it will load on first use", name, exc_info=True)
+            warmup_timings[name] = None
+        # Let request handlers in (gevent only switches greenlets on a blocking call)
+        time.sleep(0)
+    logger.info("Warm-up finished", extra={'warmup_seconds': warmup_timings})
+    warmup_done.set()
+
+
+def start_warmup(steps):
+    """Run (name, callable or module name) steps in a background thread; returns the thread"""
+    if not WARMUP_ENABLED:
+        warmup_done.set()
+        return None
+    thread = threading.Thread(target=_run, args=(list(steps),), name='warmup', daemon=True)
+    thread.start()
+    return thread
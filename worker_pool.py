@@ -0,0 +1,162 @@
+"""
+Worker Pool for CPU-bound work
+
+A process pool shared by the request handlers of one server worker, so
+CPU-heavy jobs (PDF rendering, text extraction, ATS analysis) run off the
+request thread. Under gevent workers this keeps the event loop free to
+serve other requests while the CPU work runs. The number of queued +
+running jobs is bounded; when the pool is saturated, try_submit() returns
+None and the caller can shed load instead of queueing, or use
+run_or_inline() to do the work itself.
+
+Under gevent, run_or_inline() never runs a job inline: that would run it on
+the event loop and stall every other connection of the worker, and a
+saturated pool is exactly when the worker is busiest. It waits for a slot
+instead, yielding to other greenlets, for up to WORKER_POOL_SLOT_WAIT
+seconds, then raises PoolSaturated so the request can answer 503.
+
+Pool processes are started with forkserver when gevent has patched the
+server worker, so they never inherit a monkey-patched process. They log
+straight to stdout rather than through the server's log queue (see
+log_config.py).
+
+Settings:
+    WORKER_POOL_SIZE          processes per server worker (0 runs jobs inline)
+    WORKER_POOL_MAX_QUEUE     jobs allowed in the pool at once (default 2 x size)
+    WORKER_POOL_START_METHOD  fork, forkserver or spawn (default: see above)
+    WORKER_POOL_SLOT_WAIT     seconds a gevent request waits for a free slot (default 10)
+    WORKER_POOL_JOB_TIMEOUT   seconds a request waits for a CV parse or analysis job (default 60)
+"""
+
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from log_config import setup_pool_process_logging
+
+WORKER_POOL_SIZE = int(os.getenv('WORKER_POOL_SIZE', str(min(4, os.cpu_count() or 1))))
+WORKER_POOL_MAX_QUEUE = int(os.getenv('WORKER_POOL_MAX_QUEUE', str(max(1, WORKER_POOL_SIZE) * 2)))
+WORKER_POOL_START_METHOD = os.getenv('WORKER_POOL_START_METHOD')
+WORKER_POOL_SLOT_WAIT = float(os.getenv('WORKER_POOL_SLOT_WAIT', '10'))
+WORKER_POOL_JOB_TIMEOUT = float(os.getenv('WORKER_POOL_JOB_TIMEOUT', '60'))
+
+
+def gevent_patched():
+    """True when gevent has monkey-patched this process (gunicorn gevent workers)"""
+    monkey = sys.modules.get('gevent.monkey')
+    return monkey is not None and monkey.is_module_patched('threading')
+
+
+def pool_context():
+    """Multiprocessing context for process pools started by a server worker"""
+    method = WORKER_POOL_START_METHOD
+    if method is None and gevent_patched():
+        method = 'forkserver'
+    return multiprocessing.get_context(method)
+
+
+class PoolSaturated(Exception):
+    """Raised when a job is rejected because the pool is at capacity"""
+
+
+class BoundedProcessPool:
+    def __init__(self, max_workers=WORKER_POOL_SIZE, max_pending=WORKER_POOL_MAX_QUEUE):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.max_workers > 0
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=pool_context(),
+                                                     initializer=setup_pool_process_logging)
+            return self._executor
+
+    def _reset_executor(self, broken):
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def try_submit(self, fn, *args, wait=0):
+        """Submit a job, or return None if no slot frees up within wait seconds"""
+        acquired = self._slots.acquire(timeout=wait) if wait > 0 else self._slots.acquire(blocking=False)
+        if not acquired:
+            return None
+        executor = self._get_executor()
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            # A worker process died; start a fresh pool for this and later jobs
+            self._reset_executor(executor)
+            try:
+                future = self._get_executor().submit(fn, *args)
+            except Exception:
+                self._slots.release()
+                raise
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run(self, fn, *args, timeout=None, wait=0):
+        """Run a job in the pool (or inline when the pool is disabled) and return its result"""
+        if not self.enabled:
+            return fn(*args)
+        future = self.try_submit(fn, *args, wait=wait)
+        if future is None:
+            raise PoolSaturated(f"Worker pool is busy ({self.max_pending} jobs pending)")
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            # Drop the job if it has not started; a running one keeps its slot until it ends
+            future.cancel()
+            raise
+        except BrokenProcessPool:
+            broken = self._executor
+            if broken is not None:
+                self._reset_executor(broken)
+            raise
+
+    def run_or_inline(self, fn, *args, timeout=None):
+        """
+        Run a job in the pool, or in this process when the pool is disabled or
+        saturated. Under gevent a saturated pool is waited on instead (see
+        above) and PoolSaturated is raised if it stays full.
+        """
+        if gevent_patched():
+            return self.run(fn, *args, timeout=timeout, wait=WORKER_POOL_SLOT_WAIT)
+        try:
+            return self.run(fn, *args, timeout=timeout)
+        except PoolSaturated:
+            return fn(*args)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_worker_pool():
+    """The pool for this server worker, created on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = BoundedProcessPool()
+    return _pool